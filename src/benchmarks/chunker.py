@@ -0,0 +1,170 @@
+"""
+Chunker micro-benchmark.
+
+Feeds a text file, or synthetic text of --size-mb, to the Chunker in blocks the way the
+processing job reads .txt assets, and times it for every size unit against the line
+splitter it replaced. Also reports the longest chunk and checks that the chunks do not
+depend on where the blocks are cut.
+
+    cd src && python -m benchmarks.chunker --size-mb 22 --chunk-size 100
+"""
+from utils.chunker import Chunker, Chunk
+from models.enums.ProcessingEnum import ChunkSizeUnitEnum
+from .common import random_texts, summarize, Timer
+from typing import List
+import argparse
+import json
+import numpy as np
+
+
+class LegacySplitter:
+    """
+    Reference copy of the line splitter the Chunker replaced, without page tracking,
+    only kept as the baseline of this benchmark.
+    """
+
+    def __init__(self, chunk_size: int, splitter_tag: str = "\n", page_joiner: str = " "):
+        self.chunk_size = chunk_size
+        self.splitter_tag = splitter_tag
+        self.page_joiner = page_joiner
+
+        self.has_text = False
+        self.pending_line = ""
+        self.current_chunk = ""
+
+    def feed(self, text: str) -> List[Chunk]:
+        if self.has_text:
+            text = self.page_joiner + text
+        self.has_text = True
+
+        parts = (self.pending_line + text).split(self.splitter_tag)
+        chunks = []
+        for line in parts[:-1]:
+            chunk = self.add_line(line=line)
+            if chunk is not None:
+                chunks.append(chunk)
+        self.pending_line = parts[-1]
+
+        return chunks
+
+    def flush(self) -> List[Chunk]:
+        chunks = []
+        chunk = self.add_line(line=self.pending_line)
+        if chunk is not None:
+            chunks.append(chunk)
+        self.pending_line = ""
+
+        if len(self.current_chunk.strip()) > 0:
+            chunks.append(self.emit_chunk())
+
+        return chunks
+
+    def add_line(self, line: str):
+        line = line.strip()
+        if len(line) <= 1:
+            return None
+
+        self.current_chunk += line + self.splitter_tag
+        if len(self.current_chunk) >= self.chunk_size:
+            return self.emit_chunk()
+
+        return None
+
+    def emit_chunk(self):
+        chunk = Chunk(page_content=self.current_chunk.strip(), metadata={})
+        self.current_chunk = ""
+        return chunk
+
+
+def synthetic_text(size_mb: float, seed: int = 0) -> str:
+    """
+    Prose-like text: sentences of Zipf words, lines of a few sentences, blank lines
+    between paragraphs.
+    """
+    rng = np.random.default_rng(seed)
+    lines = []
+    size = 0
+    words = random_texts(2000, words_per_text=12, seed=seed)
+    while size < size_mb * 1024 * 1024:
+        line = ". ".join(words[i] for i in rng.integers(0, len(words), size=rng.integers(1, 6))) + "."
+        if rng.random() < 0.15:
+            line += "\n"
+        lines.append(line)
+        size += len(line) + 1
+    return "\n".join(lines)
+
+
+def blocks_of(text: str, block_size: int, rng=None):
+    position = 0
+    while position < len(text):
+        size = block_size if rng is None else int(rng.integers(1, block_size + 1))
+        yield text[position:position + size]
+        position += size
+
+
+def run_chunker(text: str, block_size: int, args, size_unit: str, rng=None):
+    chunker = Chunker(chunk_size=args.chunk_size, overlap_size=args.overlap_size,
+                      size_unit=size_unit, page_joiner="", max_chunk_chars=args.max_chunk_chars)
+    chunks = []
+    for block in blocks_of(text, block_size, rng=rng):
+        chunks.extend(chunker.feed(block))
+    chunks.extend(chunker.flush())
+    return [chunk.page_content for chunk in chunks]
+
+
+def run_legacy(text: str, block_size: int, args):
+    splitter = LegacySplitter(chunk_size=args.chunk_size, page_joiner="")
+    chunks = []
+    for block in blocks_of(text, block_size):
+        chunks.extend(splitter.feed(block))
+    chunks.extend(splitter.flush())
+    return [chunk.page_content for chunk in chunks]
+
+
+def main(args):
+    if args.file:
+        with open(args.file, encoding="utf-8") as f:
+            text = f.read()
+    else:
+        text = synthetic_text(args.size_mb)
+
+    report = {"text_mb": round(len(text) / 1024 / 1024, 2), "chunk_size": args.chunk_size, "runs": {}}
+
+    runs = {"legacy_splitter": lambda: run_legacy(text, args.block_size, args)}
+    for size_unit in ChunkSizeUnitEnum:
+        runs[size_unit.value] = lambda size_unit=size_unit.value: run_chunker(text, args.block_size, args, size_unit)
+
+    for name, run in runs.items():
+        timings = []
+        for _ in range(args.repeat):
+            with Timer() as timer:
+                chunks = run()
+            timings.append(timer.seconds)
+
+        result = {
+            "seconds": summarize(timings)["p50_ms"] / 1000,
+            "chunks": len(chunks),
+            "max_chunk_chars": max((len(chunk) for chunk in chunks), default=0),
+        }
+        if name != "legacy_splitter":
+            # small random blocks must give the same chunks as the regular ones
+            rng = np.random.default_rng(1)
+            sample = text[:args.determinism_sample_chars]
+            result["deterministic"] = run_chunker(sample, args.block_size, args, name) == \
+                run_chunker(sample, 64, args, name, rng=rng)
+        report["runs"][name] = result
+
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--file", default=None, help="a UTF-8 text file, synthetic text when omitted")
+    parser.add_argument("--size-mb", type=float, default=22)
+    parser.add_argument("--block-size", type=int, default=1048576)
+    parser.add_argument("--chunk-size", type=int, default=100)
+    parser.add_argument("--overlap-size", type=int, default=20)
+    parser.add_argument("--max-chunk-chars", type=int, default=4000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--determinism-sample-chars", type=int, default=200000)
+    main(parser.parse_args())
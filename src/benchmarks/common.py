@@ -0,0 +1,61 @@
+from helpers.config import Settings
+from stores.llm.providers.FakeProvider import FakeProvider
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
+from sqlalchemy.orm import sessionmaker
+from typing import List
+import numpy as np
+import time
+
+# Benchmarks run from src as modules, e.g. python -m benchmarks.vector_search, against the
+# database configured in .env. Embeddings come from the deterministic fake provider, so
+# no API calls are made.
+
+
+def create_db_client(settings: Settings):
+    """
+    Engine and session factory for the configured Postgres database, as set up by helpers.resources.
+    """
+    postgres_conn = f"postgresql+asyncpg://{settings.POSTGRES_USERNAME}:{settings.POSTGRES_PASSWORD}@{settings.POSTGRES_HOST}:{settings.POSTGRES_PORT}/{settings.POSTGRES_MAIN_DATABASE}"
+
+    db_engine = create_async_engine(postgres_conn)
+    db_client = sessionmaker(db_engine, class_=AsyncSession, expire_on_commit=False)
+    return db_engine, db_client
+
+
+def create_embedder(embedding_size: int, seed: int = 0):
+    embedder = FakeProvider(seed=seed)
+    embedder.set_embedding_model(model_id="fake", embedding_size=embedding_size)
+    return embedder
+
+
+def random_texts(count: int, words_per_text: int = 60, vocabulary_size: int = 5000, seed: int = 0) -> List[str]:
+    """
+    Synthetic documents with a Zipf-like word distribution, so lexical and vector scores vary.
+    """
+    rng = np.random.default_rng(seed)
+    word_ids = np.minimum(rng.zipf(1.3, size=(count, words_per_text)), vocabulary_size)
+    return [" ".join(f"w{word_id}" for word_id in row) for row in word_ids.tolist()]
+
+
+def summarize(samples: List[float]):
+    """
+    Latency summary in milliseconds of timings given in seconds.
+    """
+    samples_ms = np.asarray(samples) * 1000
+    return {
+        "count": len(samples),
+        "mean_ms": round(float(samples_ms.mean()), 3),
+        "p50_ms": round(float(np.percentile(samples_ms, 50)), 3),
+        "p95_ms": round(float(np.percentile(samples_ms, 95)), 3),
+    }
+
+
+class Timer:
+
+    def __enter__(self):
+        self.started_at = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.seconds = time.perf_counter() - self.started_at
+        return False
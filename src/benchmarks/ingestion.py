@@ -0,0 +1,132 @@
+"""
+Ingestion benchmark: INSERT vs binary COPY.
+
+Times writing the same synthetic chunks into the chunks table with ORM inserts and with
+COPY, then writing their fake embeddings into a scratch pgvector collection with batched
+INSERT and with COPY. A scratch project holds the chunks, everything is removed at the end.
+
+    cd src && python -m benchmarks.ingestion --rows 20000 --repeat 3
+"""
+from helpers.config import get_settings
+from models.ChunkModel import ChunkModel
+from models.ProjectModel import ProjectModel
+from models.AssetModel import AssetModel
+from models.db_schemes import DataChunk, Asset, Project
+from stores.vectordb.VectorDBProviderFactory import VectorDBProviderFactory
+from stores.vectordb.VectorDBEnums import VectorDBEnums
+from sqlalchemy import delete
+from .common import create_db_client, create_embedder, random_texts, Timer
+import argparse
+import asyncio
+import json
+
+
+async def bench_chunks(db_client, texts: list, args):
+    project_model = await ProjectModel.create_instance(db_client=db_client)
+    asset_model = await AssetModel.create_instance(db_client=db_client)
+    chunk_model = await ChunkModel.create_instance(db_client=db_client)
+
+    project = await project_model.create_project(project=Project())
+    asset = await asset_model.create_asset(asset=Asset(
+        asset_type="file", asset_name="bench_ingestion.txt", asset_size=0,
+        asset_project_id=project.project_id
+    ))
+
+    results = {}
+    try:
+        for name, use_copy in (("orm_insert", False), ("copy", True)):
+            timings = []
+            for _ in range(args.repeat):
+                chunks = [
+                    DataChunk(
+                        chunk_text=text,
+                        chunk_metadata={"source": "bench"},
+                        chunk_order=i + 1,
+                        chunk_project_id=project.project_id,
+                        chunk_asset_id=asset.asset_id,
+                    )
+                    for i, text in enumerate(texts)
+                ]
+                with Timer() as timer:
+                    _ = await chunk_model.insert_many_chunks(chunks=chunks, use_copy=use_copy)
+                timings.append(timer.seconds)
+                _ = await chunk_model.delete_chunks_by_asset_id(asset_id=asset.asset_id)
+
+            results[name] = rows_per_second(len(texts), timings)
+    finally:
+        async with db_client() as session:
+            async with session.begin():
+                await session.execute(delete(DataChunk).where(DataChunk.chunk_asset_id == asset.asset_id))
+                await session.execute(delete(Asset).where(Asset.asset_id == asset.asset_id))
+                await session.execute(delete(Project).where(Project.project_id == project.project_id))
+
+    return results
+
+
+async def bench_vectors(vectordb_client, texts: list, args):
+    collection_name = f"collection_{args.dim}_bench_ingestion"
+    vectors = create_embedder(embedding_size=args.dim).embed_texts(texts)
+    metadata = [{"asset_id": i % 20} for i in range(len(texts))]
+    record_ids = [None] * len(texts)
+
+    results = {}
+    try:
+        for name, use_copy in (("insert", False), ("copy", True)):
+            timings = []
+            for _ in range(args.repeat):
+                # an empty table each run, and no index build inside the timing
+                _ = await vectordb_client.create_collection(collection_name=collection_name,
+                                                            embedding_size=args.dim, do_reset=True)
+                with Timer() as timer:
+                    _ = await vectordb_client.insert_many(
+                        collection_name=collection_name, texts=texts, vectors=vectors,
+                        metadata=metadata, record_ids=record_ids,
+                        batch_size=args.batch_size, use_copy=use_copy
+                    )
+                timings.append(timer.seconds)
+
+            results[name] = rows_per_second(len(texts), timings)
+    finally:
+        _ = await vectordb_client.delete_collection(collection_name=collection_name)
+
+    return results
+
+
+def rows_per_second(rows: int, timings: list):
+    best_seconds = min(timings)
+    return {
+        "best_seconds": round(best_seconds, 3),
+        "rows_per_second": round(rows / best_seconds, 1) if best_seconds > 0 else None,
+    }
+
+
+async def main(args):
+    settings = get_settings()
+    db_engine, db_client = create_db_client(settings)
+
+    vectordb_client = VectorDBProviderFactory(config=settings, db_client=db_client).create(
+        provider=VectorDBEnums.PGVECTOR.value
+    )
+    await vectordb_client.connect()
+    # keep HNSW construction out of the insert timings
+    vectordb_client.index_treshold = args.rows + 1
+
+    texts = random_texts(args.rows, words_per_text=args.words)
+    report = {"rows": args.rows, "dim": args.dim}
+    try:
+        report["chunks"] = await bench_chunks(db_client, texts, args)
+        report["vectors"] = await bench_vectors(vectordb_client, texts, args)
+    finally:
+        await db_engine.dispose()
+
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=20000)
+    parser.add_argument("--words", type=int, default=60)
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--batch-size", type=int, default=50, help="rows per INSERT statement")
+    parser.add_argument("--repeat", type=int, default=3)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,115 @@
+"""
+pgvector search benchmark and query plan check.
+
+Loads synthetic documents into a scratch collection, builds its HNSW index, then checks
+with EXPLAIN that plain and metadata-filtered searches walk the vector index and times
+them for each ef_search value. Exits with status 1 when a plan does not use the index.
+
+    cd src && python -m benchmarks.vector_search --rows 20000 --ef-search 40 100
+"""
+from helpers.config import get_settings
+from stores.vectordb.VectorDBProviderFactory import VectorDBProviderFactory
+from stores.vectordb.VectorDBEnums import VectorDBEnums
+from stores.vectordb.MetadataFilter import MetadataFilter
+from sqlalchemy.sql import text as sql_text
+from .common import create_db_client, create_embedder, random_texts, summarize, Timer
+import argparse
+import asyncio
+import json
+import sys
+
+
+async def load_collection(vectordb_client, db_client, collection_name: str, args):
+    embedder = create_embedder(embedding_size=args.dim)
+    _ = await vectordb_client.create_collection(collection_name=collection_name,
+                                                embedding_size=args.dim, do_reset=True)
+
+    texts = random_texts(args.rows)
+    for i in range(0, len(texts), args.batch_size):
+        batch_texts = texts[i:i + args.batch_size]
+        _ = await vectordb_client.insert_many(
+            collection_name=collection_name,
+            texts=batch_texts,
+            vectors=embedder.embed_texts(batch_texts),
+            metadata=[{"asset_id": (i + j) % args.assets} for j in range(len(batch_texts))],
+            record_ids=[None] * len(batch_texts),
+            use_copy=True
+        )
+
+    # build the index whatever the configured threshold, the plan check needs it
+    vectordb_client.index_treshold = 0
+    _ = await vectordb_client.create_vector_index(collection_name=collection_name)
+
+    # fresh planner statistics, the plan check is meaningless without them
+    async with db_client() as session:
+        async with session.begin():
+            await session.execute(sql_text(f"ANALYZE {collection_name}"))
+
+
+async def main(args):
+    settings = get_settings()
+    db_engine, db_client = create_db_client(settings)
+
+    vectordb_client = VectorDBProviderFactory(config=settings, db_client=db_client).create(
+        provider=VectorDBEnums.PGVECTOR.value
+    )
+    await vectordb_client.connect()
+
+    collection_name = f"collection_{args.dim}_bench_search"
+    query_vectors = create_embedder(embedding_size=args.dim, seed=1).embed_texts(
+        random_texts(args.queries, words_per_text=8, seed=1)
+    )
+    searches = {
+        "plain": None,
+        "filtered": MetadataFilter.from_dict({"asset_id": 1}),
+    }
+
+    uses_index = True
+    report = {"rows": args.rows, "dim": args.dim, "searches": {}}
+    try:
+        with Timer() as load_timer:
+            await load_collection(vectordb_client, db_client, collection_name, args)
+        report["load_seconds"] = round(load_timer.seconds, 3)
+
+        for name, metadata_filter in searches.items():
+            plan = await vectordb_client.explain_search(
+                collection_name=collection_name, vector=query_vectors[0], limit=args.limit,
+                metadata_filter=metadata_filter
+            )
+            uses_index = uses_index and plan["uses_vector_index"]
+            result = {"uses_vector_index": plan["uses_vector_index"], "latency": {}}
+            if not plan["uses_vector_index"]:
+                result["plan"] = plan["plan"]
+
+            for ef_search in args.ef_search:
+                samples = []
+                for vector in query_vectors:
+                    with Timer() as timer:
+                        _ = await vectordb_client.search_by_vector(
+                            collection_name=collection_name, vector=vector, limit=args.limit,
+                            ef_search=ef_search, metadata_filter=metadata_filter
+                        )
+                    samples.append(timer.seconds)
+                result["latency"][f"ef_search={ef_search}"] = summarize(samples)
+
+            report["searches"][name] = result
+    finally:
+        if not args.keep:
+            _ = await vectordb_client.delete_collection(collection_name=collection_name)
+        await db_engine.dispose()
+
+    print(json.dumps(report, indent=2))
+    return 0 if uses_index else 1
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=20000)
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--assets", type=int, default=20)
+    parser.add_argument("--batch-size", type=int, default=5000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--limit", type=int, default=10)
+    parser.add_argument("--ef-search", type=int, nargs="+", default=[40, 100])
+    parser.add_argument("--keep", action="store_true", help="keep the scratch collection")
+    sys.exit(asyncio.run(main(parser.parse_args())))
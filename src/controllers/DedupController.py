@@ -0,0 +1,200 @@
+from .BaseController import BaseController
+from models.ChunkModel import ChunkModel
+from models.db_schemes import DataChunk
+from utils.dedup import exact_hashes, MinHasher
+from typing import List
+import asyncio
+import numpy as np
+
+
+class DedupController(BaseController):
+    """
+    Drops duplicate chunks before they are embedded. Exact duplicates are found by the
+    hash of their normalized text and, optionally, near-duplicates by MinHash LSH, both
+    within the project. Duplicates are still stored, pointing to their canonical chunk
+    through chunk_duplicate_of, but they are not embedded nor stored in the vector DB.
+    """
+
+    def __init__(self, project_id: int, chunk_model: ChunkModel,
+                 exact_dedup: bool = None, near_dedup: bool = None):
+        super().__init__()
+
+        self.project_id = project_id
+        self.chunk_model = chunk_model
+        self.exact_dedup = exact_dedup if exact_dedup is not None else self.app_settings.DEDUP_EXACT_ENABLED
+        self.near_dedup = near_dedup if near_dedup is not None else self.app_settings.DEDUP_NEAR_ENABLED
+        self.near_threshold = self.app_settings.DEDUP_NEAR_THRESHOLD
+
+        self.minhasher = None
+        if self.near_dedup:
+            self.minhasher = MinHasher(
+                num_perm=self.app_settings.DEDUP_MINHASH_NUM_PERM,
+                bands=self.app_settings.DEDUP_MINHASH_BANDS,
+                shingle_size=self.app_settings.DEDUP_SHINGLE_SIZE,
+            )
+
+        # batches of concurrently processed files are deduplicated one at a time,
+        # so a chunk is always compared with the canonical chunks inserted before it
+        self.lock = asyncio.Lock()
+
+        self.exact_duplicates = 0
+        self.near_duplicates = 0
+
+    def get_stats(self, embedding_size: int):
+        """
+        Duplicates found so far, and the embedding calls and vector storage they saved.
+        """
+        duplicates = self.exact_duplicates + self.near_duplicates
+        return {
+            "exact_duplicates": self.exact_duplicates,
+            "near_duplicates": self.near_duplicates,
+            "saved_embedding_calls": duplicates,
+            # float32 vectors
+            "saved_vector_bytes": duplicates * embedding_size * 4,
+        }
+
+    async def insert_chunks(self, chunks: List[DataChunk], use_copy: bool = False):
+        """
+        Deduplicate a batch of chunks and insert it. Canonical chunks are inserted first,
+        so duplicates of chunks of the same batch can reference their ids.
+        """
+        hashes = exact_hashes([chunk.chunk_text for chunk in chunks])
+        for chunk, chunk_hash in zip(chunks, hashes):
+            chunk.chunk_hash = chunk_hash
+
+        if not self.exact_dedup and not self.near_dedup:
+            return await self.chunk_model.insert_many_chunks(chunks=chunks, use_copy=use_copy)
+
+        async with self.lock:
+            canonical_chunks, duplicates = await self.find_duplicates(chunks=chunks)
+
+            inserted_count = 0
+            if len(canonical_chunks):
+                inserted_count += await self.chunk_model.insert_many_chunks(
+                    chunks=canonical_chunks, use_copy=use_copy
+                )
+
+            if len(duplicates):
+                for chunk, target in duplicates:
+                    chunk.chunk_duplicate_of = target if isinstance(target, int) else target.chunk_id
+                inserted_count += await self.chunk_model.insert_many_chunks(
+                    chunks=[chunk for chunk, _ in duplicates], use_copy=use_copy
+                )
+
+                # existing canonical chunks now also belong to these assets
+                shared_ids = {}
+                for chunk, target in duplicates:
+                    if isinstance(target, int):
+                        shared_ids.setdefault(chunk.chunk_asset_id, set()).add(target)
+                for asset_id, chunk_ids in shared_ids.items():
+                    _ = await self.chunk_model.reset_shared_chunks_indexed(
+                        chunk_ids=list(chunk_ids), asset_id=asset_id
+                    )
+
+        return inserted_count
+
+    async def find_duplicates(self, chunks: List[DataChunk]):
+        """
+        Split a batch into canonical chunks and (duplicate, target) pairs, where the
+        target is the id of an existing chunk or a canonical chunk of the batch.
+        """
+        if not self.exact_dedup:
+            canonical_chunks, duplicates = list(chunks), []
+        else:
+            existing_ids = await self.chunk_model.get_canonical_chunk_ids_by_hash(
+                project_id=self.project_id,
+                chunk_hashes=list({chunk.chunk_hash for chunk in chunks})
+            )
+
+            canonical_chunks, duplicates = [], []
+            first_seen = {}
+            for chunk in chunks:
+                target = existing_ids.get(chunk.chunk_hash) or first_seen.get(chunk.chunk_hash)
+                if target is not None:
+                    duplicates.append((chunk, target))
+                    continue
+
+                first_seen[chunk.chunk_hash] = chunk
+                canonical_chunks.append(chunk)
+
+            self.exact_duplicates += len(duplicates)
+
+        if self.near_dedup and len(canonical_chunks):
+            canonical_chunks, near_duplicates = await self.find_near_duplicates(chunks=canonical_chunks)
+
+            # exact duplicates of a chunk that turned out to be a near-duplicate
+            # point to that chunk's target instead
+            near_targets = {id(chunk): target for chunk, target in near_duplicates}
+            duplicates = [
+                (chunk, near_targets.get(id(target), target))
+                for chunk, target in duplicates
+            ]
+            duplicates.extend(near_duplicates)
+
+        return canonical_chunks, duplicates
+
+    async def get_candidate_signatures(self, candidates: list):
+        """
+        Signatures of the candidate chunks, read from chunk_minhash, or computed from the
+        text for chunks stored before signatures were kept or with another num_perm.
+        """
+        missing = [i for i, (_, _, text) in enumerate(candidates) if text is not None]
+        stored = [i for i, (_, _, text) in enumerate(candidates) if text is None]
+
+        signatures = np.empty((len(candidates), self.minhasher.num_perm), dtype=np.uint32)
+        signatures[stored] = self.minhasher.from_bytes([candidates[i][1] for i in stored])
+        if missing:
+            signatures[missing] = await asyncio.to_thread(
+                self.minhasher.signatures, [candidates[i][2] for i in missing]
+            )
+
+        return signatures
+
+    async def find_near_duplicates(self, chunks: List[DataChunk]):
+        """
+        MinHash LSH pass over the canonical chunks of a batch. Chunks sharing a band key
+        with an existing chunk or an earlier chunk of the batch are candidates, kept as
+        duplicates when their estimated Jaccard similarity reaches the threshold. The
+        candidates of a chunk are compared in one array operation, the first one over
+        the threshold (existing chunks first) is its target.
+        """
+        signatures = await asyncio.to_thread(
+            self.minhasher.signatures, [chunk.chunk_text for chunk in chunks]
+        )
+        band_keys = self.minhasher.band_keys(signatures)
+
+        candidates = await self.chunk_model.get_near_duplicate_candidates(
+            project_id=self.project_id,
+            band_keys=[int(key) for key in set(band_keys.ravel().tolist())],
+            signature_size=len(self.minhasher.to_bytes(signatures[0]))
+        )
+        candidate_signatures = await self.get_candidate_signatures(candidates=candidates)
+
+        # every signature a chunk can be compared with, existing chunks then the batch,
+        # and the band key -> rows index over them
+        all_signatures = np.concatenate([candidate_signatures, signatures])
+        targets = [chunk_id for chunk_id, _, _ in candidates] + list(chunks)
+        band_index = {}
+        for row, keys in enumerate(self.minhasher.band_keys(candidate_signatures).tolist()):
+            for key in keys:
+                band_index.setdefault(key, []).append(row)
+
+        canonical_chunks, duplicates = [], []
+        for i, (chunk, keys) in enumerate(zip(chunks, band_keys.tolist())):
+            rows = sorted({row for key in keys for row in band_index.get(key, ())})
+            if rows:
+                rows = np.asarray(rows)
+                similarities = self.minhasher.similarities(all_signatures[rows], signatures[i])
+                matches = rows[similarities >= self.near_threshold]
+                if len(matches):
+                    duplicates.append((chunk, targets[matches[0]]))
+                    continue
+
+            chunk.chunk_lsh_bands = keys
+            chunk.chunk_minhash = self.minhasher.to_bytes(signatures[i])
+            canonical_chunks.append(chunk)
+            for key in keys:
+                band_index.setdefault(key, []).append(len(candidates) + i)
+
+        self.near_duplicates += len(duplicates)
+        return canonical_chunks, duplicates
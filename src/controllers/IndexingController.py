@@ -0,0 +1,157 @@
+from .BaseController import BaseController
+from .NLPController import NLPController
+from models.db_schemes import Project
+from typing import AsyncIterator, Awaitable, Callable, List
+import asyncio
+import logging
+import time
+
+
+class IndexingController(BaseController):
+    """
+    IndexingController indexes a project into the vector database as a staged pipeline.
+    DB reads, embedding calls and vector-store writes run at the same time and are
+    connected by bounded queues, so each stage works while the others wait on I/O.
+    """
+
+    def __init__(self, nlp_controller: NLPController,
+                 queue_size: int = None, embedding_concurrency: int = None,
+                 bulk_load: bool = None, use_copy: bool = None):
+        super().__init__()
+
+        self.nlp_controller = nlp_controller
+        self.queue_size = queue_size if queue_size else self.app_settings.INDEXING_QUEUE_SIZE
+        self.embedding_concurrency = embedding_concurrency if embedding_concurrency \
+            else self.app_settings.INDEXING_EMBEDDING_CONCURRENCY
+        self.bulk_load = bulk_load if bulk_load is not None else self.app_settings.INDEXING_BULK_LOAD
+        self.use_copy = use_copy if use_copy is not None else self.app_settings.INGESTION_USE_COPY
+
+        self.logger = logging.getLogger('uvicorn.error')
+
+    async def index_project(self, project: Project, chunks_stream: AsyncIterator[List],
+                            on_progress: Callable[[int], Awaitable] = None,
+                            on_indexed: Callable[[List], Awaitable] = None,
+                            expected_items_count: int = None):
+        """
+        Runs the fetch -> embed -> insert pipeline over the pages yielded by chunks_stream.
+        on_progress is awaited with the number of chunks written after every page, and
+        on_indexed with the written chunks themselves, e.g. to record them as indexed.
+        expected_items_count lets the vector store decide whether the push is large
+        enough to defer its index until the end.
+        Returns a tuple of (is_success, stats).
+        """
+        embed_queue = asyncio.Queue(maxsize=self.queue_size)
+        write_queue = asyncio.Queue(maxsize=self.queue_size)
+
+        stats = {
+            "fetched_items_count": 0,
+            "embedded_items_count": 0,
+            "inserted_items_count": 0,
+            "fetch_seconds": 0.0,
+            "embed_seconds": 0.0,
+            "insert_seconds": 0.0,
+        }
+        running_embedders = self.embedding_concurrency
+
+        async def fetch_stage():
+            started_at = time.perf_counter()
+            async for page_chunks in chunks_stream:
+                stats["fetch_seconds"] += time.perf_counter() - started_at
+                stats["fetched_items_count"] += len(page_chunks)
+                await embed_queue.put(page_chunks)
+                started_at = time.perf_counter()
+
+            for _ in range(self.embedding_concurrency):
+                await embed_queue.put(None)
+
+        async def embed_stage():
+            nonlocal running_embedders
+            while True:
+                page_chunks = await embed_queue.get()
+                if page_chunks is None:
+                    break
+
+                started_at = time.perf_counter()
+                vectors = await self.nlp_controller.embed_chunks(chunks=page_chunks)
+                stats["embed_seconds"] += time.perf_counter() - started_at
+
+                if vectors is None or len(vectors) != len(page_chunks):
+                    raise RuntimeError("Embedding stage returned no vectors for a page.")
+
+                stats["embedded_items_count"] += len(page_chunks)
+                await write_queue.put((page_chunks, vectors))
+
+            running_embedders -= 1
+            if running_embedders == 0:
+                await write_queue.put(None)
+
+        async def write_stage():
+            while True:
+                item = await write_queue.get()
+                if item is None:
+                    break
+
+                page_chunks, vectors = item
+                started_at = time.perf_counter()
+                is_inserted = await self.nlp_controller.insert_chunks_vectors(
+                    project=project,
+                    chunks=page_chunks,
+                    vectors=vectors,
+                    use_copy=self.use_copy
+                )
+                stats["insert_seconds"] += time.perf_counter() - started_at
+
+                if not is_inserted:
+                    raise RuntimeError("Vector store rejected a page of vectors.")
+
+                if on_indexed:
+                    await on_indexed(page_chunks)
+
+                stats["inserted_items_count"] += len(page_chunks)
+                if on_progress:
+                    await on_progress(len(page_chunks))
+
+        collection_name = self.nlp_controller.create_collection_name(project_id=project.project_id)
+        vectordb_client = self.nlp_controller.vectordb_client
+
+        started_at = time.perf_counter()
+        is_bulk_load = False
+        if self.bulk_load:
+            is_bulk_load = await vectordb_client.begin_bulk_load(collection_name=collection_name,
+                                                                 expected_rows=expected_items_count)
+        stats["bulk_load"] = bool(is_bulk_load)
+
+        tasks = [
+            asyncio.create_task(fetch_stage()),
+            *[asyncio.create_task(embed_stage()) for _ in range(self.embedding_concurrency)],
+            asyncio.create_task(write_stage()),
+        ]
+
+        try:
+            done, pending = await asyncio.wait(tasks, return_when=asyncio.FIRST_EXCEPTION)
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+            # the deferred index is built even when the push failed, so the
+            # collection is never left without one
+            if is_bulk_load:
+                index_started_at = time.perf_counter()
+                _ = await vectordb_client.end_bulk_load(collection_name=collection_name)
+                stats["index_build_seconds"] = round(time.perf_counter() - index_started_at, 3)
+
+        elapsed_seconds = time.perf_counter() - started_at
+        stats["elapsed_seconds"] = round(elapsed_seconds, 3)
+        stats["items_per_second"] = round(
+            stats["inserted_items_count"] / elapsed_seconds, 2
+        ) if elapsed_seconds > 0 else 0.0
+        for key in ("fetch_seconds", "embed_seconds", "insert_seconds"):
+            stats[key] = round(stats[key], 3)
+
+        for task in done:
+            if task.exception() is not None:
+                self.logger.error(f"Indexing pipeline failed: {task.exception()}")
+                return False, stats
+
+        return True, stats
@@ -0,0 +1,498 @@
+from .BaseController import BaseController
+from .NLPController import NLPController
+from .ProcessController import ProcessController
+from .IndexingController import IndexingController
+from .DedupController import DedupController
+from models import ResponseSignal
+from models.ProjectModel import ProjectModel
+from models.ChunkModel import ChunkModel
+from models.AssetModel import AssetModel
+from models.JobModel import JobModel
+from models.db_schemes import Asset, DataChunk, Job
+from models.enums.AssetTypeEnum import AssetTypeEnum
+from models.enums.JobEnums import JobTypeEnum, JobStatusEnum
+import asyncio
+import logging
+import time
+
+
+class JobCancelledError(Exception):
+    """
+    Raised inside a running job once its cancellation has been requested.
+    """
+    pass
+
+
+class JobProgress:
+    """
+    Tracks the progress of a running job and flushes it to the jobs table at most once
+    per flush interval. Every flush also picks up cancellation requests.
+    """
+
+    def __init__(self, job_model: JobModel, job_id: int, unit: str = "items",
+                 flush_interval: float = 1.0):
+        self.job_model = job_model
+        self.job_id = job_id
+        self.unit = unit
+        self.flush_interval = flush_interval
+
+        self.total = None
+        self.processed = 0
+        self.cancelled = False
+        self.started_at = time.perf_counter()
+        self.flushed_at = 0.0
+
+    def snapshot(self):
+        elapsed_seconds = time.perf_counter() - self.started_at
+        return {
+            "unit": self.unit,
+            "processed": self.processed,
+            "total": self.total,
+            "elapsed_seconds": round(elapsed_seconds, 3),
+            "items_per_second": round(self.processed / elapsed_seconds, 2) if elapsed_seconds > 0 else 0.0,
+        }
+
+    async def set_total(self, total: int):
+        self.total = total
+        await self.flush(force=True)
+
+    async def advance(self, count: int = 1):
+        self.processed += count
+        await self.flush()
+
+    async def flush(self, force: bool = False):
+        now = time.perf_counter()
+        if not force and now - self.flushed_at < self.flush_interval:
+            return
+
+        self.flushed_at = now
+        cancel_requested = await self.job_model.update_job_progress(
+            job_id=self.job_id,
+            progress=self.snapshot()
+        )
+        if cancel_requested:
+            self.cancelled = True
+            raise JobCancelledError(f"Job {self.job_id} was cancelled.")
+
+
+class JobController(BaseController):
+    """
+    JobController enqueues long-running project work and executes it on job workers.
+    Workers claim jobs from the jobs table, so they can run inside the API process or
+    in separate worker processes.
+    """
+
+    def __init__(self, resources: object):
+        super().__init__()
+
+        # the app (or a worker namespace) holding db_client and the LLM / vector DB clients
+        self.resources = resources
+        self.db_client = resources.db_client
+        self.logger = logging.getLogger('uvicorn.error')
+
+    def get_nlp_controller(self):
+        return NLPController(
+            vectordb_client=self.resources.vectordb_client,
+            generation_client=self.resources.generation_client,
+            embedding_client=self.resources.embedding_client,
+            template_parser=self.resources.template_parser,
+            tokenizer_service=self.resources.tokenizer_service,
+        )
+
+    async def enqueue_job(self, job_type: str, project_id: int, payload: dict):
+        """
+        Persist a new queued job and return it.
+        """
+        job_model = await JobModel.create_instance(db_client=self.db_client)
+
+        return await job_model.create_job(job=Job(
+            job_type=job_type,
+            job_project_id=project_id,
+            job_payload=payload
+        ))
+
+    def get_job_info(self, job: Job):
+        """
+        JSON-friendly view of a job for the status endpoint.
+        """
+        progress = job.job_progress or {}
+        return {
+            "job_id": job.job_id,
+            "job_uuid": str(job.job_uuid),
+            "job_type": job.job_type,
+            "job_status": job.job_status,
+            "project_id": job.job_project_id,
+            "progress": progress,
+            "throughput": progress.get("items_per_second"),
+            "result": job.job_result,
+            "error": job.job_error,
+            "cancel_requested": job.job_cancel_requested,
+            "worker_id": job.job_worker_id,
+            "created_at": job.created_at.isoformat() if job.created_at else None,
+            "started_at": job.started_at.isoformat() if job.started_at else None,
+            "finished_at": job.finished_at.isoformat() if job.finished_at else None,
+        }
+
+    async def run_process_job(self, job: Job, progress: JobProgress):
+        """
+        Chunk the project files into the chunks table.
+        """
+        payload = job.job_payload or {}
+        chunk_size = payload.get("chunk_size")
+        overlap_size = payload.get("overlap_size")
+        do_reset = payload.get("do_reset")
+        use_copy = payload.get("use_copy")
+        use_copy = use_copy if use_copy is not None else self.app_settings.INGESTION_USE_COPY
+
+        project_model = await ProjectModel.create_instance(db_client=self.db_client)
+        project = await project_model.get_project_or_create_one(project_id=job.job_project_id)
+
+        nlp_controller = self.get_nlp_controller()
+        asset_model = await AssetModel.create_instance(db_client=self.db_client)
+
+        if payload.get("file_id"):
+            asset_record = await asset_model.get_asset_record(
+                asset_project_id=project.project_id,
+                asset_name=payload.get("file_id")
+            )
+            if asset_record is None:
+                raise ValueError(ResponseSignal.FILE_ID_ERROR.value)
+
+            project_files = [asset_record]
+        else:
+            project_files = await asset_model.get_all_project_assets(
+                asset_project_id=project.project_id,
+                asset_type=AssetTypeEnum.FILE.value
+            )
+
+        process_controller = ProcessController(project_id=project.project_id)
+        chunk_model = await ChunkModel.create_instance(db_client=self.db_client)
+        collection_name = nlp_controller.create_collection_name(project_id=project.project_id)
+
+        no_records = 0
+        no_files = 0
+        no_skipped_files = 0
+
+        # an asset is re-chunked only when its content or these parameters changed,
+        # do_reset=1 forces it for the selected assets
+        processing_params = {
+            "chunk_size": chunk_size,
+            "overlap_size": overlap_size,
+            "chunk_size_unit": payload.get("chunk_size_unit") or self.app_settings.CHUNKING_SIZE_UNIT,
+        }
+
+        await progress.set_total(len(project_files))
+
+        insert_batch_size = self.app_settings.PROCESSING_INSERT_BATCH_SIZE
+
+        # one dedup stage for the whole job, duplicates are kept as references only
+        dedup_controller = DedupController(
+            project_id=project.project_id,
+            chunk_model=chunk_model,
+            exact_dedup=payload.get("dedup"),
+            near_dedup=payload.get("near_dedup")
+        )
+
+        # token sized chunks are measured with the embedding model tokenizer
+        count_tokens = self.resources.tokenizer_service.get_counter(
+            model_id=nlp_controller.embedding_client.embedding_model_id
+        )
+        files_semaphore = asyncio.Semaphore(self.app_settings.PROCESSING_FILE_CONCURRENCY)
+
+        async def process_file(asset: Asset):
+            nonlocal no_records, no_files, no_skipped_files
+            asset_id, file_id = asset.asset_id, asset.asset_name
+
+            async with files_semaphore:
+                if process_controller.get_file_path(file_id=file_id) is None:
+                    self.logger.error(f"File {file_id} not found or unsupported format.")
+                    await progress.advance(1)
+                    return
+
+                asset_config = dict(asset.asset_config or {})
+                content_hash = asset_config.get("content_hash")
+                if not content_hash:
+                    content_hash = await asyncio.to_thread(
+                        process_controller.get_file_hash, file_id=file_id
+                    )
+
+                asset_processing = {"content_hash": content_hash, **processing_params}
+                if do_reset != 1 and asset_config.get("processing") == asset_processing:
+                    no_skipped_files += 1
+                    await progress.advance(1)
+                    return
+
+                # replace only this asset's chunks and vectors
+                old_chunk_ids = await chunk_model.get_asset_chunk_ids(asset_id=asset_id)
+                if len(old_chunk_ids):
+                    _ = await nlp_controller.vectordb_client.delete_by_record_ids(
+                        collection_name=collection_name,
+                        record_ids=old_chunk_ids
+                    )
+                    # other assets' duplicates of these chunks must not lose their canonical chunk
+                    async with dedup_controller.lock:
+                        _ = await chunk_model.promote_duplicates(asset_id=asset_id, chunk_ids=old_chunk_ids)
+                        _ = await chunk_model.delete_chunks_by_asset_id(asset_id=asset_id)
+
+                # chunks are streamed out of the extraction pool and flushed in bounded batches
+                chunk_order = 0
+                file_chunks_records = []
+                async for chunk in process_controller.stream_file_chunks(
+                    file_id=file_id,
+                    executor=self.resources.extraction_pool,
+                    chunk_size=chunk_size,
+                    overlap_size=overlap_size,
+                    chunk_size_unit=processing_params["chunk_size_unit"],
+                    count_tokens=count_tokens,
+                    page_batch_size=payload.get("page_batch_size"),
+                    content_hash=content_hash
+                ):
+                    chunk_order += 1
+                    file_chunks_records.append(DataChunk(
+                        chunk_text=chunk.page_content,
+                        chunk_metadata=chunk.metadata,
+                        chunk_order=chunk_order,
+                        chunk_project_id=project.project_id,
+                        chunk_asset_id=asset_id
+                    ))
+
+                    if len(file_chunks_records) >= insert_batch_size:
+                        no_records += await dedup_controller.insert_chunks(
+                            chunks=file_chunks_records,
+                            use_copy=use_copy,
+                        )
+                        file_chunks_records = []
+
+                if len(file_chunks_records):
+                    no_records += await dedup_controller.insert_chunks(
+                        chunks=file_chunks_records,
+                        use_copy=use_copy,
+                    )
+
+                if chunk_order == 0:
+                    raise ValueError(ResponseSignal.PROCESSING_FAILED.value)
+
+                asset_config["content_hash"] = content_hash
+                asset_config["processing"] = asset_processing
+                _ = await asset_model.update_asset_config(asset_id=asset_id, asset_config=asset_config)
+
+                no_files += 1
+                await progress.advance(1)
+
+        # files are extracted concurrently, a failing or cancelled file stops the others
+        tasks = [
+            asyncio.create_task(process_file(asset=asset))
+            for asset in project_files
+        ]
+        if len(tasks):
+            done, pending = await asyncio.wait(tasks, return_when=asyncio.FIRST_EXCEPTION)
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+
+            for task in done:
+                if task.exception() is not None:
+                    raise task.exception()
+
+        return {
+            "signal": ResponseSignal.PROCESSING_SUCCESS.value,
+            "inserted_chunks": no_records,
+            "processed_files": no_files,
+            "skipped_files": no_skipped_files,
+            "dedup": dedup_controller.get_stats(
+                embedding_size=nlp_controller.embedding_client.embedding_size
+            )
+        }
+
+    async def run_index_job(self, job: Job, progress: JobProgress):
+        """
+        Embed the project chunks into its vector database collection.
+        """
+        payload = job.job_payload or {}
+
+        project_model = await ProjectModel.create_instance(db_client=self.db_client)
+        project = await project_model.get_project_or_create_one(project_id=job.job_project_id)
+
+        chunk_model = await ChunkModel.create_instance(db_client=self.db_client)
+        nlp_controller = self.get_nlp_controller()
+
+        # chunks are flagged once their vectors are written, so a push only sends the
+        # ones that were never written, whatever their ids and whichever job added them
+        if payload.get("do_reset"):
+            _ = await chunk_model.reset_chunks_indexed(project_id=project.project_id)
+
+        collection_name = nlp_controller.create_collection_name(project_id=project.project_id)
+        is_created = await nlp_controller.vectordb_client.create_collection(
+            collection_name=collection_name,
+            embedding_size=nlp_controller.embedding_client.embedding_size,
+            do_reset=payload.get("do_reset")
+        )
+        # a new collection holds none of the flagged chunks, e.g. after it was deleted
+        if is_created and not payload.get("do_reset"):
+            _ = await chunk_model.reset_chunks_indexed(project_id=project.project_id)
+
+        total_chunks_count = await chunk_model.get_total_chunks_count(
+            project_id=project.project_id,
+            only_unindexed=True
+        )
+        await progress.set_total(total_chunks_count)
+
+        indexing_controller = IndexingController(
+            nlp_controller=nlp_controller,
+            embedding_concurrency=payload.get("embedding_concurrency"),
+            bulk_load=payload.get("bulk_load"),
+            use_copy=payload.get("use_copy")
+        )
+
+        is_inserted, stats = await indexing_controller.index_project(
+            project=project,
+            chunks_stream=chunk_model.stream_project_chunks(
+                project_id=project.project_id,
+                page_size=payload.get("page_size"),
+                only_unindexed=True,
+                with_asset_ids=True
+            ),
+            on_progress=progress.advance,
+            on_indexed=lambda chunks: chunk_model.mark_chunks_indexed(
+                chunk_ids=[c.chunk_id for c in chunks]
+            ),
+            expected_items_count=total_chunks_count
+        )
+
+        if progress.cancelled:
+            raise JobCancelledError(f"Job {job.job_id} was cancelled.")
+
+        if not is_inserted:
+            raise RuntimeError(ResponseSignal.INSERT_INTO_VECTORDB_ERROR.value)
+
+        return {
+            "signal": ResponseSignal.INSERT_INTO_VECTORDB_SUCCESS.value,
+            "inserted_items_count": stats["inserted_items_count"],
+            "throughput": stats
+        }
+
+    async def run_job(self, job: Job):
+        """
+        Execute a claimed job and record its outcome.
+        """
+        job_model = await JobModel.create_instance(db_client=self.db_client)
+        handlers = {
+            JobTypeEnum.PROCESS.value: (self.run_process_job, "files"),
+            JobTypeEnum.INDEX.value: (self.run_index_job, "chunks"),
+        }
+
+        if job.job_type not in handlers:
+            return await job_model.finish_job(
+                job_id=job.job_id,
+                job_status=JobStatusEnum.FAILED.value,
+                job_error=f"Unsupported job type: {job.job_type}"
+            )
+
+        handler, unit = handlers[job.job_type]
+        progress = JobProgress(
+            job_model=job_model,
+            job_id=job.job_id,
+            unit=unit,
+            flush_interval=self.app_settings.JOB_PROGRESS_FLUSH_SECONDS
+        )
+
+        handler_task = asyncio.create_task(handler(job=job, progress=progress))
+        heartbeat_task = asyncio.create_task(self.keep_job_lease(
+            job_model=job_model, job=job, handler_task=handler_task
+        ))
+
+        try:
+            job_result = await handler_task
+        except asyncio.CancelledError:
+            # the heartbeat lost the lease, the job now belongs to another worker
+            if heartbeat_task.done() and not heartbeat_task.cancelled() and heartbeat_task.result() is False:
+                self.logger.warning(f"Job {job.job_id} lost its lease, dropped by worker {job.job_worker_id}.")
+                return False
+            raise
+        except JobCancelledError:
+            self.logger.info(f"Job {job.job_id} cancelled.")
+            return await job_model.finish_job(
+                job_id=job.job_id,
+                job_status=JobStatusEnum.CANCELLED.value,
+                job_progress=progress.snapshot(),
+                worker_id=job.job_worker_id
+            )
+        except Exception as e:
+            self.logger.exception(f"Job {job.job_id} failed: {e}")
+            return await job_model.finish_job(
+                job_id=job.job_id,
+                job_status=JobStatusEnum.FAILED.value,
+                job_error=str(e),
+                job_progress=progress.snapshot(),
+                worker_id=job.job_worker_id
+            )
+        finally:
+            heartbeat_task.cancel()
+            handler_task.cancel()
+
+        return await job_model.finish_job(
+            job_id=job.job_id,
+            job_status=JobStatusEnum.SUCCEEDED.value,
+            job_result=job_result,
+            job_progress=progress.snapshot(),
+            worker_id=job.job_worker_id
+        )
+
+    async def keep_job_lease(self, job_model: JobModel, job: Job, handler_task: asyncio.Task):
+        """
+        Renew the lease of a running job every third of the lease period. When the lease
+        can not be renewed the job was reclaimed by another worker, so the handler is
+        cancelled and False returned.
+        """
+        lease_seconds = self.app_settings.JOB_LEASE_SECONDS
+        while not handler_task.done():
+            await asyncio.sleep(lease_seconds / 3)
+
+            try:
+                is_renewed = await job_model.renew_job_lease(
+                    job_id=job.job_id,
+                    worker_id=job.job_worker_id,
+                    lease_seconds=lease_seconds
+                )
+            except Exception as e:
+                # a transient database error, the lease is still valid for a while
+                self.logger.error(f"Failed to renew the lease of job {job.job_id}: {e}")
+                continue
+
+            if not is_renewed:
+                handler_task.cancel()
+                return False
+
+        return True
+
+    async def run_worker(self, worker_id: str, stop_event: asyncio.Event = None):
+        """
+        Claim and run queued jobs until stop_event is set.
+        """
+        job_model = await JobModel.create_instance(db_client=self.db_client)
+        stop_event = stop_event if stop_event else asyncio.Event()
+        self.logger.info(f"Job worker {worker_id} started.")
+
+        while not stop_event.is_set():
+            try:
+                job = await job_model.claim_next_job(
+                    worker_id=worker_id,
+                    lease_seconds=self.app_settings.JOB_LEASE_SECONDS,
+                    max_attempts=self.app_settings.JOB_MAX_ATTEMPTS
+                )
+            except Exception as e:
+                self.logger.error(f"Job worker {worker_id} failed to claim a job: {e}")
+                job = None
+
+            if job is None:
+                try:
+                    await asyncio.wait_for(stop_event.wait(),
+                                           timeout=self.app_settings.JOB_POLL_INTERVAL_SECONDS)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            self.logger.info(f"Job worker {worker_id} running job {job.job_id} ({job.job_type}).")
+            await self.run_job(job=job)
+
+        self.logger.info(f"Job worker {worker_id} stopped.")
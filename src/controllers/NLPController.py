@@ -1,7 +1,11 @@
+import asyncio
 import json
 from .BaseController import BaseController
-from models.db_schemes import Project, DataChunk
+from models.db_schemes import Project, DataChunk, RetrievedDocument
 from stores.llm.LLMEnums import DocumentTypeEnum
+from stores.vectordb.MetadataFilter import MetadataFilter
+from stores.vectordb.VectorDBEnums import SearchModeEnums
+from utils.rank_fusion import reciprocal_rank_fusion
 from typing import List
 
 class NLPController(BaseController):
@@ -11,13 +15,14 @@ class NLPController(BaseController):
     """
 
     def __init__(self, vectordb_client, generation_client, 
-                 embedding_client, template_parser):
+                 embedding_client, template_parser, tokenizer_service=None):
         super().__init__()
         
         self.vectordb_client = vectordb_client
         self.generation_client = generation_client
         self.embedding_client = embedding_client
         self.template_parser = template_parser
+        self.tokenizer_service = tokenizer_service
         
     def create_collection_name(self, project_id: str) -> str:
         """
@@ -43,81 +48,295 @@ class NLPController(BaseController):
             json.dumps(collection_info, default=lambda x: x.__dict__)
         )
 
-    async def index_into_vectordb(self, project: Project, chunks: List[DataChunk],
-                            chunks_ids: List[int],
-                            do_reset: bool = False):
+    async def embed_chunks(self, chunks: List[DataChunk]):
         """
-        Indexes the provided data into the vector database for the given project.
+        Embeds the text of the provided chunks as documents.
         """
-       
-        # step 1: get collection name
-        collection_name = self.create_collection_name(project_id=project.project_id)
-        
-        # step 2: manage items
         texts = [
             c.chunk_text for c in chunks
         ]
-        
-        metadata = [
-            c.chunk_metadata for c in chunks
-        ]
-        
-        vectors = self.embedding_client.embed_text(text=texts,
-                                             document_type=DocumentTypeEnum.DOCUMENT.value) 
-        
-        # step3: create collection if not exists
-        _ = await self.vectordb_client.create_collection(
-            collection_name=collection_name,
-            embedding_size=self.embedding_client.embedding_size,
-            do_reset=do_reset,
+
+        return await self.embedding_client.embed_text_async(
+            text=texts,
+            document_type=DocumentTypeEnum.DOCUMENT.value
         )
-        
-        # step 4: insert into vectordb
-        _ = await self.vectordb_client.insert_many(
+
+    def get_vector_metadata(self, chunk: DataChunk):
+        """
+        Metadata stored with a chunk vector, the chunk metadata plus the ids of the
+        assets it belongs to, its own and those of its duplicates, so searches can be
+        filtered by asset. chunk_asset_ids is deferred and has to be loaded by the query.
+        """
+        asset_ids = chunk.chunk_asset_ids or [chunk.chunk_asset_id]
+        return {**(chunk.chunk_metadata or {}), "asset_id": sorted(asset_ids)}
+
+    async def insert_chunks_vectors(self, project: Project, chunks: List[DataChunk],
+                                    vectors: list, use_copy: bool = False):
+        """
+        Inserts already embedded chunks into the vector database collection of the project.
+        """
+        collection_name = self.create_collection_name(project_id=project.project_id)
+
+        return await self.vectordb_client.insert_many(
             collection_name=collection_name,
-            texts=texts,
-            metadata=metadata,
+            texts=[c.chunk_text for c in chunks],
+            metadata=[self.get_vector_metadata(c) for c in chunks],
             vectors=vectors,
-            record_ids=chunks_ids,
+            record_ids=[c.chunk_id for c in chunks],
+            use_copy=use_copy,
         )
-        
-        return True
-    
-    async def search_vectordb_collection(self, project: Project, text: str, limit: int = 10):
+
+    async def search_by_vector(self, collection_name: str, text: str, limit: int,
+                               ef_search: int = None, iterative_scan: str = None,
+                               metadata_filter: MetadataFilter = None):
         """
-        Searches the vector database collection for the given project using the provided text.
+        Embeds the search text as a query and searches the collection by vector similarity.
         """
-        query_vector = None
-        collection_name = self.create_collection_name(project_id=project.project_id)
-        
         # step 1: embed the search text
-        vector = self.embedding_client.embed_text(
+        vector = await self.embedding_client.embed_text_async(
             text=text,
             document_type=DocumentTypeEnum.QUERY.value
         )
         
-        if not vector or len(vector) == 0:
-            return False
+        if vector is None or len(vector) == 0:
+            return None
         
-        if isinstance(vector, list) and len(vector) > 0:
-            query_vector = vector[0]
-
-        if not query_vector:
-            return False
+        query_vector = vector[0]
 
         # step 2: search in vectordb
-        results = await self.vectordb_client.search_by_vector(
+        return await self.vectordb_client.search_by_vector(
             collection_name=collection_name,
             vector=query_vector,
+            limit=limit,
+            ef_search=ef_search,
+            iterative_scan=iterative_scan,
+            metadata_filter=metadata_filter
+        )
+
+    def fuse_results(self, results: List[List[RetrievedDocument]], limit: int):
+        """
+        Merges ranked result lists with reciprocal rank fusion, the fused score replaces
+        the per-list scores. Documents are matched across lists by record id, so chunks
+        with the same text stay distinct, and by text when a backend returns no id.
+        """
+        documents = {}
+        rankings = []
+        for docs in results:
+            ranking = []
+            for doc in docs or []:
+                key = ("record", doc.record_id) if doc.record_id is not None else ("text", doc.text)
+                documents.setdefault(key, doc)
+                ranking.append(key)
+            rankings.append(ranking)
+
+        fused = reciprocal_rank_fusion(
+            rankings=rankings,
+            k=self.app_settings.VECTOR_DB_HYBRID_RRF_K,
             limit=limit
         )
+
+        return [
+            RetrievedDocument(text=documents[key].text, score=score, record_id=documents[key].record_id)
+            for key, score in fused
+        ]
+    
+    async def search_vectordb_collection(self, project: Project, text: str, limit: int = 10,
+                                         ef_search: int = None, iterative_scan: str = None,
+                                         metadata_filter: MetadataFilter = None,
+                                         search_mode: str = None):
+        """
+        Searches the vector database collection for the given project using the provided text.
+        metadata_filter is applied inside the vector DB search.
+        search_mode is vector, lexical (full text) or hybrid: both searches run concurrently
+        on a deeper candidate list and are fused with reciprocal rank fusion.
+        """
+        collection_name = self.create_collection_name(project_id=project.project_id)
+        search_mode = SearchModeEnums(
+            search_mode if search_mode else self.app_settings.VECTOR_DB_SEARCH_MODE
+        ).value
+
+        if search_mode == SearchModeEnums.VECTOR.value:
+            results = await self.search_by_vector(
+                collection_name=collection_name, text=text, limit=limit, ef_search=ef_search,
+                iterative_scan=iterative_scan, metadata_filter=metadata_filter
+            )
+
+        elif search_mode == SearchModeEnums.LEXICAL.value:
+            results = await self.vectordb_client.search_by_text(
+                collection_name=collection_name, text=text, limit=limit,
+                metadata_filter=metadata_filter
+            )
+
+        else:
+            candidates_limit = limit * max(self.app_settings.VECTOR_DB_HYBRID_CANDIDATES_MULTIPLIER, 1)
+            vector_results, lexical_results = await asyncio.gather(
+                self.search_by_vector(
+                    collection_name=collection_name, text=text, limit=candidates_limit,
+                    ef_search=ef_search, iterative_scan=iterative_scan,
+                    metadata_filter=metadata_filter
+                ),
+                self.vectordb_client.search_by_text(
+                    collection_name=collection_name, text=text, limit=candidates_limit,
+                    metadata_filter=metadata_filter
+                )
+            )
+            results = self.fuse_results(results=[vector_results, lexical_results], limit=limit)
         
         if not results:
             return False
         
         return results
     
-    async def answer_rag_question(self, project: Project, query: str, limit: int = 10):
+    async def search_by_vectors(self, collection_name: str, texts: List[str], limit: int,
+                                ef_search: int = None, iterative_scan: str = None,
+                                metadata_filter: MetadataFilter = None):
+        """
+        Embeds all search texts in one call and searches the collection for all of them in one batch.
+        """
+        vectors = await self.embedding_client.embed_text_async(
+            text=texts,
+            document_type=DocumentTypeEnum.QUERY.value
+        )
+
+        if vectors is None or len(vectors) != len(texts):
+            return None
+
+        return await self.vectordb_client.search_by_vectors(
+            collection_name=collection_name,
+            vectors=vectors,
+            limit=limit,
+            ef_search=ef_search,
+            iterative_scan=iterative_scan,
+            metadata_filter=metadata_filter
+        )
+
+    async def search_by_texts(self, collection_name: str, texts: List[str], limit: int,
+                              metadata_filter: MetadataFilter = None):
+        """
+        Runs the full text searches of all search texts concurrently.
+        """
+        return await asyncio.gather(*[
+            self.vectordb_client.search_by_text(
+                collection_name=collection_name, text=text, limit=limit,
+                metadata_filter=metadata_filter
+            )
+            for text in texts
+        ])
+
+    async def search_vectordb_collection_batch(self, project: Project, texts: List[str], limit: int = 10,
+                                               ef_search: int = None, iterative_scan: str = None,
+                                               metadata_filter: MetadataFilter = None,
+                                               search_mode: str = None):
+        """
+        Searches the vector database collection of the project for many texts at once,
+        returning one result list per text in input order.
+        """
+        collection_name = self.create_collection_name(project_id=project.project_id)
+        search_mode = SearchModeEnums(
+            search_mode if search_mode else self.app_settings.VECTOR_DB_SEARCH_MODE
+        ).value
+
+        if search_mode == SearchModeEnums.VECTOR.value:
+            results = await self.search_by_vectors(
+                collection_name=collection_name, texts=texts, limit=limit, ef_search=ef_search,
+                iterative_scan=iterative_scan, metadata_filter=metadata_filter
+            )
+
+        elif search_mode == SearchModeEnums.LEXICAL.value:
+            results = await self.search_by_texts(
+                collection_name=collection_name, texts=texts, limit=limit,
+                metadata_filter=metadata_filter
+            )
+
+        else:
+            candidates_limit = limit * max(self.app_settings.VECTOR_DB_HYBRID_CANDIDATES_MULTIPLIER, 1)
+            vector_results, lexical_results = await asyncio.gather(
+                self.search_by_vectors(
+                    collection_name=collection_name, texts=texts, limit=candidates_limit,
+                    ef_search=ef_search, iterative_scan=iterative_scan,
+                    metadata_filter=metadata_filter
+                ),
+                self.search_by_texts(
+                    collection_name=collection_name, texts=texts, limit=candidates_limit,
+                    metadata_filter=metadata_filter
+                )
+            )
+            results = [
+                self.fuse_results(results=[query_vector_results, query_lexical_results], limit=limit)
+                for query_vector_results, query_lexical_results in zip(
+                    vector_results if vector_results else [None] * len(texts), lexical_results
+                )
+            ]
+
+        if not results:
+            return False
+
+        return [documents if documents else [] for documents in results]
+
+    def get_context_budget(self, prompts: List[str]):
+        """
+        Tokens left for documents in the generation model context window, after the
+        given prompts and the max output tokens.
+        """
+        model_id = self.generation_client.generation_model_id
+        used_tokens = sum(
+            self.tokenizer_service.count_tokens(text=prompt, model_id=model_id)
+            for prompt in prompts
+        )
+        
+        return self.app_settings.GENERATION_MODEL_CONTEXT_WINDOW \
+            - (self.app_settings.GENERATION_DEFAULT_MAX_TOKENS or 0) \
+            - self.app_settings.GENERATION_CONTEXT_RESERVED_TOKENS \
+            - used_tokens
+    
+    def pack_document_prompts(self, documents: List, prompts: List[str]):
+        """
+        Render the retrieved documents, best first, into as many document prompts as fit
+        the context budget. The first document that does not fit is truncated to the rest
+        of the budget. Without a tokenizer service every document is cut by characters.
+        """
+        def render(idx: int, text: str):
+            return self.template_parser.get("rag", "document_prompt", {
+                "doc_num": idx + 1,
+                "chunk_text": text
+            })
+        
+        if self.tokenizer_service is None:
+            return [
+                render(idx, self.generation_client.process_text(doc.text))
+                for idx, doc in enumerate(documents)
+            ]
+        
+        model_id = self.generation_client.generation_model_id
+        budget = self.get_context_budget(prompts=prompts)
+        
+        document_prompts = []
+        for idx, doc in enumerate(documents):
+            # +1 for the newline joining the document prompts
+            document_prompt = render(idx, doc.text.strip())
+            document_tokens = self.tokenizer_service.count_tokens(
+                text=document_prompt, model_id=model_id
+            ) + 1
+            
+            if document_tokens <= budget:
+                document_prompts.append(document_prompt)
+                budget -= document_tokens
+                continue
+            
+            text_budget = budget - self.tokenizer_service.count_tokens(
+                text=render(idx, ""), model_id=model_id
+            ) - 1
+            if text_budget >= self.app_settings.GENERATION_CONTEXT_MIN_DOCUMENT_TOKENS:
+                document_prompts.append(render(idx, self.tokenizer_service.truncate(
+                    text=doc.text.strip(), max_tokens=text_budget, model_id=model_id
+                )))
+            break
+        
+        return document_prompts
+    
+    async def answer_rag_question(self, project: Project, query: str, limit: int = 10,
+                                  ef_search: int = None, iterative_scan: str = None,
+                                  metadata_filter: MetadataFilter = None, search_mode: str = None):
         """
         Answers a question using the RAG (Retrieval-Augmented Generation) approach.
         """
@@ -128,7 +347,11 @@ class NLPController(BaseController):
         retrieved_documents = await self.search_vectordb_collection(
             project=project,
             text=query,
-            limit=limit
+            limit=limit,
+            ef_search=ef_search,
+            iterative_scan=iterative_scan,
+            metadata_filter=metadata_filter,
+            search_mode=search_mode
         )
         
         if not retrieved_documents or len(retrieved_documents) == 0:
@@ -137,17 +360,15 @@ class NLPController(BaseController):
         # step 2: constract LLM Prompet
         system_prompet = self.template_parser.get("rag", "system_prompt")
         
-        document_prompts = "\n".join([
-            self.template_parser.get("rag", "document_prompt", {
-                "doc_num": idx + 1,
-                "chunk_text": self.generation_client.process_text(doc.text)
-            }) for idx, doc in enumerate(retrieved_documents)
-        ])
-        
         footer_prompt = self.template_parser.get("rag", "footer_prompt",{
             "query": query
         })
         
+        document_prompts = "\n".join(self.pack_document_prompts(
+            documents=retrieved_documents,
+            prompts=[system_prompet, footer_prompt]
+        ))
+        
         chat_history = [
             self.generation_client.construct_prompt(
                 prompt = system_prompet, 
@@ -156,7 +377,7 @@ class NLPController(BaseController):
         
         full_prompt = "\n\n".join([document_prompts, footer_prompt])
         
-        answer = self.generation_client.generate_text(
+        answer = await self.generation_client.generate_text_async(
             prompt=full_prompt,
             chat_history=chat_history,
         )
@@ -0,0 +1,138 @@
+from .BaseController import BaseController
+from .ProjectController import ProjectController
+from typing import AsyncIterator, List, Tuple
+import asyncio
+import gzip
+import json
+import os
+import re
+
+
+class ParsedTextCacheController(BaseController):
+    """
+    Caches the extracted page text of assets on local disk, keyed by their content hash.
+    Entries are gzip-compressed JSON lines, one page per line, stored in a .parsed
+    directory next to the project files, so re-chunking an asset skips parsing it.
+    """
+
+    # bump when the extraction output changes, old entries are then ignored
+    CACHE_VERSION = 2
+    CACHE_DIR_NAME = ".parsed"
+    # page metadata of the file that produced an entry, not shared by other files with
+    # the same content, stripped before caching and stamped again by the reader
+    PER_FILE_FIELDS = ("source",)
+
+    def __init__(self, project_id: str):
+        super().__init__()
+
+        self.project_id = project_id
+        self.cache_path = os.path.join(
+            ProjectController().get_project_path(project_id=project_id),
+            self.CACHE_DIR_NAME
+        )
+
+    def get_entry_path(self, content_hash: str):
+        if not content_hash or not re.fullmatch(r"[0-9a-f]{16,128}", content_hash):
+            return None
+
+        return os.path.join(self.cache_path, f"{content_hash}.v{self.CACHE_VERSION}.jsonl.gz")
+
+    def has_entry(self, content_hash: str):
+        entry_path = self.get_entry_path(content_hash=content_hash)
+        return entry_path is not None and os.path.exists(entry_path)
+
+    async def stream_pages(self, content_hash: str,
+                           read_size: int = 1048576) -> AsyncIterator[Tuple[str, dict]]:
+        """
+        Yield the cached pages of an entry, reading about read_size characters at a time
+        off the event loop.
+        """
+        f = gzip.open(self.get_entry_path(content_hash=content_hash), "rt", encoding="utf-8")
+        try:
+            while lines := await asyncio.to_thread(f.readlines, read_size):
+                for line in lines:
+                    yield self.decode_page(line)
+        finally:
+            f.close()
+
+    def decode_page(self, line: str):
+        record = json.loads(line)
+        return record["text"], record["metadata"]
+
+    def open_writer(self, content_hash: str):
+        """
+        Open a writer for a new entry. Pages go to a temporary file that only replaces
+        the entry once the writer is committed.
+        """
+        entry_path = self.get_entry_path(content_hash=content_hash)
+        if entry_path is None:
+            return None
+
+        os.makedirs(self.cache_path, exist_ok=True)
+        return ParsedTextCacheWriter(entry_path=entry_path)
+
+    def get_cache_info(self):
+        """
+        Get the number and total size of the cache entries of the project.
+        """
+        entries = []
+        if os.path.exists(self.cache_path):
+            for entry in os.scandir(self.cache_path):
+                if entry.is_file() and entry.name.endswith(".jsonl.gz"):
+                    entries.append({
+                        "content_hash": entry.name.split(".")[0],
+                        "size_bytes": entry.stat().st_size,
+                        "modified_at": entry.stat().st_mtime,
+                    })
+
+        return {
+            "entries_count": len(entries),
+            "size_bytes": sum(e["size_bytes"] for e in entries),
+            "entries": entries,
+        }
+
+    def evict(self, content_hash: str = None):
+        """
+        Delete one cache entry, or every entry of the project.
+        Returns the number of deleted entries.
+        """
+        if not os.path.exists(self.cache_path):
+            return 0
+
+        evicted_count = 0
+        for entry in os.scandir(self.cache_path):
+            if not entry.is_file() or not entry.name.endswith(".jsonl.gz"):
+                continue
+            if content_hash and not entry.name.startswith(f"{content_hash}."):
+                continue
+
+            os.remove(entry.path)
+            evicted_count += 1
+
+        return evicted_count
+
+
+class ParsedTextCacheWriter:
+
+    def __init__(self, entry_path: str):
+        self.entry_path = entry_path
+        self.temp_path = f"{entry_path}.{os.getpid()}.{id(self)}.tmp"
+        self.file = gzip.open(self.temp_path, "wt", encoding="utf-8", compresslevel=6)
+
+    def write_pages(self, pages: List[Tuple[str, dict]]):
+        for page_content, metadata in pages:
+            metadata = {
+                key: value for key, value in (metadata or {}).items()
+                if key not in ParsedTextCacheController.PER_FILE_FIELDS
+            }
+            self.file.write(json.dumps({"text": page_content, "metadata": metadata}, ensure_ascii=False))
+            self.file.write("\n")
+
+    def commit(self):
+        self.file.close()
+        os.replace(self.temp_path, self.entry_path)
+
+    def discard(self):
+        self.file.close()
+        if os.path.exists(self.temp_path):
+            os.remove(self.temp_path)
@@ -1,18 +1,25 @@
 from .BaseController import BaseController
 from .ProjectController import ProjectController
+from .ParsedTextCacheController import ParsedTextCacheController
 import os
-from langchain_community.document_loaders import TextLoader, PyPDFLoader
 from models import ProcessingEnum
-from typing import List
+from utils.extraction import count_pdf_pages, extract_pdf_pages
+from utils.chunker import Chunker
+from concurrent.futures import Executor
+from collections import deque
+from typing import AsyncIterator, Callable
 from dataclasses import dataclass
+import aiofiles
+import asyncio
+import hashlib
 
 
 @dataclass
 class Document:
     page_content: str
     metadata: dict
-    
-    
+
+
 class ProcessController(BaseController):
     
     
@@ -29,11 +36,19 @@ class ProcessController(BaseController):
         """
         return os.path.splitext(file_id)[-1]
    
-    def get_file_laoder(self, file_id: str):
+    def get_parsed_text_cache(self, content_hash: str = None):
         """
-        Get the loader for the file based on its extension.
+        Get the parsed-text cache of the project, None when it is disabled or unkeyed.
+        """
+        if not content_hash or not self.app_settings.PARSED_TEXT_CACHE_ENABLED:
+            return None
+        
+        return ParsedTextCacheController(project_id=self.project_id)
+    
+    def get_file_path(self, file_id: str):
+        """
+        Get the path of the file, None if it does not exist.
         """
-        file_extension = self.get_file_extension(file_id)
         file_path = os.path.join(
             self.project_path,
             file_id
@@ -41,85 +56,134 @@ class ProcessController(BaseController):
         
         if not os.path.exists(file_path):
             return None
-                
-        if file_extension == ProcessingEnum.TXT.value:
-            return TextLoader(file_path, encoding='utf-8')
         
-        elif file_extension ==  ProcessingEnum.PDF.value:
-            return PyPDFLoader(file_path, encoding='utf-8')
-        
-        else:
-            raise ValueError(f"Unsupported file type: {file_extension}")
+        return file_path
+    
+    def get_file_hash(self, file_id: str, block_size: int = 1048576):
+        """
+        Get the sha256 of the file content, None if it does not exist.
+        """
+        file_path = self.get_file_path(file_id=file_id)
+        if file_path is None:
+            return None
         
+        content_hash = hashlib.sha256()
+        with open(file_path, "rb") as f:
+            while block := f.read(block_size):
+                content_hash.update(block)
         
-    def get_file_content(self, file_id: str):
+        return content_hash.hexdigest()
+    
+    async def stream_file_pages(self, file_id: str, executor: Executor,
+                                page_batch_size: int = None,
+                                content_hash: str = None) -> AsyncIterator[Document]:
         """
-        Get the content of the file using the appropriate loader.
+        Yield the file content page by page.
+        With a content_hash, cached pages are replayed instead of parsing the file, and
+        freshly extracted pages are written to the cache. Entries are shared by files with
+        the same content, so replayed pages get the source of this file.
         """
-        loader = self.get_file_laoder(file_id = file_id)
-        if loader:
-            return loader.load()
+        cache = self.get_parsed_text_cache(content_hash=content_hash)
+        if cache and cache.has_entry(content_hash=content_hash):
+            file_path = self.get_file_path(file_id=file_id)
+            async for page_content, metadata in cache.stream_pages(content_hash=content_hash):
+                yield Document(page_content=page_content, metadata={**metadata, "source": file_path})
+            return
         
-        return None
+        writer = cache.open_writer(content_hash=content_hash) if cache else None
+        try:
+            async for page in self.extract_file_pages(file_id=file_id, executor=executor,
+                                                      page_batch_size=page_batch_size):
+                if writer:
+                    await asyncio.to_thread(writer.write_pages, [(page.page_content, page.metadata)])
+                yield page
+        except BaseException:
+            # an unfinished entry is never committed
+            if writer:
+                writer.discard()
+            raise
+        
+        if writer:
+            writer.commit()
     
-    def process_file_content(self, file_id: str, file_content: list,
-                             chunk_size: int = 100, overlap_size: int = 20):
+    async def extract_file_pages(self, file_id: str, executor: Executor,
+                                 page_batch_size: int = None) -> AsyncIterator[Document]:
         """
-        Process the file content into chunks.
+        Extract the file content page by page.
+        PDF page ranges of page_batch_size are extracted in the process pool, a bounded
+        number of ranges ahead, and yielded in page order. Text files are read in blocks.
         """
-
-        file_content_texts = [
-            rec.page_content
-            for rec in file_content
-        ]
-        
-        file_content_metadata = [
-            rec.metadata
-            for rec in file_content
-        ]
-        
-        # chunks = text_splitter.create_documents(
-        #     file_content_texts,
-        #     metadatas=file_content_metadata
-        # )
-        
-        chunks = self.process_simpler_splitter(
-            texts=file_content_texts,
-            metadatas=file_content_metadata,
-            chunk_size=chunk_size
-        )
+        file_extension = self.get_file_extension(file_id)
+        file_path = self.get_file_path(file_id=file_id)
+        
+        if file_path is None:
+            return
+        
+        if file_extension == ProcessingEnum.TXT.value:
+            async with aiofiles.open(file_path, "r", encoding="utf-8") as f:
+                while block := await f.read(self.app_settings.EXTRACTION_TEXT_BLOCK_SIZE):
+                    yield Document(page_content=block, metadata={"source": file_path})
+        
+        elif file_extension == ProcessingEnum.PDF.value:
+            page_batch_size = page_batch_size if page_batch_size \
+                else self.app_settings.EXTRACTION_PDF_PAGE_BATCH_SIZE
+            
+            loop = asyncio.get_running_loop()
+            pages_count = await loop.run_in_executor(executor, count_pdf_pages, file_path)
+            
+            batch_starts = iter(range(0, pages_count, page_batch_size))
+            running_batches = deque()
+            
+            def submit_next_batch():
+                start_page = next(batch_starts, None)
+                if start_page is not None:
+                    running_batches.append(loop.run_in_executor(
+                        executor, extract_pdf_pages, file_path,
+                        start_page, start_page + page_batch_size
+                    ))
+            
+            for _ in range(self.app_settings.EXTRACTION_PDF_PREFETCH_BATCHES):
+                submit_next_batch()
+            
+            try:
+                while running_batches:
+                    batch = await running_batches.popleft()
+                    submit_next_batch()
+                    
+                    for page_content, metadata in batch:
+                        yield Document(page_content=page_content, metadata=metadata)
+            finally:
+                for future in running_batches:
+                    future.cancel()
         
-        return chunks
+        else:
+            raise ValueError(f"Unsupported file type: {file_extension}")
     
-    def process_simpler_splitter(self, texts: List[str], metadatas: List[dict], chunk_size: int, splitter_tag: str="\n"):
+    async def stream_file_chunks(self, file_id: str, executor: Executor, chunk_size: int = 100,
+                                 overlap_size: int = 20, chunk_size_unit: str = None,
+                                 count_tokens: Callable[[str], int] = None,
+                                 page_batch_size: int = None,
+                                 content_hash: str = None) -> AsyncIterator[Document]:
         """
-        Process the texts into chunks using a simpler splitter.
+        Yield the chunks of the file as its pages are extracted.
         """
-        full_text = " ".join(texts)
-
-        # split by splitter_tag
-        lines = [ doc.strip() for doc in full_text.split(splitter_tag) if len(doc.strip()) > 1 ]
-
-        chunks = []
-        current_chunk = ""
-
-        for line in lines:
-            current_chunk += line + splitter_tag
-            if len(current_chunk) >= chunk_size:
-                chunks.append(Document(
-                    page_content=current_chunk.strip(),
-                    metadata={}
-                ))
-
-                current_chunk = ""
-
-        if len(current_chunk) >= 0:
-            chunks.append(Document(
-                page_content=current_chunk.strip(),
-                metadata={}
-            ))
-
-        return chunks
-
-
-    
\ No newline at end of file
+        file_extension = self.get_file_extension(file_id)
+        
+        # text blocks are cut at arbitrary offsets, PDF pages are joined with a space
+        chunker = Chunker(
+            chunk_size=chunk_size,
+            overlap_size=overlap_size,
+            size_unit=chunk_size_unit if chunk_size_unit else self.app_settings.CHUNKING_SIZE_UNIT,
+            page_joiner="" if file_extension == ProcessingEnum.TXT.value else " ",
+            count_tokens=count_tokens,
+            max_chunk_chars=self.app_settings.CHUNKING_MAX_CHUNK_CHARS
+        )
+        
+        async for page in self.stream_file_pages(file_id=file_id, executor=executor,
+                                                 page_batch_size=page_batch_size,
+                                                 content_hash=content_hash):
+            for chunk in chunker.feed(text=page.page_content, page=page.metadata.get("page")):
+                yield chunk
+        
+        for chunk in chunker.flush():
+            yield chunk
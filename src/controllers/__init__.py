@@ -2,4 +2,8 @@ from .DataController import DataController
 from .BaseController import BaseController
 from .ProjectController import ProjectController
 from .ProcessController import ProcessController
-from .NLPController import NLPController
\ No newline at end of file
+from .NLPController import NLPController
+from .IndexingController import IndexingController
+from .DedupController import DedupController
+from .JobController import JobController, JobCancelledError
+from .ParsedTextCacheController import ParsedTextCacheController
@@ -28,17 +28,106 @@ class Settings(BaseSettings):
     GENERATION_MODEL_ID: str = None
     EMBEDDING_MODEL_ID: str = None
     EMBEDDING_MODEL_SIZE: int = None
+    
+    EMBEDDING_CACHE_ENABLED: bool = True
+    EMBEDDING_CACHE_PERSISTENT: bool = True
+    EMBEDDING_CACHE_LRU_SIZE: int = 10000
+    EMBEDDING_BATCHING_ENABLED: bool = True
+    EMBEDDING_BATCH_MAX_SIZE: int = 32
+    EMBEDDING_BATCH_MAX_WAIT_MS: float = 5.0
+    EMBEDDING_RPM_LIMIT: int = 0
+    EMBEDDING_TPM_LIMIT: int = 0
+    EMBEDDING_MAX_REQUEST_TOKENS: int = 100000
+    EMBEDDING_MAX_REQUEST_TEXTS: int = 256
+    EMBEDDING_MAX_CONCURRENT_REQUESTS: int = 4
+    EMBEDDING_MAX_RETRIES: int = 5
+    EMBEDDING_RETRY_BASE_SECONDS: float = 0.5
+    EMBEDDING_RETRY_MAX_SECONDS: float = 30.0
 
     INPUT_DEFAULT_MAX_CHARACTERS: int = None
     GENERATION_DEFAULT_MAX_TOKENS: int = None
     GENERATION_DEFAULT_TEMPERATURE: float = None
+    GENERATION_MODEL_CONTEXT_WINDOW: int = 8192
+    GENERATION_CONTEXT_RESERVED_TOKENS: int = 64
+    GENERATION_CONTEXT_MIN_DOCUMENT_TOKENS: int = 32
+
+    TOKENIZERS_DIR: str = "assets/tokenizers"
+    TOKENIZER_CHARS_PER_TOKEN: float = 4.0
+    
+    LLM_HTTP_MAX_CONNECTIONS: int = 100
+    LLM_HTTP_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    LLM_HTTP_TIMEOUT: float = 60.0
+
+    LOCAL_MODELS_DIR: str = "assets/models"
+    LOCAL_EMBEDDING_BATCH_SIZE: int = 32
+    LOCAL_EMBEDDING_WORKERS: int = 2
+    LOCAL_EMBEDDING_THREADS_PER_WORKER: int = 0
+    LOCAL_EMBEDDING_MAX_LENGTH: int = 512
+    LOCAL_EMBEDDING_NORMALIZE: bool = True
+    LOCAL_EMBEDDING_QUERY_PREFIX: str = ""
+    LOCAL_EMBEDDING_DOCUMENT_PREFIX: str = ""
+
+    FAKE_LATENCY_MS: float = 0.0
+    FAKE_LATENCY_JITTER_MS: float = 0.0
+    FAKE_ERROR_RATE: float = 0.0
+    FAKE_SEED: int = 0
+    FAKE_GENERATION_TEXT: str = None
     
     VECTOR_DB_BACKEND_LITERAL: List[str] = None
     VECTOR_DB_BACKEND: str
     VECTOR_DB_PATH: str
     VECTOR_DB_DISTANCE_METHOD: str = None
     VECTOR_DB_PGVEV_INDEX_THRESHOLD: int = 100
-    
+    VECTOR_DB_HNSW_EF_SEARCH: int = None
+    VECTOR_DB_HNSW_ITERATIVE_SCAN: str = None
+    VECTOR_DB_HNSW_FILTERED_ITERATIVE_SCAN: str = "relaxed_order"
+    VECTOR_DB_METADATA_INDEX_FIELDS: dict = {"asset_id": "integer", "page_start": "integer",
+                                             "page_end": "integer", "source": "keyword"}
+    VECTOR_DB_SEARCH_MODE: str = "vector"
+    VECTOR_DB_HYBRID_RRF_K: int = 60
+    VECTOR_DB_HYBRID_CANDIDATES_MULTIPLIER: int = 4
+    VECTOR_DB_PGVEC_TEXT_SEARCH_CONFIG: str = "simple"
+    VECTOR_DB_SEARCH_BATCH_MAX_QUERIES: int = 256
+    VECTOR_DB_BM25_INDEX_TTL_SECONDS: float = 60
+    SEARCH_CACHE_ENABLED: bool = True
+    SEARCH_CACHE_SHARED: bool = False
+    SEARCH_CACHE_LRU_SIZE: int = 1000
+    SEARCH_CACHE_TTL_SECONDS: float = 300
+    SEARCH_CACHE_VERSION_TTL_SECONDS: float = 1
+    VECTOR_DB_PGVEC_MAINTENANCE_WORK_MEM: str = None
+    VECTOR_DB_PGVEC_MAX_PARALLEL_MAINTENANCE_WORKERS: int = None
+    VECTOR_DB_PGVEC_COLLECTION_REGISTRY_TTL_SECONDS: float = 60
+
+    INDEXING_PAGE_SIZE: int = 100
+    INDEXING_QUEUE_SIZE: int = 4
+    INDEXING_EMBEDDING_CONCURRENCY: int = 2
+    INDEXING_BULK_LOAD: bool = True
+    INDEXING_BULK_LOAD_MIN_FRACTION: float = 0.3
+    INGESTION_USE_COPY: bool = False
+
+    EXTRACTION_POOL_SIZE: int = None
+    EXTRACTION_PDF_PAGE_BATCH_SIZE: int = 50
+    EXTRACTION_PDF_PREFETCH_BATCHES: int = 4
+    EXTRACTION_TEXT_BLOCK_SIZE: int = 1048576
+    PARSED_TEXT_CACHE_ENABLED: bool = True
+    PROCESSING_FILE_CONCURRENCY: int = 4
+    PROCESSING_INSERT_BATCH_SIZE: int = 1000
+    CHUNKING_SIZE_UNIT: str = "chars"
+    CHUNKING_MAX_CHUNK_CHARS: int = 4000
+    DEDUP_EXACT_ENABLED: bool = True
+    DEDUP_NEAR_ENABLED: bool = False
+    DEDUP_NEAR_THRESHOLD: float = 0.85
+    DEDUP_MINHASH_NUM_PERM: int = 128
+    DEDUP_MINHASH_BANDS: int = 16
+    DEDUP_SHINGLE_SIZE: int = 9
+
+    JOB_WORKERS_IN_PROCESS: int = 1
+    JOB_WORKERS_PER_PROCESS: int = 2
+    JOB_POLL_INTERVAL_SECONDS: float = 1.0
+    JOB_PROGRESS_FLUSH_SECONDS: float = 1.0
+    JOB_LEASE_SECONDS: float = 60
+    JOB_MAX_ATTEMPTS: int = 3
+
     PRIMARY_LANG: str = "en"
     DEFAULT_LANG: str = "en"
     
@@ -0,0 +1,109 @@
+from helpers.config import Settings
+from stores.llm.LLMProviderFactory import LLMProviderFactory
+from stores.llm.CachedEmbeddingClient import CachedEmbeddingClient
+from stores.llm.BatchingEmbeddingClient import BatchingEmbeddingClient
+from stores.llm.EmbeddingScheduler import EmbeddingScheduler
+from stores.llm.TokenizerService import TokenizerService
+from stores.vectordb.VectorDBProviderFactory import VectorDBProviderFactory
+from stores.vectordb.CachedVectorDBClient import CachedVectorDBClient
+from stores.llm.templates.template_parser import TemplateParser
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
+from sqlalchemy.orm import sessionmaker
+from utils.extraction import create_extraction_pool
+import os
+
+
+async def setup_resources(resources: object, settings: Settings):
+    """
+    Attach the database, LLM and vector DB clients to resources.
+    Shared by the API app and the standalone job worker.
+    """
+    postgres_conn = f"postgresql+asyncpg://{settings.POSTGRES_USERNAME}:{settings.POSTGRES_PASSWORD}@{settings.POSTGRES_HOST}:{settings.POSTGRES_PORT}/{settings.POSTGRES_MAIN_DATABASE}"
+
+    resources.db_engine = create_async_engine(postgres_conn)
+
+    resources.db_client = sessionmaker(
+        resources.db_engine, class_=AsyncSession, expire_on_commit=False
+    )
+
+    llm_provider_factory = LLMProviderFactory(settings)
+    vectordb_provider_factory = VectorDBProviderFactory(config=settings, db_client=resources.db_client)
+
+    # tokenizers are loaded lazily and cached per model id
+    resources.tokenizer_service = TokenizerService(
+        tokenizers_dir=os.path.join(
+            os.path.dirname(os.path.dirname(__file__)), settings.TOKENIZERS_DIR
+        ),
+        chars_per_token=settings.TOKENIZER_CHARS_PER_TOKEN
+    )
+
+    # generation client
+    resources.generation_client = llm_provider_factory.create_provider(provider=settings.GENERATION_BACKEND)
+    resources.generation_client.set_generation_model(model_id=settings.GENERATION_MODEL_ID)
+
+    # embedding client
+    resources.embedding_client = llm_provider_factory.create_provider(provider=settings.EMBEDDING_BACKEND)
+    resources.embedding_client.set_embedding_model(
+        model_id=settings.EMBEDDING_MODEL_ID,
+        embedding_size=settings.EMBEDDING_MODEL_SIZE
+    )
+    # every embedding call of the process is paced and retried by one scheduler
+    resources.embedding_client = EmbeddingScheduler(
+        client=resources.embedding_client,
+        count_tokens=resources.tokenizer_service.get_counter(model_id=settings.EMBEDDING_MODEL_ID),
+        rpm_limit=settings.EMBEDDING_RPM_LIMIT,
+        tpm_limit=settings.EMBEDDING_TPM_LIMIT,
+        max_request_tokens=settings.EMBEDDING_MAX_REQUEST_TOKENS,
+        max_request_texts=settings.EMBEDDING_MAX_REQUEST_TEXTS,
+        max_concurrent_requests=settings.EMBEDDING_MAX_CONCURRENT_REQUESTS,
+        max_retries=settings.EMBEDDING_MAX_RETRIES,
+        retry_base_seconds=settings.EMBEDDING_RETRY_BASE_SECONDS,
+        retry_max_seconds=settings.EMBEDDING_RETRY_MAX_SECONDS
+    )
+    # concurrent small requests (search queries) share embedding calls,
+    # the cache sits in front so cache hits never wait for a batch
+    if settings.EMBEDDING_BATCHING_ENABLED:
+        resources.embedding_client = BatchingEmbeddingClient(
+            client=resources.embedding_client,
+            max_batch_size=settings.EMBEDDING_BATCH_MAX_SIZE,
+            max_wait_ms=settings.EMBEDDING_BATCH_MAX_WAIT_MS
+        )
+    if settings.EMBEDDING_CACHE_ENABLED:
+        resources.embedding_client = CachedEmbeddingClient(
+            client=resources.embedding_client,
+            db_client=resources.db_client if settings.EMBEDDING_CACHE_PERSISTENT else None,
+            lru_size=settings.EMBEDDING_CACHE_LRU_SIZE
+        )
+
+    # vector db client
+    resources.vectordb_client = vectordb_provider_factory.create(
+        provider=settings.VECTOR_DB_BACKEND
+    )
+    # repeated searches are served from a cache invalidated by every collection write
+    if settings.SEARCH_CACHE_ENABLED:
+        resources.vectordb_client = CachedVectorDBClient(
+            client=resources.vectordb_client,
+            db_client=resources.db_client if settings.SEARCH_CACHE_SHARED else None,
+            lru_size=settings.SEARCH_CACHE_LRU_SIZE,
+            ttl_seconds=settings.SEARCH_CACHE_TTL_SECONDS,
+            version_ttl_seconds=settings.SEARCH_CACHE_VERSION_TTL_SECONDS
+        )
+    await resources.vectordb_client.connect()
+
+    resources.template_parser = TemplateParser(
+        language=settings.PRIMARY_LANG,
+        default_language=settings.DEFAULT_LANG,
+    )
+
+    # process pool for document text extraction
+    resources.extraction_pool = create_extraction_pool(pool_size=settings.EXTRACTION_POOL_SIZE)
+
+    return resources
+
+
+async def teardown_resources(resources: object):
+    await resources.db_engine.dispose()
+    await resources.vectordb_client.disconnect()
+    await resources.generation_client.close()
+    await resources.embedding_client.close()
+    resources.extraction_pool.shutdown(cancel_futures=True)
@@ -1,12 +1,12 @@
 from fastapi import FastAPI
-from routes import base, data, nlp
+from routes import base, data, nlp, jobs
 from helpers.config import get_settings
-from stores.llm.LLMProviderFactory import LLMProviderFactory
-from stores.vectordb.VectorDBProviderFactory import VectorDBProviderFactory
-from stores.llm.templates.template_parser import TemplateParser
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
-from sqlalchemy.orm import sessionmaker
+from helpers.resources import setup_resources, teardown_resources
+from controllers import JobController
 from utils.metrics import setup_metrics
+import asyncio
+import os
+import socket
 
 app = FastAPI()
 
@@ -15,42 +15,24 @@ setup_metrics(app)
 async def startup_span():
     settings = get_settings()
 
-    postgres_conn = f"postgresql+asyncpg://{settings.POSTGRES_USERNAME}:{settings.POSTGRES_PASSWORD}@{settings.POSTGRES_HOST}:{settings.POSTGRES_PORT}/{settings.POSTGRES_MAIN_DATABASE}"
-    
-    app.db_engine = create_async_engine(postgres_conn)
-    
-    app.db_client = sessionmaker(
-        app.db_engine, class_=AsyncSession, expire_on_commit=False
-    )
-
-    llm_provider_factory = LLMProviderFactory(settings)
-    vectordb_provider_factory = VectorDBProviderFactory(config=settings, db_client=app.db_client)
-    
-    # generation client
-    app.generation_client = llm_provider_factory.create_provider(provider=settings.GENERATION_BACKEND)
-    app.generation_client.set_generation_model(model_id=settings.GENERATION_MODEL_ID)
-    
-    # embedding client
-    app.embedding_client = llm_provider_factory.create_provider(provider=settings.EMBEDDING_BACKEND)
-    app.embedding_client.set_embedding_model(
-        model_id=settings.EMBEDDING_MODEL_ID,
-        embedding_size=settings.EMBEDDING_MODEL_SIZE
-    )
-    
-    # vector db client
-    app.vectordb_client = vectordb_provider_factory.create(
-        provider=settings.VECTOR_DB_BACKEND
-    )
-    await app.vectordb_client.connect()
-    
-    app.template_parser = TemplateParser(
-        language=settings.PRIMARY_LANG,
-        default_language=settings.DEFAULT_LANG,
-    ) 
+    await setup_resources(app, settings)
+
+    # in-process job workers, separate workers can be started with worker.py
+    app.job_workers_stop = asyncio.Event()
+    job_controller = JobController(resources=app)
+    app.job_workers = [
+        asyncio.create_task(job_controller.run_worker(
+            worker_id=f"{socket.gethostname()}:{os.getpid()}:api-{i}",
+            stop_event=app.job_workers_stop
+        ))
+        for i in range(settings.JOB_WORKERS_IN_PROCESS)
+    ]
 
 async def shutdown_span():
-    app.db_engine.dispose()
-    await app.vectordb_client.disconnect()
+    app.job_workers_stop.set()
+    await asyncio.gather(*app.job_workers, return_exceptions=True)
+
+    await teardown_resources(app)
 
 app.on_event("startup")(startup_span)
 app.on_event("shutdown")(shutdown_span)
@@ -58,3 +40,4 @@ app.on_event("shutdown")(shutdown_span)
 app.include_router(base.base_router)
 app.include_router(data.data_router)
 app.include_router(nlp.nlp_router)
+app.include_router(jobs.jobs_router)
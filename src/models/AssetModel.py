@@ -3,7 +3,7 @@ from .db_schemes import Asset
 from .enums.DataBaseEnum import DataBaseEnum 
 from bson import ObjectId
 from sqlalchemy.future import select
-from sqlalchemy import func
+from sqlalchemy import func, update
 
 class AssetModel(BaseDataModel):
     
@@ -65,3 +65,17 @@ class AssetModel(BaseDataModel):
                 result = await session.execute(query)
                 record = result.scalar_one_or_none()
         return record
+    
+    async def update_asset_config(self, asset_id: int, asset_config: dict):
+        """
+        Replace the config of a specific asset.
+        
+        """
+        async with self.db_client() as session:
+            async with session.begin():
+                query = update(Asset).where(Asset.asset_id == asset_id).values(
+                    asset_config=asset_config,
+                    updated_at=func.now()
+                )
+                await session.execute(query)
+        return True
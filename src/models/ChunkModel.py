@@ -4,7 +4,11 @@ from .enums.DataBaseEnum import DataBaseEnum
 from bson.objectid import ObjectId
 from pymongo import InsertOne
 from sqlalchemy.future import select
-from sqlalchemy import func, delete
+from sqlalchemy import func, delete, update, case
+from sqlalchemy.orm import undefer
+from sqlalchemy.sql import text as sql_text
+import json
+import uuid
 
 class ChunkModel(BaseDataModel):
     
@@ -49,11 +53,16 @@ class ChunkModel(BaseDataModel):
             
         return chunk
     
-    async def insert_many_chunks(self, chunks: list, batch_size: int = 100):
+    async def insert_many_chunks(self, chunks: list, batch_size: int = 100, use_copy: bool = False):
         """
         Insert multiple chunks into the database.
+        With use_copy the rows are streamed through COPY instead of ORM inserts.
         
         """
+        if use_copy:
+            chunks_ids = await self.copy_chunks(chunks=chunks)
+            return len(chunks_ids)
+        
         async with self.db_client() as session:
             async with session.begin():
                 for i in range(0, len(chunks), batch_size):
@@ -63,6 +72,60 @@ class ChunkModel(BaseDataModel):
         return len(chunks)
                     
     
+    async def copy_chunks(self, chunks: list, batch_size: int = 10000):
+        """
+        Bulk insert chunks with binary COPY ... FROM STDIN.
+        Ids are reserved from the chunk_id sequence up front, so they are returned in
+        the order of the given chunks and also set on the chunk objects.
+        
+        """
+        chunks_ids = []
+        table_name = DataChunk.__tablename__
+        columns = ["chunk_id", "chunk_uuid", "chunk_text", "chunk_metadata",
+                   "chunk_order", "chunk_project_id", "chunk_asset_id",
+                   "chunk_hash", "chunk_duplicate_of", "chunk_lsh_bands", "chunk_minhash"]
+        
+        async with self.db_client() as session:
+            async with session.begin():
+                connection = await session.connection()
+                raw_connection = await connection.get_raw_connection()
+                driver_connection = raw_connection.driver_connection
+                
+                for i in range(0, len(chunks), batch_size):
+                    batch = chunks[i:i + batch_size]
+                    
+                    ids_sql = sql_text(
+                        "SELECT nextval(pg_get_serial_sequence(:table_name, 'chunk_id')) "
+                        "FROM generate_series(1, :count)"
+                    )
+                    result = await session.execute(ids_sql, {"table_name": table_name, "count": len(batch)})
+                    batch_ids = sorted(row[0] for row in result.fetchall())
+                    
+                    records = []
+                    for chunk_id, chunk in zip(batch_ids, batch):
+                        chunk.chunk_id = chunk_id
+                        records.append((
+                            chunk_id,
+                            chunk.chunk_uuid or uuid.uuid4(),
+                            chunk.chunk_text,
+                            json.dumps(chunk.chunk_metadata, ensure_ascii=False) if chunk.chunk_metadata is not None else None,
+                            chunk.chunk_order,
+                            chunk.chunk_project_id,
+                            chunk.chunk_asset_id,
+                            chunk.chunk_hash,
+                            chunk.chunk_duplicate_of,
+                            chunk.chunk_lsh_bands,
+                            chunk.chunk_minhash,
+                        ))
+                    
+                    await driver_connection.copy_records_to_table(
+                        table_name, records=records, columns=columns
+                    )
+                    chunks_ids.extend(batch_ids)
+        
+        return chunks_ids
+                    
+    
     async def delete_chunks_by_project_id(self, project_id: ObjectId):
         """
         Delete all chunks associated with a specific project ID.
@@ -76,29 +139,226 @@ class ChunkModel(BaseDataModel):
         return result.rowcount
     
     
-    async def get_project_chunks(self, project_id: ObjectId,
-                                 page_no: int = 1, page_size: int = 100):
+    async def get_asset_chunk_ids(self, asset_id: int):
         """
-        Get all chunks associated with a specific project.
+        Get the ids of all chunks of a specific asset.
         
         """
+        async with self.db_client() as session:
+            query = select(DataChunk.chunk_id).where(DataChunk.chunk_asset_id == asset_id)
+            result = await session.execute(query)
+            chunk_ids = result.scalars().all()
+        return chunk_ids
+    
+    async def get_canonical_chunk_ids_by_hash(self, project_id: int, chunk_hashes: list):
+        """
+        Map each given hash to the id of the project chunk (not itself a duplicate) with it.
+        
+        """
+        if not chunk_hashes:
+            return {}
+
+        async with self.db_client() as session:
+            query = select(DataChunk.chunk_hash, func.min(DataChunk.chunk_id)).where(
+                DataChunk.chunk_project_id == project_id,
+                DataChunk.chunk_hash.in_(chunk_hashes),
+                DataChunk.chunk_duplicate_of.is_(None)
+            ).group_by(DataChunk.chunk_hash)
+            result = await session.execute(query)
+            canonical_ids = {row[0]: row[1] for row in result.all()}
+        return canonical_ids
+
+    async def get_near_duplicate_candidates(self, project_id: int, band_keys: list, signature_size: int):
+        """
+        Get the project chunks (not themselves duplicates) sharing at least one
+        LSH band key with the given ones, as (chunk_id, chunk_minhash, chunk_text)
+        tuples. The text is only read for chunks stored without a signature of
+        signature_size bytes, None otherwise.
+        
+        """
+        if not band_keys:
+            return []
+
+        async with self.db_client() as session:
+            query = select(
+                DataChunk.chunk_id,
+                DataChunk.chunk_minhash,
+                case((func.coalesce(func.length(DataChunk.chunk_minhash), 0) != signature_size,
+                      DataChunk.chunk_text))
+            ).where(
+                DataChunk.chunk_project_id == project_id,
+                DataChunk.chunk_lsh_bands.overlap(band_keys),
+                DataChunk.chunk_duplicate_of.is_(None)
+            ).order_by(DataChunk.chunk_id)
+            result = await session.execute(query)
+            candidates = [(row[0], row[1], row[2]) for row in result.all()]
+        return candidates
+
+    async def promote_duplicates(self, asset_id: int, chunk_ids: list):
+        """
+        Before the chunks of an asset are deleted, make the first duplicate (from another
+        asset) of each of them the new canonical chunk, with the LSH bands and signature
+        of the chunk it replaces, and re-point the remaining duplicates to it. Promoted
+        chunks are marked not indexed so the next push embeds them, as are the canonical
+        chunks of other assets this asset's duplicates point to, whose vectors list it.
+        Returns the number of promoted chunks.
+        
+        """
+        if not chunk_ids:
+            return 0
+
+        promote_sql = sql_text(
+            "WITH promoted AS ("
+            "  SELECT DISTINCT ON (chunk_duplicate_of) chunk_id, chunk_duplicate_of FROM chunks"
+            "  WHERE chunk_duplicate_of = ANY(:chunk_ids) AND chunk_asset_id <> :asset_id"
+            "  ORDER BY chunk_duplicate_of, chunk_id"
+            ") "
+            "UPDATE chunks SET chunk_duplicate_of = NULL, chunk_indexed_at = NULL, "
+            "chunk_lsh_bands = replaced.chunk_lsh_bands, chunk_minhash = replaced.chunk_minhash "
+            "FROM promoted JOIN chunks AS replaced ON replaced.chunk_id = promoted.chunk_duplicate_of "
+            "WHERE chunks.chunk_id = promoted.chunk_id "
+            "RETURNING chunks.chunk_id, promoted.chunk_duplicate_of"
+        )
+        repoint_sql = sql_text(
+            "UPDATE chunks SET chunk_duplicate_of = :new_chunk_id "
+            "WHERE chunk_duplicate_of = :old_chunk_id AND chunk_asset_id <> :asset_id"
+        )
+        shared_sql = sql_text(
+            "UPDATE chunks SET chunk_indexed_at = NULL "
+            "WHERE chunk_id IN ("
+            "  SELECT chunk_duplicate_of FROM chunks"
+            "  WHERE chunk_asset_id = :asset_id AND chunk_duplicate_of IS NOT NULL"
+            ") AND chunk_asset_id <> :asset_id AND chunk_indexed_at IS NOT NULL"
+        )
+
         async with self.db_client() as session:
             async with session.begin():
-                query = select(DataChunk).where(DataChunk.chunk_project_id == project_id).offset(
-                    (page_no - 1) * page_size
-                ).limit(page_size)
+                result = await session.execute(promote_sql, {"chunk_ids": list(chunk_ids), "asset_id": asset_id})
+                promoted = result.fetchall()
+                if promoted:
+                    await session.execute(repoint_sql, [
+                        {"new_chunk_id": new_chunk_id, "old_chunk_id": old_chunk_id, "asset_id": asset_id}
+                        for new_chunk_id, old_chunk_id in promoted
+                    ])
+                await session.execute(shared_sql, {"asset_id": asset_id})
+        return len(promoted)
+
+    async def reset_shared_chunks_indexed(self, chunk_ids: list, asset_id: int):
+        """
+        Mark the given canonical chunks not indexed when they belong to another asset
+        than asset_id, whose chunks now duplicate them, so their vectors are written
+        again with that asset id.
+        
+        """
+        if not chunk_ids:
+            return 0
+
+        async with self.db_client() as session:
+            async with session.begin():
+                query = update(DataChunk).where(
+                    DataChunk.chunk_id.in_(chunk_ids),
+                    DataChunk.chunk_asset_id != asset_id,
+                    DataChunk.chunk_indexed_at.is_not(None)
+                ).values(chunk_indexed_at=None)
+                result = await session.execute(query)
+        return result.rowcount
+
+    async def delete_chunks_by_asset_id(self, asset_id: int):
+        """
+        Delete all chunks associated with a specific asset.
+        
+        """
+        async with self.db_client() as session:
+            async with session.begin():
+                query = delete(DataChunk).where(DataChunk.chunk_asset_id == asset_id)
+                result = await session.execute(query)
+        return result.rowcount
+    
+    
+    async def stream_project_chunks(self, project_id: ObjectId, page_size: int = None,
+                                    only_unindexed: bool = False, exclude_duplicates: bool = True,
+                                    with_asset_ids: bool = False):
+        """
+        Stream the chunks of a project page by page in chunk_id order. Uses keyset
+        pagination (chunk_id > last seen id) so every page costs the same. Duplicate
+        chunks are skipped unless exclude_duplicates is False, chunks already written to
+        the vector DB are skipped with only_unindexed. with_asset_ids loads the deferred
+        chunk_asset_ids needed by the vector metadata.
+
+        """
+        page_size = page_size if page_size else self.app_settings.INDEXING_PAGE_SIZE
+        last_chunk_id = 0
+
+        while True:
+            async with self.db_client() as session:
+                query = select(DataChunk).where(
+                    DataChunk.chunk_project_id == project_id,
+                    DataChunk.chunk_id > last_chunk_id
+                )
+                if exclude_duplicates:
+                    query = query.where(DataChunk.chunk_duplicate_of.is_(None))
+                if only_unindexed:
+                    query = query.where(DataChunk.chunk_indexed_at.is_(None))
+                if with_asset_ids:
+                    query = query.options(undefer(DataChunk.chunk_asset_ids))
+                query = query.order_by(DataChunk.chunk_id).limit(page_size)
                 result = await session.execute(query)
                 records = result.scalars().all()
-            return records
 
-    async def get_total_chunks_count(self, project_id: ObjectId):
+            if not records:
+                break
+
+            last_chunk_id = records[-1].chunk_id
+            yield records
+
+            if len(records) < page_size:
+                break
+
+    async def get_total_chunks_count(self, project_id: ObjectId, only_unindexed: bool = False,
+                                     exclude_duplicates: bool = True):
         """
         Count the number of chunks associated with a specific project.
         
         """
         total_count = 0
         async with self.db_client() as session:
-            count_sql = select(func.count(DataChunk.chunk_id)).where(DataChunk.chunk_project_id == project_id)
+            count_sql = select(func.count(DataChunk.chunk_id)).where(
+                DataChunk.chunk_project_id == project_id
+            )
+            if exclude_duplicates:
+                count_sql = count_sql.where(DataChunk.chunk_duplicate_of.is_(None))
+            if only_unindexed:
+                count_sql = count_sql.where(DataChunk.chunk_indexed_at.is_(None))
             records_count = await session.execute(count_sql)
             total_count = records_count.scalar()
-        return total_count
\ No newline at end of file
+        return total_count
+
+    async def mark_chunks_indexed(self, chunk_ids: list):
+        """
+        Record that the vectors of the given chunks are in the vector DB.
+        
+        """
+        if not chunk_ids:
+            return 0
+
+        async with self.db_client() as session:
+            async with session.begin():
+                query = update(DataChunk).where(
+                    DataChunk.chunk_id.in_(chunk_ids)
+                ).values(chunk_indexed_at=func.now())
+                result = await session.execute(query)
+        return result.rowcount
+
+    async def reset_chunks_indexed(self, project_id: ObjectId):
+        """
+        Mark every chunk of a project as not indexed, e.g. when its collection is recreated.
+        
+        """
+        async with self.db_client() as session:
+            async with session.begin():
+                query = update(DataChunk).where(
+                    DataChunk.chunk_project_id == project_id,
+                    DataChunk.chunk_indexed_at.is_not(None)
+                ).values(chunk_indexed_at=None)
+                result = await session.execute(query)
+        return result.rowcount
@@ -0,0 +1,75 @@
+from .BaseDataModel import BaseDataModel
+from .db_schemes import EmbeddingCacheEntry
+from sqlalchemy.future import select
+from sqlalchemy.dialects.postgresql import insert
+
+class EmbeddingCacheModel(BaseDataModel):
+
+    def __init__(self, db_client: object):
+        super().__init__(db_client = db_client)
+        self.db_client = db_client
+
+
+    @classmethod
+    async def create_instance(cls, db_client: object):
+        """
+        Create an instance of EmbeddingCacheModel.
+
+        """
+
+        instance = cls(db_client=db_client)
+        return instance
+
+
+    async def get_embeddings(self, embedding_model_id: str, document_type: str, text_hashes: list):
+        """
+        Get the cached embeddings of the given text hashes.
+        Returns a dict of text_hash -> embedding bytes for the hashes that were found.
+
+        """
+        if not text_hashes:
+            return {}
+
+        async with self.db_client() as session:
+            query = select(EmbeddingCacheEntry.text_hash, EmbeddingCacheEntry.embedding).where(
+                EmbeddingCacheEntry.embedding_model_id == embedding_model_id,
+                EmbeddingCacheEntry.document_type == document_type,
+                EmbeddingCacheEntry.text_hash.in_(text_hashes)
+            )
+            result = await session.execute(query)
+            records = result.all()
+
+        return {
+            record.text_hash: record.embedding
+            for record in records
+        }
+
+    async def insert_embeddings(self, embedding_model_id: str, document_type: str, embeddings: dict,
+                                batch_size: int = 1000):
+        """
+        Store embeddings given as a dict of text_hash -> embedding bytes.
+        Entries that already exist are left untouched.
+
+        """
+        if not embeddings:
+            return 0
+
+        values = [
+            {
+                "embedding_model_id": embedding_model_id,
+                "document_type": document_type,
+                "text_hash": text_hash,
+                "embedding": embedding,
+            }
+            for text_hash, embedding in embeddings.items()
+        ]
+
+        async with self.db_client() as session:
+            async with session.begin():
+                for i in range(0, len(values), batch_size):
+                    query = insert(EmbeddingCacheEntry).values(
+                        values[i:i + batch_size]
+                    ).on_conflict_do_nothing()
+                    await session.execute(query)
+
+        return len(values)
@@ -0,0 +1,198 @@
+from .BaseDataModel import BaseDataModel
+from .db_schemes import Job
+from .enums.JobEnums import JobStatusEnum
+from sqlalchemy.future import select
+from sqlalchemy import func, update, and_, or_, case
+from datetime import timedelta
+
+class JobModel(BaseDataModel):
+
+    def __init__(self, db_client: object):
+        super().__init__(db_client = db_client)
+        self.db_client = db_client
+
+
+    @classmethod
+    async def create_instance(cls, db_client: object):
+        """
+        Create an instance of JobModel.
+
+        """
+
+        instance = cls(db_client=db_client)
+        return instance
+
+
+    async def create_job(self, job: Job):
+        """
+        Enqueue a new job.
+
+        """
+        job.job_status = JobStatusEnum.QUEUED.value
+        job.job_cancel_requested = False
+        job.job_attempts = 0
+
+        async with self.db_client() as session:
+            async with session.begin():
+                session.add(job)
+            await session.refresh(job)
+
+        return job
+
+    async def get_job(self, job_id: int):
+        """
+        Get a job by its ID.
+
+        """
+        async with self.db_client() as session:
+            query = select(Job).where(Job.job_id == job_id)
+            result = await session.execute(query)
+            job = result.scalar_one_or_none()
+
+        return job
+
+    async def claim_next_job(self, worker_id: str, lease_seconds: float = 60,
+                             max_attempts: int = 3, job_types: list = None):
+        """
+        Claim the oldest queued job, or a running job whose worker let its lease expire,
+        and mark it as running under a lease of lease_seconds.
+        FOR UPDATE SKIP LOCKED lets many workers poll the same table without
+        blocking on, or double-claiming, each other's rows. Expired jobs that already
+        used max_attempts are finished instead of being retried.
+
+        """
+        is_lease_expired = and_(
+            Job.job_status == JobStatusEnum.RUNNING.value,
+            Job.job_locked_until < func.now()
+        )
+
+        async with self.db_client() as session:
+            async with session.begin():
+                expire_query = update(Job).where(
+                    is_lease_expired,
+                    or_(Job.job_attempts >= max_attempts, Job.job_cancel_requested.is_(True))
+                ).values(
+                    job_status=case(
+                        (Job.job_cancel_requested.is_(True), JobStatusEnum.CANCELLED.value),
+                        else_=JobStatusEnum.FAILED.value
+                    ),
+                    job_error=case(
+                        (Job.job_cancel_requested.is_(True), Job.job_error),
+                        else_=f"Job lease expired after {max_attempts} attempts."
+                    ),
+                    job_locked_until=None,
+                    finished_at=func.now()
+                )
+                await session.execute(expire_query)
+
+                query = select(Job).where(
+                    or_(Job.job_status == JobStatusEnum.QUEUED.value, is_lease_expired)
+                )
+                if job_types:
+                    query = query.where(Job.job_type.in_(job_types))
+
+                query = query.order_by(Job.job_id).limit(1).with_for_update(skip_locked=True)
+                result = await session.execute(query)
+                job = result.scalar_one_or_none()
+
+                if job is None:
+                    return None
+
+                job.job_status = JobStatusEnum.RUNNING.value
+                job.job_worker_id = worker_id
+                job.job_locked_until = func.now() + timedelta(seconds=lease_seconds)
+                job.job_attempts = Job.job_attempts + 1
+                job.started_at = func.now()
+
+            await session.refresh(job)
+
+        return job
+
+    async def renew_job_lease(self, job_id: int, worker_id: str, lease_seconds: float = 60):
+        """
+        Extend the lease of a running job held by worker_id.
+        Returns False when the worker no longer owns the job.
+
+        """
+        async with self.db_client() as session:
+            async with session.begin():
+                query = update(Job).where(
+                    Job.job_id == job_id,
+                    Job.job_worker_id == worker_id,
+                    Job.job_status == JobStatusEnum.RUNNING.value
+                ).values(
+                    job_locked_until=func.now() + timedelta(seconds=lease_seconds)
+                )
+                result = await session.execute(query)
+
+        return result.rowcount > 0
+
+    async def update_job_progress(self, job_id: int, progress: dict):
+        """
+        Store the progress of a running job.
+        Returns whether cancellation of the job has been requested.
+
+        """
+        async with self.db_client() as session:
+            async with session.begin():
+                query = update(Job).where(Job.job_id == job_id).values(
+                    job_progress=progress,
+                    updated_at=func.now()
+                ).returning(Job.job_cancel_requested)
+                result = await session.execute(query)
+                cancel_requested = result.scalar_one_or_none()
+
+        return bool(cancel_requested)
+
+    async def finish_job(self, job_id: int, job_status: str, job_result: dict = None,
+                         job_error: str = None, job_progress: dict = None, worker_id: str = None):
+        """
+        Mark a job as finished with the given status.
+        With worker_id the job is only finished while that worker still owns it, so a
+        worker whose lease expired can not overwrite the outcome of the one that
+        reclaimed the job. Returns whether the job was updated.
+
+        """
+        values = {
+            "job_status": job_status,
+            "job_result": job_result,
+            "job_error": job_error,
+            "job_locked_until": None,
+            "finished_at": func.now(),
+        }
+        if job_progress is not None:
+            values["job_progress"] = job_progress
+
+        async with self.db_client() as session:
+            async with session.begin():
+                query = update(Job).where(Job.job_id == job_id)
+                if worker_id is not None:
+                    query = query.where(Job.job_worker_id == worker_id)
+                result = await session.execute(query.values(**values))
+
+        return result.rowcount > 0
+
+    async def request_job_cancel(self, job_id: int):
+        """
+        Cancel a job. Queued jobs are cancelled right away, running jobs are flagged
+        and stop at their next progress update.
+
+        """
+        async with self.db_client() as session:
+            async with session.begin():
+                query = select(Job).where(Job.job_id == job_id).with_for_update()
+                result = await session.execute(query)
+                job = result.scalar_one_or_none()
+
+                if job is None:
+                    return None
+
+                if job.job_status == JobStatusEnum.QUEUED.value:
+                    job.job_status = JobStatusEnum.CANCELLED.value
+                    job.finished_at = func.now()
+                elif job.job_status == JobStatusEnum.RUNNING.value:
+                    job.job_cancel_requested = True
+
+            await session.refresh(job)
+
+        return job
@@ -0,0 +1,133 @@
+from .BaseDataModel import BaseDataModel
+from .db_schemes import SearchCacheVersion, SearchCacheEntry
+from sqlalchemy.future import select
+from sqlalchemy import delete, func
+from sqlalchemy.dialects.postgresql import insert
+from datetime import datetime, timedelta, timezone
+
+class SearchCacheModel(BaseDataModel):
+
+    def __init__(self, db_client: object):
+        super().__init__(db_client = db_client)
+        self.db_client = db_client
+
+
+    @classmethod
+    async def create_instance(cls, db_client: object):
+        """
+        Create an instance of SearchCacheModel.
+
+        """
+
+        instance = cls(db_client=db_client)
+        return instance
+
+
+    async def get_version(self, collection_name: str):
+        """
+        Get the current version of a collection, 0 if it was never written.
+
+        """
+        async with self.db_client() as session:
+            query = select(SearchCacheVersion.version).where(
+                SearchCacheVersion.collection_name == collection_name
+            )
+            result = await session.execute(query)
+            version = result.scalar_one_or_none()
+
+        return version if version is not None else 0
+
+    async def bump_version(self, collection_name: str):
+        """
+        Increment the version of a collection and drop its cached entries.
+        Returns the new version.
+
+        """
+        async with self.db_client() as session:
+            async with session.begin():
+                query = insert(SearchCacheVersion).values(
+                    collection_name=collection_name,
+                    version=1
+                )
+                query = query.on_conflict_do_update(
+                    index_elements=[SearchCacheVersion.collection_name],
+                    set_={
+                        "version": SearchCacheVersion.version + 1,
+                        "updated_at": func.now()
+                    }
+                ).returning(SearchCacheVersion.version)
+                result = await session.execute(query)
+                version = result.scalar_one()
+
+                await session.execute(delete(SearchCacheEntry).where(
+                    SearchCacheEntry.collection_name == collection_name
+                ))
+
+        return version
+
+    async def delete_expired_entries(self):
+        """
+        Delete the expired entries of every collection.
+        Returns the number of deleted entries.
+
+        """
+        async with self.db_client() as session:
+            async with session.begin():
+                result = await session.execute(delete(SearchCacheEntry).where(
+                    SearchCacheEntry.expires_at <= func.now()
+                ))
+
+        return result.rowcount
+
+    async def get_entries(self, cache_keys: list):
+        """
+        Get the cached results of many keys.
+        Returns a dict of cache_key -> results for the keys that were found and not expired.
+
+        """
+        if not cache_keys:
+            return {}
+
+        async with self.db_client() as session:
+            query = select(SearchCacheEntry.cache_key, SearchCacheEntry.results).where(
+                SearchCacheEntry.cache_key.in_(cache_keys),
+                SearchCacheEntry.expires_at > func.now()
+            )
+            result = await session.execute(query)
+            records = result.all()
+
+        return {
+            record.cache_key: record.results
+            for record in records
+        }
+
+    async def insert_entries(self, collection_name: str, entries: dict, ttl_seconds: float):
+        """
+        Store results given as a dict of cache_key -> results for ttl_seconds,
+        replacing existing entries.
+
+        """
+        if not entries:
+            return 0
+
+        expires_at = datetime.now(timezone.utc) + timedelta(seconds=ttl_seconds)
+        values = [
+            {
+                "cache_key": cache_key,
+                "collection_name": collection_name,
+                "results": results,
+                "expires_at": expires_at,
+            }
+            for cache_key, results in entries.items()
+        ]
+
+        async with self.db_client() as session:
+            async with session.begin():
+                query = insert(SearchCacheEntry).values(values)
+                query = query.on_conflict_do_update(
+                    index_elements=[SearchCacheEntry.cache_key],
+                    set_={"results": query.excluded.results, "expires_at": query.excluded.expires_at}
+                )
+                await session.execute(query)
+
+        return len(values)
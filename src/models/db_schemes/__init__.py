@@ -1 +1 @@
-from models.db_schemes.minirag.schemes import Project, DataChunk, RetrievedDocument, Asset
\ No newline at end of file
+from models.db_schemes.minirag.schemes import Project, DataChunk, RetrievedDocument, Asset, EmbeddingCacheEntry, Job, SearchCacheVersion, SearchCacheEntry
\ No newline at end of file
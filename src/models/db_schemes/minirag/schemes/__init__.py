@@ -1,4 +1,7 @@
 from .minirag_base import SQLAlchemyBase
 from .asset import Asset
 from .project import Project
-from .datachunk import DataChunk, RetrievedDocument 
\ No newline at end of file
+from .datachunk import DataChunk, RetrievedDocument
+from .embedding_cache import EmbeddingCacheEntry
+from .job import Job
+from .search_cache import SearchCacheVersion, SearchCacheEntry
\ No newline at end of file
@@ -1,8 +1,9 @@
 from .minirag_base import SQLAlchemyBase
 from pydantic import BaseModel
-from sqlalchemy import Column, Integer, String, DateTime, func, ForeignKey
-from sqlalchemy.dialects.postgresql import UUID, JSONB
-from sqlalchemy.orm import relationship
+from typing import Optional, Union
+from sqlalchemy import Column, Integer, BigInteger, String, DateTime, LargeBinary, func, ForeignKey, select, or_
+from sqlalchemy.dialects.postgresql import UUID, JSONB, ARRAY
+from sqlalchemy.orm import relationship, column_property
 from sqlalchemy import Index
 import uuid
 
@@ -19,6 +20,17 @@ class DataChunk(SQLAlchemyBase):
     
     chunk_project_id = Column(Integer, ForeignKey('projects.project_id'), nullable=False)
     chunk_asset_id = Column(Integer, ForeignKey('assets.asset_id'), nullable=False)
+
+    # dedup: normalized text hash, the canonical chunk this one duplicates (it is then
+    # neither embedded nor stored in the vector DB), the MinHash LSH band keys and the
+    # MinHash signature (uint32 values) of canonical chunks
+    chunk_hash = Column(String(64), nullable=True)
+    chunk_duplicate_of = Column(Integer, ForeignKey('chunks.chunk_id', ondelete='SET NULL'), nullable=True)
+    chunk_lsh_bands = Column(ARRAY(BigInteger), nullable=True)
+    chunk_minhash = Column(LargeBinary, nullable=True)
+
+    # when the chunk vector was last written to the project collection, NULL until then
+    chunk_indexed_at = Column(DateTime(timezone=True), nullable=True)
     
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     updated_at = Column(DateTime(timezone=True), onupdate=func.now(), nullable=True)
@@ -28,10 +40,32 @@ class DataChunk(SQLAlchemyBase):
     
     __table_args__ = (
         Index('ix_chunk_project_id', chunk_project_id),
-        Index('ix_chunk_asset_id', chunk_asset_id)
+        Index('ix_chunk_asset_id', chunk_asset_id),
+        Index('ix_chunk_project_id_chunk_id', chunk_project_id, chunk_id),
+        Index('ix_chunk_project_id_chunk_hash', chunk_project_id, chunk_hash),
+        Index('ix_chunk_duplicate_of', chunk_duplicate_of),
+        Index('ix_chunk_lsh_bands', chunk_lsh_bands, postgresql_using='gin'),
+        Index('ix_chunk_project_id_unindexed', chunk_project_id, chunk_id,
+              postgresql_where=(chunk_indexed_at.is_(None) & chunk_duplicate_of.is_(None))),
     )
+
+
+# the assets a chunk belongs to: its own and those of its duplicates, stored with its
+# vector so filtering the search by asset also finds the deduplicated chunks, deferred
+# so only the queries feeding the vector DB pay for the subquery
+_duplicate_chunks = DataChunk.__table__.alias('duplicate_chunks')
+DataChunk.chunk_asset_ids = column_property(
+    select(func.array_agg(_duplicate_chunks.c.chunk_asset_id.distinct()))
+    .where(or_(_duplicate_chunks.c.chunk_id == DataChunk.chunk_id,
+               _duplicate_chunks.c.chunk_duplicate_of == DataChunk.chunk_id))
+    .correlate_except(_duplicate_chunks)
+    .scalar_subquery(),
+    deferred=True
+)
     
 
 class RetrievedDocument(BaseModel):
     text: str
-    score: float
\ No newline at end of file
+    score: float
+    # vector DB id of the record, None when the backend does not return one
+    record_id: Optional[Union[int, str]] = None
\ No newline at end of file
@@ -0,0 +1,15 @@
+from .minirag_base import SQLAlchemyBase
+from sqlalchemy import Column, String, DateTime, LargeBinary, func
+
+
+class EmbeddingCacheEntry(SQLAlchemyBase):
+
+    __tablename__ = 'embedding_cache'
+
+    embedding_model_id = Column(String, primary_key=True)
+    document_type = Column(String, primary_key=True)
+    text_hash = Column(String(64), primary_key=True)
+
+    embedding = Column(LargeBinary, nullable=False)
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
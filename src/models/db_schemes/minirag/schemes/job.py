@@ -0,0 +1,40 @@
+from .minirag_base import SQLAlchemyBase
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, func, ForeignKey
+from sqlalchemy.dialects.postgresql import UUID, JSONB
+from sqlalchemy.orm import relationship
+from sqlalchemy import Index
+import uuid
+
+class Job(SQLAlchemyBase):
+
+    __tablename__ = 'jobs'
+
+    job_id = Column(Integer, primary_key=True, autoincrement=True)
+    job_uuid = Column(UUID(as_uuid=True), default=uuid.uuid4, unique=True, nullable=False)
+
+    job_type = Column(String, nullable=False)
+    job_status = Column(String, nullable=False)
+    job_payload = Column(JSONB, nullable=True)
+    job_progress = Column(JSONB, nullable=True)
+    job_result = Column(JSONB, nullable=True)
+    job_error = Column(String, nullable=True)
+    job_cancel_requested = Column(Boolean, nullable=False, default=False)
+    job_worker_id = Column(String, nullable=True)
+    # lease of the running worker, renewed by its heartbeat; an expired lease means the
+    # worker died and the job can be reclaimed by another one
+    job_locked_until = Column(DateTime(timezone=True), nullable=True)
+    job_attempts = Column(Integer, nullable=False, default=0)
+
+    job_project_id = Column(Integer, ForeignKey('projects.project_id'), nullable=False)
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    started_at = Column(DateTime(timezone=True), nullable=True)
+    finished_at = Column(DateTime(timezone=True), nullable=True)
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now(), nullable=True)
+
+    project = relationship("Project", back_populates="jobs")
+
+    __table_args__ = (
+        Index('ix_job_status_job_id', job_status, job_id),
+        Index('ix_job_project_id', job_project_id)
+    )
@@ -15,4 +15,5 @@ class Project(SQLAlchemyBase):
     updated_at = Column(DateTime(timezone=True), onupdate=func.now(), nullable=True)
     
     chunks = relationship("DataChunk", back_populates="project")
-    assets = relationship("Asset", back_populates="project")
\ No newline at end of file
+    assets = relationship("Asset", back_populates="project")
+    jobs = relationship("Job", back_populates="project")
\ No newline at end of file
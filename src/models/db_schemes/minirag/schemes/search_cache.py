@@ -0,0 +1,32 @@
+from .minirag_base import SQLAlchemyBase
+from sqlalchemy import Column, String, BigInteger, DateTime, func, Index
+from sqlalchemy.dialects.postgresql import JSONB
+
+
+class SearchCacheVersion(SQLAlchemyBase):
+
+    __tablename__ = 'search_cache_versions'
+
+    collection_name = Column(String, primary_key=True)
+    version = Column(BigInteger, nullable=False, default=0)
+
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
+
+
+class SearchCacheEntry(SQLAlchemyBase):
+
+    __tablename__ = 'search_cache_entries'
+
+    # sha256 of the collection, its version, the query and the search parameters
+    cache_key = Column(String(64), primary_key=True)
+    collection_name = Column(String, nullable=False)
+
+    results = Column(JSONB, nullable=False)
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    expires_at = Column(DateTime(timezone=True), nullable=False)
+
+    __table_args__ = (
+        Index('ix_search_cache_entries_collection_name', collection_name),
+        Index('ix_search_cache_entries_expires_at', expires_at),
+    )
@@ -0,0 +1,14 @@
+from enum import Enum
+
+class JobTypeEnum(Enum):
+
+    PROCESS = "process"
+    INDEX = "index"
+
+class JobStatusEnum(Enum):
+
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
@@ -2,4 +2,10 @@ from enum import Enum
 
 class ProcessingEnum(Enum):
     TXT = ".txt"
-    PDF = ".pdf"
\ No newline at end of file
+    PDF = ".pdf"
+
+
+class ChunkSizeUnitEnum(Enum):
+    CHARS = "chars"
+    SENTENCES = "sentences"
+    TOKENS = "tokens"
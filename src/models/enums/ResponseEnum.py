@@ -16,8 +16,17 @@ class ResponseSignal(Enum):
     INSERT_INTO_VECTORDB_ERROR = "Error inserting data into the database."
     INSERT_INTO_VECTORDB_SUCCESS = "Data inserted into the vector database successfully."
     VECTORDB_COLLECTION_RETRIEVED = "Vector database collection retrieved successfully."
+    VECTORDB_INDEX_PROGRESS_RETRIEVED = "Vector index build progress retrieved successfully."
     VECTORDB_SEARCH_SUCCESS = "Vector database search completed successfully."
     VECTORDB_SEARCH_ERROR = "Vector database search failed."
     RAG_ANSWER_ERROR = "Error answering the RAG question."
     RAG_ANSWER_SUCCESS = "RAG question answered successfully."
+    JOB_QUEUED = "Job queued successfully."
+    JOB_RETRIEVED = "Job retrieved successfully."
+    JOB_NOT_FOUND_ERROR = "Job not found."
+    JOB_CANCEL_REQUESTED = "Job cancellation requested."
+    PARSED_TEXT_CACHE_RETRIEVED = "Parsed text cache retrieved successfully."
+    PARSED_TEXT_CACHE_EVICTED = "Parsed text cache entries evicted successfully."
+    VECTORDB_SEARCH_FILTER_ERROR = "Invalid search filter."
+    VECTORDB_SEARCH_BATCH_SIZE_ERROR = "Invalid number of search queries."
    
\ No newline at end of file
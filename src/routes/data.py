@@ -2,17 +2,17 @@ from fastapi import FastAPI, APIRouter, Depends, File, UploadFile, status, Reque
 from fastapi.responses import JSONResponse
 import os
 from helpers.config import get_settings, Settings
-from controllers import DataController, ProjectController, ProcessController
+from controllers import DataController, ProjectController, JobController, ParsedTextCacheController
 import aiofiles
+import hashlib
 from models import ResponseSignal
 import logging
 from .schemes.data import ProcessRequest
 from models.ProjectModel import ProjectModel
-from models.ChunkModel import ChunkModel
 from models.AssetModel import AssetModel
-from models.db_schemes import DataChunk, Asset
+from models.db_schemes import Asset
 from models.enums.AssetTypeEnum import AssetTypeEnum
-from controllers import NLPController
+from models.enums.JobEnums import JobTypeEnum
 
 
 
@@ -56,9 +56,12 @@ async def upload_data(request: Request, project_id: int, file: UploadFile = File
         project_id = project_id
     )
     
+    # hash the content while writing it, processing skips assets it already chunked
+    content_hash = hashlib.sha256()
     try:
         async with aiofiles.open(file_path, 'wb') as f:
             while chunk := await file.read(app_settings.FILE_DEFAULT_CHUNK_SIZE):
+                content_hash.update(chunk)
                 await f.write(chunk)
     except Exception as e:
         
@@ -80,6 +83,7 @@ async def upload_data(request: Request, project_id: int, file: UploadFile = File
         asset_type = AssetTypeEnum.FILE.value,
         asset_name = file_id,
         asset_size = os.path.getsize(file_path),
+        asset_config = {"content_hash": content_hash.hexdigest()},
         )    
             
     asset_record = await asset_model.create_asset(
@@ -94,14 +98,11 @@ async def upload_data(request: Request, project_id: int, file: UploadFile = File
         )
     
 @data_router.post("/process/{project_id}")
-async def process_endpoint(request: Request, project_id: int, process_request: ProcessRequest, app_settings: Settings = Depends(get_settings)):
+async def process_endpoint(request: Request, project_id: int, process_request: ProcessRequest):
     """
-    Process the uploaded file in the specified project.
+    Queue a job that processes the uploaded files of the specified project.
+    Poll /api/v1/jobs/{job_id} for its progress and result.
     """
-    chunk_size = process_request.chunk_size
-    overlap_size = process_request.overlap_size
-    do_reset = process_request.do_reset
-    
     project_model = await ProjectModel.create_instance(
         db_client=request.app.db_client
     )
@@ -110,19 +111,10 @@ async def process_endpoint(request: Request, project_id: int, process_request: P
         project_id=project_id
     )
     
-    nlp_controller = NLPController(
-        vectordb_client=request.app.vectordb_client,
-        generation_client=request.app.generation_client,
-        embedding_client=request.app.embedding_client,
-        template_parser= request.app.template_parser,
-    )
-    
     asset_model = await AssetModel.create_instance(
         db_client=request.app.db_client
     )
     
-    project_files_ids = {}
-    
     if process_request.file_id:
         asset_record = await asset_model.get_asset_record(
             asset_project_id=project.project_id,
@@ -136,10 +128,6 @@ async def process_endpoint(request: Request, project_id: int, process_request: P
                     "signal": ResponseSignal.FILE_ID_ERROR.value
                 }
             )
-            
-        project_files_ids = {
-            asset_record.asset_id: asset_record.asset_name
-        }
    
     else:
         
@@ -148,82 +136,54 @@ async def process_endpoint(request: Request, project_id: int, process_request: P
             asset_type=AssetTypeEnum.FILE.value
         )
         
-        project_files_ids = {
-            rec.asset_id : rec.asset_name
-            for rec in project_files
-        }
-
-    if len(project_files_ids) == 0:
-        return JSONResponse(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            content={
-                "signal": ResponseSignal.NO_FILES_ERROR.value
-            }
-        )
-        
-    process_controller = ProcessController(project_id=project_id)
-    
-    no_records = 0
-    no_files = 0
-    
-    chunk_model = await ChunkModel.create_instance(
-        db_client=request.app.db_client
-    )
-    
-    if do_reset == 1:
-        # delete asociated vector collection
-        collection_name = nlp_controller.create_collection_name(project_id=project.project_id)
-        _ = await nlp_controller.vectordb_client.delete_collection(
-            collection_name=collection_name
-        )
-        
-        # delete chunks in the database
-        _ = await chunk_model.delete_chunks_by_project_id(
-            project_id=project.project_id
-        )
-    for asset_id, file_id in project_files_ids.items():
-        
-        file_content = process_controller.get_file_content(file_id=file_id)
-        
-        if file_content is None:
-            logger.error(f"File {file_id} not found or unsupported format.")
-            continue
-        
-        file_chunks = process_controller.process_file_content(
-            file_id=file_id,
-            file_content=file_content,
-            chunk_size=chunk_size,
-            overlap_size=overlap_size
-        )
-        
-        if file_chunks is None or len(file_chunks) == 0:
+        if len(project_files) == 0:
             return JSONResponse(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 content={
-                    "signal": ResponseSignal.PROCESSING_FAILED.value
+                    "signal": ResponseSignal.NO_FILES_ERROR.value
                 }
             )
     
-        file_chunks_records = [
-            DataChunk(
-                chunk_text=chunk.page_content,
-                chunk_metadata=chunk.metadata,
-                chunk_order=i+1,
-                chunk_project_id=project.project_id,
-                chunk_asset_id=asset_id
-            )
-            for i, chunk in enumerate(file_chunks)
-        ]
-            
-        no_records += await chunk_model.insert_many_chunks(
-            chunks=file_chunks_records,
-        )
-        no_files += 1
+    job_controller = JobController(resources=request.app)
+    job = await job_controller.enqueue_job(
+        job_type=JobTypeEnum.PROCESS.value,
+        project_id=project.project_id,
+        payload=process_request.model_dump()
+    )
+    
+    return JSONResponse(
+        status_code=status.HTTP_202_ACCEPTED,
+        content={
+            "signal": ResponseSignal.JOB_QUEUED.value,
+            "job_id": job.job_id
+        }
+    )
+
+@data_router.get("/cache/{project_id}")
+async def get_parsed_text_cache(request: Request, project_id: int):
+    """
+    Get the entries and total size of the parsed-text cache of the project.
+    """
+    cache_controller = ParsedTextCacheController(project_id=project_id)
+    
+    return JSONResponse(
+        content={
+            "signal": ResponseSignal.PARSED_TEXT_CACHE_RETRIEVED.value,
+            "cache_info": cache_controller.get_cache_info()
+        }
+    )
+
+@data_router.delete("/cache/{project_id}")
+async def evict_parsed_text_cache(request: Request, project_id: int, content_hash: str = None):
+    """
+    Evict one entry (by content_hash) or the whole parsed-text cache of the project.
+    """
+    cache_controller = ParsedTextCacheController(project_id=project_id)
+    evicted_count = cache_controller.evict(content_hash=content_hash)
     
     return JSONResponse(
         content={
-            "signal": ResponseSignal.PROCESSING_SUCCESS.value,
-            "inserted_chunks": no_records,
-            "processed_files": no_files
+            "signal": ResponseSignal.PARSED_TEXT_CACHE_EVICTED.value,
+            "evicted_count": evicted_count
         }
-    )
\ No newline at end of file
+    )
@@ -0,0 +1,69 @@
+from fastapi import FastAPI, APIRouter, status, Request
+from fastapi.responses import JSONResponse
+from models.JobModel import JobModel
+from controllers import JobController
+from models import ResponseSignal
+import logging
+
+logger = logging.getLogger('uvicorn.error')
+
+jobs_router = APIRouter(
+    prefix="/api/v1/jobs",
+    tags=["api_v1", "jobs"]
+)
+
+@jobs_router.get("/{job_id}")
+async def get_job(request: Request, job_id: int):
+    """
+    Endpoint to get the status, progress and throughput of a job.
+    """
+    job_model = await JobModel.create_instance(
+        db_client=request.app.db_client
+    )
+    
+    job = await job_model.get_job(job_id=job_id)
+    
+    if job is None:
+        return JSONResponse(
+            status_code=status.HTTP_404_NOT_FOUND,
+            content={
+                "signal": ResponseSignal.JOB_NOT_FOUND_ERROR.value
+            }
+        )
+    
+    job_controller = JobController(resources=request.app)
+    
+    return JSONResponse(
+        content={
+            "signal": ResponseSignal.JOB_RETRIEVED.value,
+            "job": job_controller.get_job_info(job=job)
+        }
+    )
+
+@jobs_router.post("/{job_id}/cancel")
+async def cancel_job(request: Request, job_id: int):
+    """
+    Endpoint to cancel a queued or running job.
+    """
+    job_model = await JobModel.create_instance(
+        db_client=request.app.db_client
+    )
+    
+    job = await job_model.request_job_cancel(job_id=job_id)
+    
+    if job is None:
+        return JSONResponse(
+            status_code=status.HTTP_404_NOT_FOUND,
+            content={
+                "signal": ResponseSignal.JOB_NOT_FOUND_ERROR.value
+            }
+        )
+    
+    job_controller = JobController(resources=request.app)
+    
+    return JSONResponse(
+        content={
+            "signal": ResponseSignal.JOB_CANCEL_REQUESTED.value,
+            "job": job_controller.get_job_info(job=job)
+        }
+    )
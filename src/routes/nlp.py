@@ -1,12 +1,13 @@
-from fastapi import FastAPI, APIRouter, status, Request
+from fastapi import FastAPI, APIRouter, Depends, status, Request
 from fastapi.responses import JSONResponse
-from routes.schemes.nlp import PushRequest, SearchRequest
+from routes.schemes.nlp import PushRequest, SearchRequest, BatchSearchRequest
+from helpers.config import get_settings, Settings
 from models.ProjectModel import ProjectModel
-from models.ChunkModel import ChunkModel
-from controllers import NLPController
+from controllers import NLPController, JobController
 from models import ResponseSignal
 import logging
-from tqdm.auto import tqdm
+from models.enums.JobEnums import JobTypeEnum
+from stores.vectordb.MetadataFilter import MetadataFilter
 
 logger = logging.getLogger('uvicorn.error')
 
@@ -18,16 +19,13 @@ nlp_router = APIRouter(
 @nlp_router.post("/index/push/{project_id}")
 async def index_project(request: Request, project_id: int, push_request: PushRequest):
     """
-    Endpoint to push a project for indexing.
+    Queue a job that pushes a project for indexing.
+    Poll /api/v1/jobs/{job_id} for its progress and throughput.
     """
     project_model = await ProjectModel.create_instance(
         db_client=request.app.db_client
     )   
     
-    chunk_model = await ChunkModel.create_instance(
-        db_client=request.app.db_client
-    )   
-    
     project = await project_model.get_project_or_create_one(
         project_id=project_id
     ) 
@@ -39,68 +37,19 @@ async def index_project(request: Request, project_id: int, push_request: PushReq
                 "signal": ResponseSignal.PROJECT_NOT_FOUND_ERROR.value
             }
         )
-        
-    nlp_controller = NLPController(
-        vectordb_client=request.app.vectordb_client,
-        generation_client=request.app.generation_client,
-        embedding_client=request.app.embedding_client,
-        template_parser=request.app.template_parser,
-    )        
-    
-    has_records = True
-    page_no = 1
-    inserted_items_count = 0
-    idx = 0
-    
-    collection_name = nlp_controller.create_collection_name(project_id=project.project_id)
-    
-    _ = await nlp_controller.vectordb_client.create_collection(
-        collection_name=collection_name,
-        embedding_size=request.app.embedding_client.embedding_size,
-        do_reset=push_request.do_reset
-    )
     
-    # setup batching
-    total_chunks_count = await chunk_model.get_total_chunks_count(
-        project_id=project.project_id
+    job_controller = JobController(resources=request.app)
+    job = await job_controller.enqueue_job(
+        job_type=JobTypeEnum.INDEX.value,
+        project_id=project.project_id,
+        payload=push_request.model_dump()
     )
-    pbar = tqdm(total=total_chunks_count, desc="Vector Indexing", position=0)
-    
-    
-    while has_records:
-        page_chunks = await chunk_model.get_project_chunks(project_id=project.project_id, page_no=page_no)
-        if len(page_chunks):
-            page_no += 1
-            
-        if not page_chunks or len(page_chunks) == 0:
-            has_records = False
-            break
-
-        chunks_ids = [c.chunk_id for c in page_chunks]
-        idx += len(page_chunks)
-    
-        is_inserted = await nlp_controller.index_into_vectordb(
-            project=project,
-            chunks=page_chunks,
-            chunks_ids=chunks_ids
-        )
-        
-        if not is_inserted:
-            return JSONResponse(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                content={
-                    "signal": ResponseSignal.INSERT_INTO_VECTORDB_ERROR.value
-                }
-            )
-        inserted_items_count += len(page_chunks)    
-        
-        pbar.update(len(page_chunks))
-        inserted_items_count += len(page_chunks)
         
     return JSONResponse(
+        status_code=status.HTTP_202_ACCEPTED,
         content={
-            "signal": ResponseSignal.INSERT_INTO_VECTORDB_SUCCESS.value,
-            "inserted_items_count": inserted_items_count
+            "signal": ResponseSignal.JOB_QUEUED.value,
+            "job_id": job.job_id
         }
     )   
     
@@ -130,6 +79,7 @@ async def get_project_index_project(request: Request, project_id: int):
         generation_client=request.app.generation_client,
         embedding_client=request.app.embedding_client,
         template_parser=request.app.template_parser,
+        tokenizer_service=request.app.tokenizer_service,
     )        
     
     collection_info = await nlp_controller.get_vectordb_collection_info(
@@ -144,11 +94,63 @@ async def get_project_index_project(request: Request, project_id: int):
         }
     )
     
+@nlp_router.get("/index/progress/{project_id}")
+async def get_project_index_progress(request: Request, project_id: int):
+    """
+    Endpoint to get the progress of a running vector index build.
+    """
+    project_model = await ProjectModel.create_instance(
+        db_client=request.app.db_client
+    )   
+    
+    project = await project_model.get_project_or_create_one(
+        project_id=project_id
+    ) 
+    
+    if not project:
+        return JSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content={
+                "signal": ResponseSignal.PROJECT_NOT_FOUND_ERROR.value
+            }
+        )
+        
+    nlp_controller = NLPController(
+        vectordb_client=request.app.vectordb_client,
+        generation_client=request.app.generation_client,
+        embedding_client=request.app.embedding_client,
+        template_parser=request.app.template_parser,
+        tokenizer_service=request.app.tokenizer_service,
+    )        
+    
+    collection_name = nlp_controller.create_collection_name(project_id=project.project_id)
+    index_progress = await nlp_controller.vectordb_client.get_index_build_progress(
+        collection_name=collection_name
+    )
+    
+    return JSONResponse(
+        content={
+            "signal": ResponseSignal.VECTORDB_INDEX_PROGRESS_RETRIEVED.value,
+            "index_progress": index_progress
+        }
+    )
+    
 @nlp_router.post("/index/search/{project_id}")
 async def search_index(request: Request, project_id: int, search_request: SearchRequest):
     """
     Endpoint to search a project index.
     """
+    try:
+        metadata_filter = MetadataFilter.from_dict(search_request.filter)
+    except ValueError as e:
+        return JSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content={
+                "signal": ResponseSignal.VECTORDB_SEARCH_FILTER_ERROR.value,
+                "error": str(e)
+            }
+        )
+
     project_model = await ProjectModel.create_instance(
         db_client=request.app.db_client
     )   
@@ -170,12 +172,17 @@ async def search_index(request: Request, project_id: int, search_request: Search
         generation_client=request.app.generation_client,
         embedding_client=request.app.embedding_client,
         template_parser=request.app.template_parser,
+        tokenizer_service=request.app.tokenizer_service,
     )        
     
     results = await nlp_controller.search_vectordb_collection(
         project=project,
         text=search_request.text,
-        limit=search_request.limit
+        limit=search_request.limit,
+        ef_search=search_request.ef_search,
+        iterative_scan=search_request.iterative_scan,
+        metadata_filter=metadata_filter,
+        search_mode=search_request.search_mode
     )
     
     if not results:
@@ -193,11 +200,104 @@ async def search_index(request: Request, project_id: int, search_request: Search
         }
     )
 
+@nlp_router.post("/index/search/batch/{project_id}")
+async def search_index_batch(request: Request, project_id: int, search_request: BatchSearchRequest,
+                             app_settings: Settings = Depends(get_settings)):
+    """
+    Endpoint to search a project index for many queries in one request.
+    The queries are embedded together and searched in one vector DB round trip.
+    """
+    if not search_request.texts or len(search_request.texts) > app_settings.VECTOR_DB_SEARCH_BATCH_MAX_QUERIES:
+        return JSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content={
+                "signal": ResponseSignal.VECTORDB_SEARCH_BATCH_SIZE_ERROR.value,
+                "max_queries": app_settings.VECTOR_DB_SEARCH_BATCH_MAX_QUERIES
+            }
+        )
+
+    try:
+        metadata_filter = MetadataFilter.from_dict(search_request.filter)
+    except ValueError as e:
+        return JSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content={
+                "signal": ResponseSignal.VECTORDB_SEARCH_FILTER_ERROR.value,
+                "error": str(e)
+            }
+        )
+
+    project_model = await ProjectModel.create_instance(
+        db_client=request.app.db_client
+    )   
+    
+    project = await project_model.get_project_or_create_one(
+        project_id=project_id
+    ) 
+    
+    if not project:
+        return JSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content={
+                "signal": ResponseSignal.PROJECT_NOT_FOUND_ERROR.value
+            }
+        )
+        
+    nlp_controller = NLPController(
+        vectordb_client=request.app.vectordb_client,
+        generation_client=request.app.generation_client,
+        embedding_client=request.app.embedding_client,
+        template_parser=request.app.template_parser,
+        tokenizer_service=request.app.tokenizer_service,
+    )        
+    
+    results = await nlp_controller.search_vectordb_collection_batch(
+        project=project,
+        texts=search_request.texts,
+        limit=search_request.limit,
+        ef_search=search_request.ef_search,
+        iterative_scan=search_request.iterative_scan,
+        metadata_filter=metadata_filter,
+        search_mode=search_request.search_mode
+    )
+    
+    if not results:
+        return JSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content={
+                "signal": ResponseSignal.VECTORDB_SEARCH_ERROR.value
+            }
+        )
+    
+    return JSONResponse(
+        content={
+            "signal": ResponseSignal.VECTORDB_SEARCH_SUCCESS.value,
+            "results": [
+                {
+                    "text": text,
+                    "results": [res.dict() for res in documents]
+                }
+                for text, documents in zip(search_request.texts, results)
+            ]
+        }
+    )
+
 @nlp_router.post("/index/answer/{project_id}")
 async def answer_rag(request: Request, project_id: int, search_request: SearchRequest):
     """ 
     Endpoint to answer a question using RAG.
     """
+    try:
+        metadata_filter = MetadataFilter.from_dict(search_request.filter)
+    except ValueError as e:
+        return JSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content={
+                "signal": ResponseSignal.VECTORDB_SEARCH_FILTER_ERROR.value,
+                "error": str(e)
+            }
+        )
+
     project_model = await ProjectModel.create_instance(
         db_client=request.app.db_client
     )   
@@ -219,12 +319,17 @@ async def answer_rag(request: Request, project_id: int, search_request: SearchRe
         generation_client=request.app.generation_client,
         embedding_client=request.app.embedding_client,
         template_parser=request.app.template_parser,
+        tokenizer_service=request.app.tokenizer_service,
     ) 
     
     answer, full_prompt, chat_history = await nlp_controller.answer_rag_question(
         project=project,
         query=search_request.text,
-        limit=search_request.limit
+        limit=search_request.limit,
+        ef_search=search_request.ef_search,
+        iterative_scan=search_request.iterative_scan,
+        metadata_filter=metadata_filter,
+        search_mode=search_request.search_mode
     )
     
     if not answer:
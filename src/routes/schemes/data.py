@@ -1,9 +1,14 @@
 from pydantic import BaseModel
-from typing import Optional
+from typing import Optional, Literal
 
 class ProcessRequest(BaseModel):
     file_id: str = None
     chunk_size: Optional[int] = 100
     overlap_size: Optional[int] = 20
+    chunk_size_unit: Optional[Literal["chars", "sentences", "tokens"]] = None
     do_reset: Optional[int] = 0
+    use_copy: Optional[bool] = None
+    page_batch_size: Optional[int] = None
+    dedup: Optional[bool] = None
+    near_dedup: Optional[bool] = None
     
\ No newline at end of file
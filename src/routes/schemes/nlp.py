@@ -1,10 +1,27 @@
 from pydantic import BaseModel
-from typing import Optional
+from typing import Optional, Literal, Dict, Any, List
 
 class PushRequest(BaseModel):
     do_reset: Optional[int] = 0
+    page_size: Optional[int] = None
+    embedding_concurrency: Optional[int] = None
+    bulk_load: Optional[bool] = None
+    use_copy: Optional[bool] = None
     
     
 class SearchRequest(BaseModel):
     text: str
-    limit: Optional[int] = 5
\ No newline at end of file
+    limit: Optional[int] = 5
+    ef_search: Optional[int] = None
+    iterative_scan: Optional[Literal["off", "strict_order", "relaxed_order"]] = None
+    filter: Optional[Dict[str, Any]] = None
+    search_mode: Optional[Literal["vector", "lexical", "hybrid"]] = None
+
+
+class BatchSearchRequest(BaseModel):
+    texts: List[str]
+    limit: Optional[int] = 5
+    ef_search: Optional[int] = None
+    iterative_scan: Optional[Literal["off", "strict_order", "relaxed_order"]] = None
+    filter: Optional[Dict[str, Any]] = None
+    search_mode: Optional[Literal["vector", "lexical", "hybrid"]] = None
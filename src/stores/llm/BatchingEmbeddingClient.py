@@ -0,0 +1,139 @@
+from .LLMInterface import LLMInterface
+from .LLMEnums import DocumentTypeEnum
+from utils.metrics import (EMBEDDING_BATCHER_QUEUE_DEPTH, EMBEDDING_BATCHER_IN_FLIGHT,
+                           EMBEDDING_BATCHER_BATCH_SIZE)
+from typing import List, Union
+import numpy as np
+import asyncio
+import logging
+
+
+class BatchingEmbeddingClient(LLMInterface):
+    """
+    Micro-batches concurrent embedding requests in front of an embedding client.
+    Texts of small async requests are queued per document type and sent as one
+    embed_text_async call once max_batch_size texts are waiting or the oldest one has
+    waited max_wait_ms. The vectors are then fanned back to the waiting coroutines.
+    Requests of max_batch_size texts or more are already batched and go straight through.
+    """
+
+    def __init__(self, client: LLMInterface, max_batch_size: int = 32, max_wait_ms: float = 5.0):
+        self.client = client
+        self.max_batch_size = max_batch_size
+        self.max_wait_seconds = max_wait_ms / 1000
+
+        # document_type -> [(text, future)], and the timer flushing it
+        self.pending = {}
+        self.flush_handles = {}
+        self.batch_tasks = set()
+
+        self.logger = logging.getLogger(__name__)
+
+    def __getattr__(self, name: str):
+        # expose the wrapped client attributes (embedding_size, embedding_model_id, enums, ...)
+        if name == "client":
+            raise AttributeError(name)
+        return getattr(self.client, name)
+
+    def set_generation_model(self, model_id: str):
+        self.client.set_generation_model(model_id=model_id)
+
+    def set_embedding_model(self, model_id: str, embedding_size: int):
+        self.client.set_embedding_model(model_id=model_id, embedding_size=embedding_size)
+
+    def generate_text(self, prompt: str, chat_history: list, max_output_token: int = None,
+                      temperature: float = None):
+        return self.client.generate_text(prompt, chat_history, max_output_token, temperature)
+
+    async def generate_text_async(self, prompt: str, chat_history: list, max_output_token: int = None,
+                                  temperature: float = None):
+        return await self.client.generate_text_async(prompt, chat_history, max_output_token, temperature)
+
+    def construct_prompt(self, prompt: str, role: str):
+        return self.client.construct_prompt(prompt=prompt, role=role)
+
+    def embed_text(self, text: Union[str, List[str]], document_type: str = None):
+        return self.client.embed_text(text=text, document_type=document_type)
+
+    async def embed_text_async(self, text: Union[str, List[str]], document_type: str = None):
+
+        texts = [text] if isinstance(text, str) else list(text)
+        document_type = document_type if document_type else DocumentTypeEnum.DOCUMENT.value
+
+        if len(texts) == 0 or len(texts) >= self.max_batch_size:
+            return await self.client.embed_text_async(text=texts, document_type=document_type)
+
+        loop = asyncio.get_running_loop()
+        futures = [loop.create_future() for _ in texts]
+
+        pending = self.pending.setdefault(document_type, [])
+        pending.extend(zip(texts, futures))
+        EMBEDDING_BATCHER_QUEUE_DEPTH.inc(len(texts))
+
+        if len(pending) >= self.max_batch_size:
+            self.flush(document_type=document_type)
+        elif document_type not in self.flush_handles:
+            self.flush_handles[document_type] = loop.call_later(
+                self.max_wait_seconds, self.flush, document_type
+            )
+
+        vectors = await asyncio.gather(*futures)
+        if any(vector is None for vector in vectors):
+            return None
+
+        return np.stack(vectors)
+
+    def get_queue_depth(self):
+        return sum(len(items) for items in self.pending.values())
+
+    def flush(self, document_type: str):
+        """
+        Send every queued text of the document type, in batches of max_batch_size.
+        """
+        handle = self.flush_handles.pop(document_type, None)
+        if handle is not None:
+            handle.cancel()
+
+        items = self.pending.pop(document_type, [])
+        for i in range(0, len(items), self.max_batch_size):
+            task = asyncio.create_task(self.send_batch(
+                document_type=document_type,
+                items=items[i:i + self.max_batch_size]
+            ))
+            self.batch_tasks.add(task)
+            task.add_done_callback(self.batch_tasks.discard)
+
+    async def send_batch(self, document_type: str, items: list):
+        EMBEDDING_BATCHER_QUEUE_DEPTH.dec(len(items))
+        EMBEDDING_BATCHER_IN_FLIGHT.inc()
+
+        # identical queries of concurrent requests are embedded once
+        unique_texts = list(dict.fromkeys(text for text, _ in items))
+        EMBEDDING_BATCHER_BATCH_SIZE.observe(len(unique_texts))
+
+        try:
+            vectors = await self.client.embed_text_async(text=unique_texts, document_type=document_type)
+        except Exception as e:
+            self.logger.error(f"Batched embedding of {len(unique_texts)} texts failed: {e}")
+            for _, future in items:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        finally:
+            EMBEDDING_BATCHER_IN_FLIGHT.dec()
+
+        text_vectors = {}
+        if vectors is not None and len(vectors) == len(unique_texts):
+            text_vectors = dict(zip(unique_texts, vectors))
+
+        # waiters that were cancelled meanwhile are skipped
+        for text, future in items:
+            if not future.done():
+                future.set_result(text_vectors.get(text))
+
+    async def close(self):
+        for document_type in list(self.flush_handles):
+            self.flush(document_type=document_type)
+        if self.batch_tasks:
+            await asyncio.gather(*self.batch_tasks, return_exceptions=True)
+        await self.client.close()
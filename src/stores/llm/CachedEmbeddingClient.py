@@ -0,0 +1,175 @@
+from .LLMInterface import LLMInterface
+from .LLMEnums import DocumentTypeEnum
+from models.EmbeddingCacheModel import EmbeddingCacheModel
+from utils.metrics import EMBEDDING_CACHE_HITS, EMBEDDING_CACHE_MISSES
+from collections import OrderedDict
+from typing import List, Union
+import numpy as np
+import hashlib
+import logging
+
+
+class CachedEmbeddingClient(LLMInterface):
+    """
+    Content-addressed embedding cache wrapped around an embedding client.
+    Embeddings are keyed by (embedding model id, document type, sha256 of the text) and are
+    looked up in an in-process LRU first, then in the persistent embedding_cache table.
+    Only the texts missing from both tiers are sent to the wrapped client.
+    """
+
+    def __init__(self, client: LLMInterface, db_client: object = None, lru_size: int = 10000):
+        self.client = client
+        self.lru_size = lru_size
+        self.lru = OrderedDict()
+
+        self.embedding_cache_model = EmbeddingCacheModel(db_client=db_client) if db_client else None
+        self.logger = logging.getLogger(__name__)
+
+    def __getattr__(self, name: str):
+        # expose the wrapped client attributes (embedding_size, embedding_model_id, enums, ...)
+        if name == "client":
+            raise AttributeError(name)
+        return getattr(self.client, name)
+
+    def hash_text(self, text: str):
+        return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+    def lru_get(self, key: tuple):
+        vector = self.lru.get(key)
+        if vector is not None:
+            self.lru.move_to_end(key)
+        return vector
+
+    def lru_put(self, key: tuple, vector: np.ndarray):
+        self.lru[key] = vector
+        self.lru.move_to_end(key)
+        while len(self.lru) > self.lru_size:
+            self.lru.popitem(last=False)
+
+    def set_generation_model(self, model_id: str):
+        self.client.set_generation_model(model_id=model_id)
+
+    def set_embedding_model(self, model_id: str, embedding_size: int):
+        self.client.set_embedding_model(model_id=model_id, embedding_size=embedding_size)
+
+    def generate_text(self, prompt: str, chat_history: list, max_output_token: int = None,
+                      temperature: float = None):
+        return self.client.generate_text(prompt, chat_history, max_output_token, temperature)
+
+    async def generate_text_async(self, prompt: str, chat_history: list, max_output_token: int = None,
+                                  temperature: float = None):
+        return await self.client.generate_text_async(prompt, chat_history, max_output_token, temperature)
+
+    def construct_prompt(self, prompt: str, role: str):
+        return self.client.construct_prompt(prompt=prompt, role=role)
+
+    async def close(self):
+        await self.client.close()
+
+    def lookup_memory(self, texts: List[str], document_type: str):
+        """
+        Resolve the texts from the in-process tier.
+        Returns (hashes, cached vectors, text of every unique hash).
+        """
+        model_id = self.client.embedding_model_id
+        hashes = [self.hash_text(t) for t in texts]
+        hash_texts = dict(zip(hashes, texts))
+
+        vectors = {}
+        for text_hash in hash_texts:
+            vector = self.lru_get((model_id, document_type, text_hash))
+            if vector is not None:
+                vectors[text_hash] = vector
+
+        EMBEDDING_CACHE_HITS.labels(tier="memory").inc(len(vectors))
+        return hashes, vectors, hash_texts
+
+    def store_memory(self, vectors: dict, document_type: str):
+        model_id = self.client.embedding_model_id
+        for text_hash, vector in vectors.items():
+            self.lru_put((model_id, document_type, text_hash), vector)
+
+    def embed_text(self, text: Union[str, List[str]], document_type: str = None):
+
+        texts = [text] if isinstance(text, str) else list(text)
+        document_type = document_type if document_type else DocumentTypeEnum.DOCUMENT.value
+
+        hashes, vectors, hash_texts = self.lookup_memory(texts=texts, document_type=document_type)
+
+        missing_hashes = [h for h in hash_texts if h not in vectors]
+        if len(missing_hashes):
+            EMBEDDING_CACHE_MISSES.inc(len(missing_hashes))
+            new_vectors = self.client.embed_text(
+                text=[hash_texts[h] for h in missing_hashes],
+                document_type=document_type
+            )
+            if new_vectors is None or len(new_vectors) != len(missing_hashes):
+                return None
+
+            new_vectors = {
+                h: np.asarray(v, dtype=np.float32)
+                for h, v in zip(missing_hashes, new_vectors)
+            }
+            self.store_memory(vectors=new_vectors, document_type=document_type)
+            vectors.update(new_vectors)
+
+        return np.stack([vectors[h] for h in hashes])
+
+    async def embed_text_async(self, text: Union[str, List[str]], document_type: str = None):
+
+        texts = [text] if isinstance(text, str) else list(text)
+        document_type = document_type if document_type else DocumentTypeEnum.DOCUMENT.value
+        model_id = self.client.embedding_model_id
+
+        hashes, vectors, hash_texts = self.lookup_memory(texts=texts, document_type=document_type)
+
+        # persistent tier
+        missing_hashes = [h for h in hash_texts if h not in vectors]
+        if len(missing_hashes) and self.embedding_cache_model:
+            try:
+                stored = await self.embedding_cache_model.get_embeddings(
+                    embedding_model_id=model_id,
+                    document_type=document_type,
+                    text_hashes=missing_hashes
+                )
+            except Exception as e:
+                self.logger.warning(f"Embedding cache lookup failed: {e}")
+                stored = {}
+
+            stored = {
+                h: np.frombuffer(embedding, dtype=np.float32)
+                for h, embedding in stored.items()
+            }
+            EMBEDDING_CACHE_HITS.labels(tier="persistent").inc(len(stored))
+            self.store_memory(vectors=stored, document_type=document_type)
+            vectors.update(stored)
+
+        # embedding client
+        missing_hashes = [h for h in hash_texts if h not in vectors]
+        if len(missing_hashes):
+            EMBEDDING_CACHE_MISSES.inc(len(missing_hashes))
+            new_vectors = await self.client.embed_text_async(
+                text=[hash_texts[h] for h in missing_hashes],
+                document_type=document_type
+            )
+            if new_vectors is None or len(new_vectors) != len(missing_hashes):
+                return None
+
+            new_vectors = {
+                h: np.asarray(v, dtype=np.float32)
+                for h, v in zip(missing_hashes, new_vectors)
+            }
+            self.store_memory(vectors=new_vectors, document_type=document_type)
+            vectors.update(new_vectors)
+
+            if self.embedding_cache_model:
+                try:
+                    await self.embedding_cache_model.insert_embeddings(
+                        embedding_model_id=model_id,
+                        document_type=document_type,
+                        embeddings={h: v.tobytes() for h, v in new_vectors.items()}
+                    )
+                except Exception as e:
+                    self.logger.warning(f"Embedding cache write failed: {e}")
+
+        return np.stack([vectors[h] for h in hashes])
@@ -0,0 +1,245 @@
+from .LLMInterface import LLMInterface
+from .LLMEnums import DocumentTypeEnum
+from utils.metrics import EMBEDDING_REQUEST_RETRIES, EMBEDDING_THROTTLED_SECONDS
+from typing import Callable, List, Union
+import numpy as np
+import asyncio
+import logging
+import random
+import time
+
+
+class EmbeddingRetryableError(Exception):
+    """
+    Raised when the embedding client returned no usable vectors.
+    """
+    pass
+
+
+class RateLimiter:
+    """
+    Paces requests against requests-per-minute and tokens-per-minute budgets with two
+    token buckets refilled continuously. A limit of 0 disables that bucket.
+    Waiters are served in arrival order.
+    """
+
+    def __init__(self, rpm_limit: int = 0, tpm_limit: int = 0):
+        self.rpm_limit = rpm_limit
+        self.tpm_limit = tpm_limit
+
+        self.requests_available = float(rpm_limit)
+        self.tokens_available = float(tpm_limit)
+        self.refilled_at = time.monotonic()
+        self.paused_until = 0.0
+
+        self.lock = asyncio.Lock()
+
+    def refill(self):
+        now = time.monotonic()
+        elapsed = now - self.refilled_at
+        self.refilled_at = now
+
+        if self.rpm_limit:
+            self.requests_available = min(self.rpm_limit, self.requests_available + elapsed * self.rpm_limit / 60)
+        if self.tpm_limit:
+            self.tokens_available = min(self.tpm_limit, self.tokens_available + elapsed * self.tpm_limit / 60)
+
+    def get_wait_seconds(self, tokens: int):
+        wait_seconds = max(0.0, self.paused_until - time.monotonic())
+        if self.rpm_limit and self.requests_available < 1:
+            wait_seconds = max(wait_seconds, (1 - self.requests_available) * 60 / self.rpm_limit)
+        if self.tpm_limit:
+            # a request larger than the whole budget waits for a full bucket
+            tokens = min(tokens, self.tpm_limit)
+            if self.tokens_available < tokens:
+                wait_seconds = max(wait_seconds, (tokens - self.tokens_available) * 60 / self.tpm_limit)
+        return wait_seconds
+
+    async def acquire(self, tokens: int):
+        """
+        Wait until one request of the given tokens fits in the budgets, then take it.
+        """
+        if not self.rpm_limit and not self.tpm_limit and self.paused_until <= time.monotonic():
+            return
+
+        async with self.lock:
+            while True:
+                self.refill()
+                wait_seconds = self.get_wait_seconds(tokens=tokens)
+                if wait_seconds <= 0:
+                    break
+
+                EMBEDDING_THROTTLED_SECONDS.inc(wait_seconds)
+                await asyncio.sleep(wait_seconds)
+
+            if self.rpm_limit:
+                self.requests_available -= 1
+            if self.tpm_limit:
+                self.tokens_available -= min(tokens, self.tpm_limit)
+
+    def pause(self, seconds: float):
+        """
+        Hold every request for some seconds, e.g. after the provider answered 429.
+        """
+        self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+
+
+class EmbeddingScheduler(LLMInterface):
+    """
+    Rate-limit-aware scheduler in front of an embedding client.
+    Async requests are split into batches sized by estimated tokens and texts, the
+    batches run concurrently up to max_concurrent_requests while being paced against
+    the RPM / TPM budgets, and failed batches are retried with jittered exponential
+    backoff. One instance is shared by every embedding caller of the process.
+    """
+
+    RETRYABLE_STATUS_CODES = {408, 409, 425, 429, 500, 502, 503, 504}
+
+    def __init__(self, client: LLMInterface, count_tokens: Callable[[str], int] = None,
+                 rpm_limit: int = 0, tpm_limit: int = 0,
+                 max_request_tokens: int = 100000, max_request_texts: int = 256,
+                 max_concurrent_requests: int = 4, max_retries: int = 5,
+                 retry_base_seconds: float = 0.5, retry_max_seconds: float = 30.0):
+        self.client = client
+        self.count_tokens = count_tokens if count_tokens else (lambda text: len(text) // 4 + 1)
+
+        self.max_request_tokens = max_request_tokens
+        self.max_request_texts = max_request_texts
+        self.max_retries = max_retries
+        self.retry_base_seconds = retry_base_seconds
+        self.retry_max_seconds = retry_max_seconds
+
+        self.rate_limiter = RateLimiter(rpm_limit=rpm_limit, tpm_limit=tpm_limit)
+        self.semaphore = asyncio.Semaphore(max_concurrent_requests)
+
+        self.logger = logging.getLogger(__name__)
+
+    def __getattr__(self, name: str):
+        # expose the wrapped client attributes (embedding_size, embedding_model_id, enums, ...)
+        if name == "client":
+            raise AttributeError(name)
+        return getattr(self.client, name)
+
+    def set_generation_model(self, model_id: str):
+        self.client.set_generation_model(model_id=model_id)
+
+    def set_embedding_model(self, model_id: str, embedding_size: int):
+        self.client.set_embedding_model(model_id=model_id, embedding_size=embedding_size)
+
+    def generate_text(self, prompt: str, chat_history: list, max_output_token: int = None,
+                      temperature: float = None):
+        return self.client.generate_text(prompt, chat_history, max_output_token, temperature)
+
+    async def generate_text_async(self, prompt: str, chat_history: list, max_output_token: int = None,
+                                  temperature: float = None):
+        return await self.client.generate_text_async(prompt, chat_history, max_output_token, temperature)
+
+    def construct_prompt(self, prompt: str, role: str):
+        return self.client.construct_prompt(prompt=prompt, role=role)
+
+    async def close(self):
+        await self.client.close()
+
+    def embed_text(self, text: Union[str, List[str]], document_type: str = None):
+        return self.client.embed_text(text=text, document_type=document_type)
+
+    def split_batches(self, texts: List[str]):
+        """
+        Split the texts into (texts, estimated tokens) batches within the request limits.
+        """
+        batches = []
+        batch, batch_tokens = [], 0
+        for text in texts:
+            text_tokens = self.count_tokens(text)
+            if len(batch) and (len(batch) >= self.max_request_texts
+                               or batch_tokens + text_tokens > self.max_request_tokens):
+                batches.append((batch, batch_tokens))
+                batch, batch_tokens = [], 0
+
+            batch.append(text)
+            batch_tokens += text_tokens
+
+        if len(batch):
+            batches.append((batch, batch_tokens))
+
+        return batches
+
+    async def embed_text_async(self, text: Union[str, List[str]], document_type: str = None):
+
+        texts = [text] if isinstance(text, str) else list(text)
+        document_type = document_type if document_type else DocumentTypeEnum.DOCUMENT.value
+
+        if len(texts) == 0:
+            return await self.client.embed_text_async(text=texts, document_type=document_type)
+
+        batches = self.split_batches(texts=texts)
+        results = await asyncio.gather(*[
+            self.embed_batch(texts=batch, tokens=batch_tokens, document_type=document_type)
+            for batch, batch_tokens in batches
+        ])
+
+        if any(vectors is None for vectors in results):
+            return None
+
+        return np.concatenate(results) if len(results) > 1 else results[0]
+
+    def is_retryable(self, error: Exception):
+        if isinstance(error, (EmbeddingRetryableError, asyncio.TimeoutError, ConnectionError)):
+            return True
+
+        status_code = getattr(error, "status_code", None)
+        if status_code is None and getattr(error, "response", None) is not None:
+            status_code = getattr(error.response, "status_code", None)
+        if status_code is not None:
+            return status_code in self.RETRYABLE_STATUS_CODES
+
+        # provider SDK timeouts / connection errors (openai, cohere, httpx) carry no status
+        error_name = type(error).__name__
+        return "Timeout" in error_name or "Connection" in error_name
+
+    def get_retry_after(self, error: Exception):
+        response = getattr(error, "response", None)
+        headers = getattr(response, "headers", None)
+        if not headers:
+            return None
+
+        try:
+            return float(headers.get("retry-after"))
+        except (TypeError, ValueError):
+            return None
+
+    async def embed_batch(self, texts: List[str], tokens: int, document_type: str):
+        """
+        Send one batch within the rate limits, retrying retryable failures.
+        """
+        attempt = 0
+        while True:
+            await self.rate_limiter.acquire(tokens=tokens)
+
+            try:
+                async with self.semaphore:
+                    vectors = await self.client.embed_text_async(text=texts, document_type=document_type)
+                if vectors is None or len(vectors) != len(texts):
+                    raise EmbeddingRetryableError(f"Embedding client returned no vectors for {len(texts)} texts.")
+                return vectors
+
+            except Exception as e:
+                if attempt >= self.max_retries or not self.is_retryable(error=e):
+                    self.logger.error(f"Embedding batch of {len(texts)} texts failed after {attempt + 1} attempts: {e}")
+                    if isinstance(e, EmbeddingRetryableError):
+                        return None
+                    raise
+
+                # full jitter, and a 429 Retry-After holds back every batch of the process
+                backoff_seconds = random.uniform(
+                    0, min(self.retry_max_seconds, self.retry_base_seconds * 2 ** attempt)
+                )
+                retry_after = self.get_retry_after(error=e)
+                if retry_after:
+                    self.rate_limiter.pause(seconds=retry_after)
+                    backoff_seconds = max(backoff_seconds, retry_after)
+
+                EMBEDDING_REQUEST_RETRIES.labels(error=type(e).__name__).inc()
+                self.logger.warning(f"Retrying embedding batch in {backoff_seconds:.2f}s: {e}")
+                attempt += 1
+                await asyncio.sleep(backoff_seconds)
@@ -3,6 +3,8 @@ from enum import Enum
 class LLMEnums(Enum):
     OPENAI = "OPENAI"
     COHERE = "COHERE"
+    LOCAL = "LOCAL"
+    FAKE = "FAKE"
     
 class OPENAIEnums(Enum):
     SYSTEM = "system"
@@ -28,10 +28,27 @@ class LLMInterface(ABC):
         """
         pass
     
+    @abstractmethod
+    async def generate_text_async(self, prompt: str, chat_history: list, max_output_token: int,
+                                  temperature: float = None):
+        """
+        Generate text based on the provided prompt without blocking the event loop.
+        """
+        pass
+    
     @abstractmethod
     def embed_text(self, text: str, document_type: str = None):
         """
         Embed the provided text for semantic search or other purposes.
+        Returns a float32 numpy array of shape (len(text), embedding_size).
+        """
+        pass
+    
+    @abstractmethod
+    async def embed_text_async(self, text: str, document_type: str = None):
+        """
+        Embed the provided text without blocking the event loop.
+        Returns a float32 numpy array of shape (len(text), embedding_size).
         """
         pass
     
@@ -40,4 +57,10 @@ class LLMInterface(ABC):
         """
         Construct a prompt with the specified role.
         """
+        pass
+    
+    async def close(self):
+        """
+        Release the network resources held by the provider.
+        """
         pass
\ No newline at end of file
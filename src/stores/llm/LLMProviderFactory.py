@@ -1,5 +1,6 @@
 from .LLMEnums import LLMEnums
-from .providers import OpenAIProvider, CoHereProvider
+from .providers import OpenAIProvider, CoHereProvider, LocalProvider, FakeProvider
+import os
 
 class LLMProviderFactory:
     """
@@ -12,9 +13,13 @@ class LLMProviderFactory:
         if provider == LLMEnums.OPENAI.value:
             return OpenAIProvider(
                 api_key=self.config.OPENAI_API_KEY,
+                api_url=self.config.OPENAI_API_URL,
                 default_input_max_characters=self.config.GENERATION_DEFAULT_MAX_TOKENS,
                 default_generation_max_output_tokens=self.config.GENERATION_DEFAULT_MAX_TOKENS,
-                default_generation_temperature=self.config.GENERATION_DEFAULT_TEMPERATURE
+                default_generation_temperature=self.config.GENERATION_DEFAULT_TEMPERATURE,
+                http_max_connections=self.config.LLM_HTTP_MAX_CONNECTIONS,
+                http_max_keepalive_connections=self.config.LLM_HTTP_MAX_KEEPALIVE_CONNECTIONS,
+                http_timeout=self.config.LLM_HTTP_TIMEOUT
             )
             
         if provider == LLMEnums.COHERE.value:
@@ -22,7 +27,34 @@ class LLMProviderFactory:
                 api_key=self.config.COHERE_API_KEY,
                 default_input_max_characters=self.config.GENERATION_DEFAULT_MAX_TOKENS,
                 default_generation_max_output_token=self.config.GENERATION_DEFAULT_MAX_TOKENS,
-                default_generation_temperature=self.config.GENERATION_DEFAULT_TEMPERATURE
+                default_generation_temperature=self.config.GENERATION_DEFAULT_TEMPERATURE,
+                http_max_connections=self.config.LLM_HTTP_MAX_CONNECTIONS,
+                http_max_keepalive_connections=self.config.LLM_HTTP_MAX_KEEPALIVE_CONNECTIONS,
+                http_timeout=self.config.LLM_HTTP_TIMEOUT
+            )
+
+        if provider == LLMEnums.LOCAL.value:
+            return LocalProvider(
+                models_dir=os.path.join(
+                    os.path.dirname(os.path.dirname(os.path.dirname(__file__))),
+                    self.config.LOCAL_MODELS_DIR
+                ),
+                batch_size=self.config.LOCAL_EMBEDDING_BATCH_SIZE,
+                workers=self.config.LOCAL_EMBEDDING_WORKERS,
+                threads_per_worker=self.config.LOCAL_EMBEDDING_THREADS_PER_WORKER,
+                max_length=self.config.LOCAL_EMBEDDING_MAX_LENGTH,
+                normalize=self.config.LOCAL_EMBEDDING_NORMALIZE,
+                query_prefix=self.config.LOCAL_EMBEDDING_QUERY_PREFIX,
+                document_prefix=self.config.LOCAL_EMBEDDING_DOCUMENT_PREFIX
+            )
+
+        if provider == LLMEnums.FAKE.value:
+            return FakeProvider(
+                latency_ms=self.config.FAKE_LATENCY_MS,
+                latency_jitter_ms=self.config.FAKE_LATENCY_JITTER_MS,
+                error_rate=self.config.FAKE_ERROR_RATE,
+                seed=self.config.FAKE_SEED,
+                generation_text=self.config.FAKE_GENERATION_TEXT
             )
             
         return None
\ No newline at end of file
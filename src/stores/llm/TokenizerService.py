@@ -0,0 +1,92 @@
+from tokenizers import Tokenizer
+from typing import Callable
+import logging
+import math
+import os
+import threading
+
+
+class TokenizerService:
+    """
+    Counts and truncates text in model tokens.
+    Tokenizer files (HuggingFace tokenizer.json) are read from local disk once and cached
+    per model id, looked up as <tokenizers_dir>/<model_id>/tokenizer.json or
+    <tokenizers_dir>/<model_id>.json. Models without a tokenizer file fall back to an
+    estimate of chars_per_token characters per token.
+    """
+
+    def __init__(self, tokenizers_dir: str = None, chars_per_token: float = 4.0):
+        self.tokenizers_dir = tokenizers_dir
+        self.chars_per_token = chars_per_token
+
+        self.tokenizers = {}
+        self.lock = threading.Lock()
+        self.logger = logging.getLogger(__name__)
+
+    def get_tokenizer_path(self, model_id: str):
+        if not self.tokenizers_dir or not model_id:
+            return None
+
+        tokenizers_dir = os.path.realpath(self.tokenizers_dir)
+        for file_path in (
+            os.path.join(tokenizers_dir, model_id, "tokenizer.json"),
+            os.path.join(tokenizers_dir, f"{model_id}.json"),
+        ):
+            file_path = os.path.realpath(file_path)
+            if file_path.startswith(tokenizers_dir + os.sep) and os.path.isfile(file_path):
+                return file_path
+
+        return None
+
+    def get_tokenizer(self, model_id: str):
+        """
+        Get the cached tokenizer of the model, None if it has no tokenizer file.
+        """
+        if model_id in self.tokenizers:
+            return self.tokenizers[model_id]
+
+        with self.lock:
+            if model_id not in self.tokenizers:
+                tokenizer = None
+                file_path = self.get_tokenizer_path(model_id=model_id)
+                if file_path:
+                    try:
+                        tokenizer = Tokenizer.from_file(file_path)
+                    except Exception as e:
+                        self.logger.error(f"Failed to load tokenizer {file_path}: {e}")
+                else:
+                    self.logger.warning(f"No tokenizer file for {model_id}, token counts are estimated.")
+
+                self.tokenizers[model_id] = tokenizer
+
+        return self.tokenizers[model_id]
+
+    def count_tokens(self, text: str, model_id: str):
+        tokenizer = self.get_tokenizer(model_id=model_id)
+        if tokenizer is None:
+            return math.ceil(len(text) / self.chars_per_token)
+
+        return len(tokenizer.encode(text, add_special_tokens=False).ids)
+
+    def get_counter(self, model_id: str) -> Callable[[str], int]:
+        """
+        Token counter of the model, e.g. for Chunker(count_tokens=...).
+        """
+        return lambda text: self.count_tokens(text=text, model_id=model_id)
+
+    def truncate(self, text: str, max_tokens: int, model_id: str):
+        """
+        Cut the text to at most max_tokens tokens of the model.
+        """
+        if max_tokens <= 0:
+            return ""
+
+        tokenizer = self.get_tokenizer(model_id=model_id)
+        if tokenizer is None:
+            return text[:int(max_tokens * self.chars_per_token)]
+
+        offsets = tokenizer.encode(text, add_special_tokens=False).offsets
+        if len(offsets) <= max_tokens:
+            return text
+
+        return text[:offsets[max_tokens - 1][1]]
@@ -1,6 +1,8 @@
 from ..LLMInterface import LLMInterface
 from ..LLMEnums import CoHereEnums, DocumentTypeEnum
 import cohere
+import httpx
+import numpy as np
 import logging
 from typing import List, Union
 
@@ -14,7 +16,10 @@ class CoHereProvider(LLMInterface):
     def __init__(self, api_key: str,
                     default_input_max_characters: int = 1000,
                     default_generation_max_output_token: int = 1000,
-                    default_generation_temperature: float = 0.1):
+                    default_generation_temperature: float = 0.1,
+                    http_max_connections: int = 100,
+                    http_max_keepalive_connections: int = 20,
+                    http_timeout: float = 60.0):
 
         self.api_key = api_key
         
@@ -30,6 +35,20 @@ class CoHereProvider(LLMInterface):
             api_key=self.api_key,
         )
         
+        # one pooled keep-alive transport shared by every async call of this provider
+        self.http_client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=http_max_connections,
+                max_keepalive_connections=http_max_keepalive_connections
+            ),
+            timeout=http_timeout
+        )
+        
+        self.async_client = cohere.AsyncClient(
+            api_key=self.api_key,
+            httpx_client=self.http_client,
+        )
+        
         self.enums = CoHereEnums
         self.logger = logging.getLogger(__name__)
         
@@ -62,7 +81,35 @@ class CoHereProvider(LLMInterface):
         response = self.client.chat(
             model=self.generation_model_id,
             chat_history=chat_history,
-            message=self.process_text(prompt),
+            message=prompt,
+            temperature=temperature,
+            max_tokens=max_output_token
+        )
+        
+        if not response or not response.text:
+            self.logger.error("Failed to get response from CoHere API.")
+            return None
+        
+        return response.text
+    
+    async def generate_text_async(self, prompt: str, chat_history: list, max_output_token: int=None,
+                                  temperature: float = None):
+        
+        if not self.async_client:
+            self.logger.error("CoHere async client is not initialized.")
+            return None
+        
+        if not self.generation_model_id:
+            self.logger.error("Generation model for CoHere is not set.")
+            return None
+        
+        max_output_token = max_output_token if max_output_token else self.default_generation_max_output_token
+        temperature = temperature if temperature else self.default_generation_temperature
+        
+        response = await self.async_client.chat(
+            model=self.generation_model_id,
+            chat_history=chat_history,
+            message=prompt,
             temperature=temperature,
             max_tokens=max_output_token
         )
@@ -101,10 +148,43 @@ class CoHereProvider(LLMInterface):
             self.logger.error("Failed to get embedding from OpenAI API.")
             return None
         
-        return [f for f in response.embeddings.float]
+        return np.asarray(response.embeddings.float, dtype=np.float32)
+    
+    async def embed_text_async(self, text: Union[str, List[str]], document_type: str = None):
+        
+        if not self.async_client:
+            self.logger.error("CoHere async client is not initialized.")
+            return None
+        
+        if isinstance(text, str):
+            text = [text]
+        
+        if not self.embedding_model_id:
+            self.logger.error("Embedding model for CoHere is not set.")
+            return None
+        
+        input_type = CoHereEnums.DOCUMENT
+        if document_type == DocumentTypeEnum.QUERY.value:
+            input_type = CoHereEnums.QUERY
+        
+        response = await self.async_client.embed(
+            model=self.embedding_model_id,
+            texts=[self.process_text(t) for t in text],
+            input_type=input_type.value,
+            embedding_types=['float']
+        )
+        
+        if not response or not response.embeddings or not response.embeddings.float:
+            self.logger.error("Failed to get embedding from CoHere API.")
+            return None
+        
+        return np.asarray(response.embeddings.float, dtype=np.float32)
     
     def construct_prompt(self, prompt: str, role: str):
         return {
             "role": role,
             "text": prompt
-        }
\ No newline at end of file
+        }
+    
+    async def close(self):
+        await self.http_client.aclose()
\ No newline at end of file
@@ -0,0 +1,164 @@
+from ..LLMInterface import LLMInterface
+from ..LLMEnums import OPENAIEnums
+from functools import lru_cache
+import numpy as np
+import asyncio
+import hashlib
+import logging
+import random
+import re
+import time
+from typing import List, Union
+
+
+class FakeProviderError(Exception):
+    """
+    Injected failure, shaped like a provider rate limit / outage response.
+    """
+
+    def __init__(self, message: str, status_code: int = 503):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+class FakeProvider(LLMInterface):
+    """
+    Deterministic offline LLMInterface for load tests and benchmarks.
+    Embeddings are hash based: every word maps to a fixed pseudo-random vector and a
+    text embeds to the normalized sum of its words, so equal texts get equal vectors and
+    texts sharing words stay close. Generations are canned. Latency and error rates
+    are configurable.
+    """
+
+    WORD_PATTERN = re.compile(r"\w+")
+
+    def __init__(self, latency_ms: float = 0.0,
+                       latency_jitter_ms: float = 0.0,
+                       error_rate: float = 0.0,
+                       seed: int = 0,
+                       generation_text: str = None):
+
+        self.latency_ms = latency_ms
+        self.latency_jitter_ms = latency_jitter_ms
+        self.error_rate = error_rate
+        self.seed = seed
+        self.generation_text = generation_text
+
+        self.random = random.Random(seed)
+
+        self.generation_model_id = None
+
+        self.embedding_model_id = None
+        self.embedding_size = None
+
+        self.enums = OPENAIEnums
+        self.logger = logging.getLogger(__name__)
+
+    def set_generation_model(self, model_id: str):
+        self.generation_model_id = model_id
+
+    def set_embedding_model(self, model_id: str, embedding_size: int):
+        self.embedding_model_id = model_id
+        self.embedding_size = embedding_size
+
+    def get_delay_seconds(self):
+        jitter_ms = self.random.uniform(-self.latency_jitter_ms, self.latency_jitter_ms) \
+                    if self.latency_jitter_ms else 0.0
+        return max(0.0, self.latency_ms + jitter_ms) / 1000
+
+    def maybe_fail(self):
+        if self.error_rate and self.random.random() < self.error_rate:
+            status_code = self.random.choice([429, 503])
+            raise FakeProviderError(f"Injected fake provider error ({status_code})", status_code=status_code)
+
+    def simulate_call(self):
+        """
+        Artificial latency, then maybe an injected error.
+        """
+        time.sleep(self.get_delay_seconds())
+        self.maybe_fail()
+
+    async def simulate_call_async(self):
+        await asyncio.sleep(self.get_delay_seconds())
+        self.maybe_fail()
+
+    @staticmethod
+    @lru_cache(maxsize=100000)
+    def get_word_vector(word: str, embedding_size: int, seed: int):
+        digest = hashlib.blake2b(f"{seed}:{word}".encode("utf-8"), digest_size=8).digest()
+        rng = np.random.default_rng(int.from_bytes(digest, "little"))
+        return rng.standard_normal(embedding_size).astype(np.float32)
+
+    def embed_texts(self, texts: List[str], embedding_size: int = None):
+        """
+        Deterministic embeddings of the texts, shape (len(texts), embedding_size).
+        """
+        embedding_size = embedding_size if embedding_size else self.embedding_size
+        vectors = np.zeros((len(texts), embedding_size), dtype=np.float32)
+
+        for i, text in enumerate(texts):
+            words = self.WORD_PATTERN.findall(text.lower()) or [text]
+            for word in words:
+                vectors[i] += self.get_word_vector(word, embedding_size, self.seed)
+
+        vectors /= np.maximum(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12)
+        return vectors
+
+    def build_generation(self, prompt: str):
+        if self.generation_text:
+            return self.generation_text
+
+        prompt_hash = hashlib.sha256(prompt.encode("utf-8")).hexdigest()[:12]
+        return f"Fake answer {prompt_hash} for a prompt of {len(prompt)} characters."
+
+    def generate_text(self, prompt: str, chat_history: list = [], max_output_tokens: int = None,
+                            temperature: float = None):
+
+        self.simulate_call()
+
+        chat_history.append(
+            self.construct_prompt(prompt=prompt, role=OPENAIEnums.USER.value)
+        )
+        return self.build_generation(prompt=prompt)
+
+    async def generate_text_async(self, prompt: str, chat_history: list = [], max_output_tokens: int = None,
+                                  temperature: float = None):
+
+        await self.simulate_call_async()
+
+        chat_history.append(
+            self.construct_prompt(prompt=prompt, role=OPENAIEnums.USER.value)
+        )
+        return self.build_generation(prompt=prompt)
+
+    def embed_text(self, text: Union[str, List[str]], document_type: str = None):
+
+        if not self.embedding_size:
+            self.logger.error("Embedding model for fake provider was not set")
+            return None
+
+        if isinstance(text, str):
+            text = [text]
+
+        self.simulate_call()
+
+        return self.embed_texts(texts=text)
+
+    async def embed_text_async(self, text: Union[str, List[str]], document_type: str = None):
+
+        if not self.embedding_size:
+            self.logger.error("Embedding model for fake provider was not set")
+            return None
+
+        if isinstance(text, str):
+            text = [text]
+
+        await self.simulate_call_async()
+
+        return self.embed_texts(texts=text)
+
+    def construct_prompt(self, prompt: str, role: str):
+        return {
+            "role": role,
+            "content": prompt
+        }
@@ -0,0 +1,215 @@
+from ..LLMInterface import LLMInterface
+from ..LLMEnums import OPENAIEnums, DocumentTypeEnum
+from concurrent.futures import ThreadPoolExecutor
+from tokenizers import Tokenizer
+import onnxruntime as ort
+import numpy as np
+import asyncio
+import logging
+import os
+import threading
+from typing import List, Union
+
+
+class LocalProvider(LLMInterface):
+    """
+    Implementation of the LLMInterface running an ONNX embedding model on the local CPU.
+    The model is read from <models_dir>/<model_id>/model.onnx with its HuggingFace
+    tokenizer.json next to it, so embedding needs no network access. Inputs are sorted
+    by length and embedded in batches on a thread pool (ONNX Runtime releases the GIL).
+    Text generation is not supported.
+    """
+
+    def __init__(self, models_dir: str,
+                       batch_size: int = 32,
+                       workers: int = 2,
+                       threads_per_worker: int = 0,
+                       max_length: int = 512,
+                       normalize: bool = True,
+                       query_prefix: str = "",
+                       document_prefix: str = ""):
+
+        self.models_dir = models_dir
+        self.batch_size = batch_size
+        self.threads_per_worker = threads_per_worker
+        self.max_length = max_length
+        self.normalize = normalize
+        self.query_prefix = query_prefix or ""
+        self.document_prefix = document_prefix or ""
+
+        self.generation_model_id = None
+
+        self.embedding_model_id = None
+        self.embedding_size = None
+
+        self.session = None
+        self.tokenizer = None
+        self.load_lock = threading.Lock()
+
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="local-embedding")
+
+        self.enums = OPENAIEnums
+        self.logger = logging.getLogger(__name__)
+
+    def set_generation_model(self, model_id: str):
+        self.generation_model_id = model_id
+
+    def set_embedding_model(self, model_id: str, embedding_size: int):
+        self.embedding_model_id = model_id
+        self.embedding_size = embedding_size
+        self.session = None
+        self.tokenizer = None
+
+    def load_model(self):
+        """
+        Load the ONNX session and tokenizer of the embedding model once.
+        """
+        if self.session is not None:
+            return True
+
+        with self.load_lock:
+            if self.session is not None:
+                return True
+
+            model_path = os.path.join(self.models_dir, self.embedding_model_id)
+            onnx_path = os.path.join(model_path, "model.onnx")
+            tokenizer_path = os.path.join(model_path, "tokenizer.json")
+            if not os.path.isfile(onnx_path) or not os.path.isfile(tokenizer_path):
+                self.logger.error(f"Local embedding model files not found in {model_path}")
+                return False
+
+            tokenizer = Tokenizer.from_file(tokenizer_path)
+            tokenizer.no_padding()
+            tokenizer.enable_truncation(max_length=self.max_length)
+
+            session_options = ort.SessionOptions()
+            if self.threads_per_worker:
+                session_options.intra_op_num_threads = self.threads_per_worker
+            session = ort.InferenceSession(
+                onnx_path,
+                sess_options=session_options,
+                providers=["CPUExecutionProvider"]
+            )
+
+            self.input_names = {model_input.name for model_input in session.get_inputs()}
+            self.tokenizer = tokenizer
+            self.session = session
+
+        return True
+
+    def process_text(self, text: str, document_type: str = None):
+        prefix = self.query_prefix if document_type == DocumentTypeEnum.QUERY.value else self.document_prefix
+        return f"{prefix}{text}"
+
+    def generate_text(self, prompt: str, chat_history: list = [], max_output_tokens: int = None,
+                            temperature: float = None):
+        self.logger.error("Text generation is not supported by the local provider")
+        return None
+
+    async def generate_text_async(self, prompt: str, chat_history: list = [], max_output_tokens: int = None,
+                                  temperature: float = None):
+        self.logger.error("Text generation is not supported by the local provider")
+        return None
+
+    def embed_batch(self, texts: List[str]):
+        """
+        Run the model over one batch and pool the token embeddings.
+        """
+        encodings = self.tokenizer.encode_batch(texts)
+        max_tokens = max(len(encoding.ids) for encoding in encodings)
+
+        input_ids = np.zeros((len(texts), max_tokens), dtype=np.int64)
+        attention_mask = np.zeros((len(texts), max_tokens), dtype=np.int64)
+        for i, encoding in enumerate(encodings):
+            input_ids[i, :len(encoding.ids)] = encoding.ids
+            attention_mask[i, :len(encoding.ids)] = 1
+
+        inputs = {"input_ids": input_ids, "attention_mask": attention_mask}
+        if "token_type_ids" in self.input_names:
+            inputs["token_type_ids"] = np.zeros_like(input_ids)
+
+        outputs = self.session.run(None, {k: v for k, v in inputs.items() if k in self.input_names})[0]
+
+        # token embeddings are mean pooled over the attention mask,
+        # models exported with their own pooling already return one vector per text
+        if outputs.ndim == 3:
+            mask = attention_mask[:, :, None].astype(np.float32)
+            outputs = (outputs * mask).sum(axis=1) / np.maximum(mask.sum(axis=1), 1e-9)
+
+        vectors = outputs.astype(np.float32)
+        if self.normalize:
+            vectors /= np.maximum(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12)
+
+        return vectors
+
+    def get_batches(self, texts: List[str]):
+        """
+        Batches of text indices, sorted by length so each batch carries little padding.
+        """
+        order = sorted(range(len(texts)), key=lambda i: len(texts[i]))
+        return [order[i:i + self.batch_size] for i in range(0, len(order), self.batch_size)]
+
+    def gather_vectors(self, texts: List[str], batches: List[List[int]], results: list):
+        vectors = np.empty((len(texts), results[0].shape[1]), dtype=np.float32)
+        for batch, batch_vectors in zip(batches, results):
+            vectors[batch] = batch_vectors
+
+        if self.embedding_size and vectors.shape[1] != self.embedding_size:
+            self.logger.warning(
+                f"Local model {self.embedding_model_id} returns {vectors.shape[1]} dimensions, "
+                f"configured embedding size is {self.embedding_size}"
+            )
+
+        return vectors
+
+    def embed_text(self, text: Union[str, List[str]], document_type: str = None):
+
+        if not self.embedding_model_id:
+            self.logger.error("Embedding model for local provider was not set")
+            return None
+
+        if isinstance(text, str):
+            text = [text]
+
+        if len(text) == 0 or not self.load_model():
+            return None
+
+        texts = [self.process_text(t, document_type=document_type) for t in text]
+        batches = self.get_batches(texts=texts)
+        results = list(self.executor.map(
+            lambda batch: self.embed_batch([texts[i] for i in batch]),
+            batches
+        ))
+
+        return self.gather_vectors(texts=texts, batches=batches, results=results)
+
+    async def embed_text_async(self, text: Union[str, List[str]], document_type: str = None):
+
+        if not self.embedding_model_id:
+            self.logger.error("Embedding model for local provider was not set")
+            return None
+
+        if isinstance(text, str):
+            text = [text]
+
+        loop = asyncio.get_running_loop()
+        if len(text) == 0 or not await loop.run_in_executor(self.executor, self.load_model):
+            return None
+
+        texts = [self.process_text(t, document_type=document_type) for t in text]
+        batches = self.get_batches(texts=texts)
+        results = await asyncio.gather(*[
+            loop.run_in_executor(self.executor, self.embed_batch, [texts[i] for i in batch])
+            for batch in batches
+        ])
+
+        return self.gather_vectors(texts=texts, batches=batches, results=results)
+
+    def construct_prompt(self, prompt: str, role: str):
+        return {
+            "role": role,
+            "content": prompt
+        }
+
+    async def close(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
@@ -1,6 +1,8 @@
 from ..LLMInterface import LLMInterface
 from ..LLMEnums import OPENAIEnums
-from openai import OpenAI
+from openai import OpenAI, AsyncOpenAI
+import httpx
+import numpy as np
 import logging
 from typing import List, Union
 
@@ -13,7 +15,10 @@ class OpenAIProvider(LLMInterface):
     def __init__(self, api_key: str, api_url: str=None,
                        default_input_max_characters: int=1000,
                        default_generation_max_output_tokens: int=1000,
-                       default_generation_temperature: float=0.1):
+                       default_generation_temperature: float=0.1,
+                       http_max_connections: int=100,
+                       http_max_keepalive_connections: int=20,
+                       http_timeout: float=60.0):
         
         self.api_key = api_key
         self.api_url = api_url
@@ -32,6 +37,21 @@ class OpenAIProvider(LLMInterface):
             base_url = self.api_url if self.api_url and len(self.api_url) else None
         )
 
+        # one pooled keep-alive transport shared by every async call of this provider
+        self.http_client = httpx.AsyncClient(
+            limits = httpx.Limits(
+                max_connections = http_max_connections,
+                max_keepalive_connections = http_max_keepalive_connections
+            ),
+            timeout = http_timeout
+        )
+
+        self.async_client = AsyncOpenAI(
+            api_key = self.api_key,
+            base_url = self.api_url if self.api_url and len(self.api_url) else None,
+            http_client = self.http_client
+        )
+
         self.enums = OPENAIEnums
         self.logger = logging.getLogger(__name__)
 
@@ -76,6 +96,37 @@ class OpenAIProvider(LLMInterface):
 
         return response.choices[0].message.content
 
+    async def generate_text_async(self, prompt: str, chat_history: list=[], max_output_tokens: int=None,
+                                  temperature: float = None):
+
+        if not self.async_client:
+            self.logger.error("OpenAI async client was not set")
+            return None
+
+        if not self.generation_model_id:
+            self.logger.error("Generation model for OpenAI was not set")
+            return None
+
+        max_output_tokens = max_output_tokens if max_output_tokens else self.default_generation_max_output_tokens
+        temperature = temperature if temperature else self.default_generation_temperature
+
+        chat_history.append(
+            self.construct_prompt(prompt=prompt, role=OPENAIEnums.USER.value)
+        )
+
+        response = await self.async_client.chat.completions.create(
+            model = self.generation_model_id,
+            messages = chat_history,
+            max_tokens = max_output_tokens,
+            temperature = temperature
+        )
+
+        if not response or not response.choices or len(response.choices) == 0 or not response.choices[0].message:
+            self.logger.error("Error while generating text with OpenAI")
+            return None
+
+        return response.choices[0].message.content
+
 
     def embed_text(self, text: Union[str, List[str]], document_type: str = None):
 
@@ -99,13 +150,40 @@ class OpenAIProvider(LLMInterface):
             self.logger.error("Error while embedding text with OpenAI")
             return None
 
-        return [rec.embedding for rec in response.data] 
+        return np.asarray([rec.embedding for rec in response.data], dtype=np.float32) 
+
+    async def embed_text_async(self, text: Union[str, List[str]], document_type: str = None):
+
+        if not self.async_client:
+            self.logger.error("OpenAI async client was not set")
+            return None
+
+        if isinstance(text, str):
+            text = [text]
+
+        if not self.embedding_model_id:
+            self.logger.error("Embedding model for OpenAI was not set")
+            return None
+
+        response = await self.async_client.embeddings.create(
+            model = self.embedding_model_id,
+            input = text,
+        )
+
+        if not response or not response.data or len(response.data) == 0 or not response.data[0].embedding:
+            self.logger.error("Error while embedding text with OpenAI")
+            return None
+
+        return np.asarray([rec.embedding for rec in response.data], dtype=np.float32)
 
     def construct_prompt(self, prompt: str, role: str):
         return {
             "role": role,
             "content": prompt
         }
+
+    async def close(self):
+        await self.http_client.aclose()
     
 
 
@@ -1,2 +1,4 @@
 from .CohereProvider import CoHereProvider
-from .OpenAIProvider import OpenAIProvider
\ No newline at end of file
+from .OpenAIProvider import OpenAIProvider
+from .LocalProvider import LocalProvider
+from .FakeProvider import FakeProvider
@@ -0,0 +1,87 @@
+from collections import Counter
+from typing import Iterable, List, Tuple
+import math
+import re
+
+
+class BM25Index:
+    """
+    In-memory Okapi BM25 inverted index over record texts, for vector DBs without a
+    lexical index of their own. Records are keyed by their vector DB id.
+    """
+
+    TOKEN_PATTERN = re.compile(r"\w+")
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+
+        # term -> {record id: term frequency}
+        self.postings = {}
+        self.record_terms = {}
+        self.record_lengths = {}
+        self.total_length = 0
+
+    def __len__(self):
+        return len(self.record_lengths)
+
+    @classmethod
+    def tokenize(cls, text: str) -> List[str]:
+        return cls.TOKEN_PATTERN.findall(text.lower()) if text else []
+
+    def add(self, record_id, text: str):
+        if record_id in self.record_lengths:
+            self.remove(record_id)
+
+        terms = Counter(self.tokenize(text))
+        for term, frequency in terms.items():
+            self.postings.setdefault(term, {})[record_id] = frequency
+
+        length = sum(terms.values())
+        self.record_terms[record_id] = tuple(terms)
+        self.record_lengths[record_id] = length
+        self.total_length += length
+
+    def add_many(self, records: Iterable[Tuple[object, str]]):
+        for record_id, text in records:
+            self.add(record_id, text)
+
+    def remove(self, record_id):
+        length = self.record_lengths.pop(record_id, None)
+        if length is None:
+            return False
+
+        self.total_length -= length
+        for term in self.record_terms.pop(record_id):
+            term_postings = self.postings[term]
+            del term_postings[record_id]
+            if not term_postings:
+                del self.postings[term]
+
+        return True
+
+    def search(self, text: str, limit: int = 10, allowed_ids: set = None) -> List[Tuple[object, float]]:
+        """
+        Top records for the query terms as (record id, BM25 score), best first.
+        allowed_ids restricts scoring to a subset of the records, a None limit returns
+        every matching record.
+        """
+        records_count = len(self.record_lengths)
+        if not records_count:
+            return []
+
+        average_length = self.total_length / records_count
+        scores = {}
+        for term in set(self.tokenize(text)):
+            term_postings = self.postings.get(term)
+            if not term_postings:
+                continue
+
+            idf = math.log(1 + (records_count - len(term_postings) + 0.5) / (len(term_postings) + 0.5))
+            for record_id, frequency in term_postings.items():
+                if allowed_ids is not None and record_id not in allowed_ids:
+                    continue
+                norm = self.k1 * (1 - self.b + self.b * self.record_lengths[record_id] / average_length)
+                scores[record_id] = scores.get(record_id, 0.0) + idf * frequency * (self.k1 + 1) / (frequency + norm)
+
+        return sorted(scores.items(), key=lambda pair: pair[1], reverse=True)[:limit]
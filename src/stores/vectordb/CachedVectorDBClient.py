@@ -0,0 +1,362 @@
+from .VectorDBInterface import VectorDBInterface
+from .MetadataFilter import MetadataFilter
+from models.db_schemes import RetrievedDocument
+from models.SearchCacheModel import SearchCacheModel
+from utils.metrics import SEARCH_CACHE_HITS, SEARCH_CACHE_MISSES
+from collections import OrderedDict
+from typing import List
+import numpy as np
+import asyncio
+import hashlib
+import json
+import logging
+import time
+
+
+class CachedVectorDBClient(VectorDBInterface):
+    """
+    Search result cache wrapped around a vector DB client.
+    Results are keyed by (collection, collection version, query hash, limit, filter and
+    search parameters) and looked up in an in-process LRU with a TTL, then in the shared
+    search_cache_entries table when a db_client is given. Every write to a collection bumps
+    its version, so entries cached before the write can no longer be found. With a
+    db_client the versions live in search_cache_versions and writes made by other processes
+    (job workers) invalidate this process's cache as well, after at most version_ttl_seconds
+    for which a version read from the table is reused. Expired shared entries are deleted in
+    the background, at most once per ttl_seconds.
+    """
+
+    def __init__(self, client: VectorDBInterface, db_client: object = None,
+                 lru_size: int = 1000, ttl_seconds: float = 300,
+                 version_ttl_seconds: float = 1):
+        self.client = client
+        self.lru_size = lru_size
+        self.ttl_seconds = ttl_seconds
+        # (collection name, cache key) -> (expiry on the monotonic clock, results)
+        self.lru = OrderedDict()
+        # in-process collection versions, used without a shared backend
+        self.versions = {}
+        self.version_ttl_seconds = version_ttl_seconds
+        # collection name -> (expiry on the monotonic clock, version read from the shared backend)
+        self.shared_versions = {}
+        self.next_cleanup_at = time.monotonic() + ttl_seconds
+        self.cleanup_task = None
+
+        self.search_cache_model = SearchCacheModel(db_client=db_client) if db_client else None
+        self.logger = logging.getLogger(__name__)
+
+    def __getattr__(self, name: str):
+        # expose the wrapped client attributes (default_vector_size, explain_search, ...)
+        if name == "client":
+            raise AttributeError(name)
+        return getattr(self.client, name)
+
+    def lru_get(self, key: tuple):
+        entry = self.lru.get(key)
+        if entry is None:
+            return None
+
+        expires_at, results = entry
+        if expires_at <= time.monotonic():
+            del self.lru[key]
+            return None
+
+        self.lru.move_to_end(key)
+        return results
+
+    def lru_put(self, key: tuple, results: list):
+        self.lru[key] = (time.monotonic() + self.ttl_seconds, results)
+        self.lru.move_to_end(key)
+        while len(self.lru) > self.lru_size:
+            self.lru.popitem(last=False)
+
+    async def get_version(self, collection_name: str):
+        """
+        Current version of the collection, None when it can not be read and the cache is bypassed.
+        """
+        if self.search_cache_model is None:
+            return self.versions.get(collection_name, 0)
+
+        entry = self.shared_versions.get(collection_name)
+        if entry is not None and entry[0] > time.monotonic():
+            return entry[1]
+
+        try:
+            version = await self.search_cache_model.get_version(collection_name=collection_name)
+        except Exception as e:
+            self.logger.warning(f"Search cache version lookup failed: {e}")
+            return None
+
+        self.shared_versions[collection_name] = (time.monotonic() + self.version_ttl_seconds, version)
+        return version
+
+    async def bump_version(self, collection_name: str):
+        """
+        Invalidate every cached search of the collection.
+        """
+        self.versions[collection_name] = self.versions.get(collection_name, 0) + 1
+        for key in [key for key in self.lru if key[0] == collection_name]:
+            del self.lru[key]
+
+        if self.search_cache_model is not None:
+            self.shared_versions.pop(collection_name, None)
+            try:
+                version = await self.search_cache_model.bump_version(collection_name=collection_name)
+            except Exception as e:
+                self.logger.error(f"Search cache invalidation of {collection_name} failed: {e}")
+                return
+
+            # this process sees its own writes right away
+            self.shared_versions[collection_name] = (time.monotonic() + self.version_ttl_seconds, version)
+
+    async def delete_expired_entries(self):
+        try:
+            await self.search_cache_model.delete_expired_entries()
+        except Exception as e:
+            self.logger.warning(f"Search cache cleanup failed: {e}")
+
+    def schedule_cleanup(self):
+        """
+        Start deleting expired shared entries in the background once per ttl_seconds,
+        so neither searches nor collection writes wait for it.
+        """
+        now = time.monotonic()
+        if now < self.next_cleanup_at or (self.cleanup_task is not None and not self.cleanup_task.done()):
+            return
+
+        self.next_cleanup_at = now + self.ttl_seconds
+        self.cleanup_task = asyncio.create_task(self.delete_expired_entries())
+
+    def build_key(self, collection_name: str, version: int, query_hash: str, **params):
+        """
+        Cache key of one search, a sha256 over everything that affects its results.
+        """
+        metadata_filter = params.pop("metadata_filter", None)
+        params["metadata_filter"] = metadata_filter.root if metadata_filter is not None else None
+
+        key = json.dumps([collection_name, version, query_hash, params], sort_keys=True, default=str)
+        return collection_name, hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+    def hash_vector(self, vector: list):
+        return "vector:" + hashlib.sha256(np.asarray(vector, dtype=np.float32).tobytes()).hexdigest()
+
+    def hash_text(self, text: str):
+        return "text:" + hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+    def to_results(self, documents: List[RetrievedDocument]):
+        return [{"text": doc.text, "score": doc.score, "record_id": doc.record_id} for doc in documents]
+
+    def to_documents(self, results: list):
+        return [RetrievedDocument(**result) for result in results]
+
+    async def lookup(self, keys: List[tuple]):
+        """
+        Resolve cache keys from the in-process tier, then the shared tier.
+        Returns a dict of key -> results for the keys that were found.
+        """
+        found = {}
+        for key in keys:
+            results = self.lru_get(key)
+            if results is not None:
+                found[key] = results
+
+        SEARCH_CACHE_HITS.labels(tier="memory").inc(len(found))
+
+        missing_keys = [key for key in keys if key not in found]
+        if len(missing_keys) and self.search_cache_model is not None:
+            try:
+                stored = await self.search_cache_model.get_entries(
+                    cache_keys=[cache_key for _, cache_key in missing_keys]
+                )
+            except Exception as e:
+                self.logger.warning(f"Search cache lookup failed: {e}")
+                stored = {}
+
+            for key in missing_keys:
+                results = stored.get(key[1])
+                if results is not None:
+                    self.lru_put(key, results)
+                    found[key] = results
+
+            SEARCH_CACHE_HITS.labels(tier="shared").inc(len(stored))
+
+        SEARCH_CACHE_MISSES.inc(len(keys) - len(found))
+        return found
+
+    async def store(self, collection_name: str, entries: dict):
+        """
+        Cache results given as a dict of key -> results in both tiers.
+        """
+        for key, results in entries.items():
+            self.lru_put(key, results)
+
+        if self.search_cache_model is not None:
+            try:
+                await self.search_cache_model.insert_entries(
+                    collection_name=collection_name,
+                    entries={cache_key: results for (_, cache_key), results in entries.items()},
+                    ttl_seconds=self.ttl_seconds
+                )
+            except Exception as e:
+                self.logger.warning(f"Search cache write failed: {e}")
+
+            self.schedule_cleanup()
+
+    async def cached_search(self, collection_name: str, query_hash: str, search, **params):
+        version = await self.get_version(collection_name=collection_name)
+        if version is None:
+            return await search()
+
+        key = self.build_key(collection_name, version, query_hash, **params)
+        found = await self.lookup(keys=[key])
+        if key in found:
+            return self.to_documents(found[key])
+
+        documents = await search()
+        # failed searches (False / None) are not cached
+        if isinstance(documents, list):
+            await self.store(collection_name=collection_name, entries={key: self.to_results(documents)})
+
+        return documents
+
+    async def connect(self):
+        return await self.client.connect()
+
+    async def disconnect(self):
+        return await self.client.disconnect()
+
+    async def is_collection_exists(self, collection_name: str) -> bool:
+        return await self.client.is_collection_exists(collection_name=collection_name)
+
+    async def list_all_collections(self) -> List:
+        return await self.client.list_all_collections()
+
+    async def get_collection_info(self, collection_name: str) -> dict:
+        return await self.client.get_collection_info(collection_name=collection_name)
+
+    async def begin_bulk_load(self, collection_name: str, expected_rows: int = None):
+        return await self.client.begin_bulk_load(collection_name=collection_name, expected_rows=expected_rows)
+
+    async def end_bulk_load(self, collection_name: str):
+        return await self.client.end_bulk_load(collection_name=collection_name)
+
+    async def get_index_build_progress(self, collection_name: str) -> dict:
+        return await self.client.get_index_build_progress(collection_name=collection_name)
+
+    async def delete_collection(self, collection_name: str):
+        try:
+            return await self.client.delete_collection(collection_name=collection_name)
+        finally:
+            await self.bump_version(collection_name=collection_name)
+
+    async def create_collection(self, collection_name: str,
+                                embedding_size: int,
+                                do_reset: bool = False):
+        try:
+            return await self.client.create_collection(collection_name=collection_name,
+                                                       embedding_size=embedding_size,
+                                                       do_reset=do_reset)
+        finally:
+            if do_reset:
+                await self.bump_version(collection_name=collection_name)
+
+    async def insert_one(self, collection_name: str, text: str, vector: list,
+                         metadata: dict = None,
+                         record_id: str = None):
+        try:
+            return await self.client.insert_one(collection_name=collection_name, text=text, vector=vector,
+                                                metadata=metadata, record_id=record_id)
+        finally:
+            await self.bump_version(collection_name=collection_name)
+
+    async def insert_many(self, collection_name: str, texts: list,
+                          vectors: list, metadata: list = None,
+                          record_ids: list = None, batch_size: int = 50,
+                          use_copy: bool = False):
+        try:
+            return await self.client.insert_many(collection_name=collection_name, texts=texts,
+                                                 vectors=vectors, metadata=metadata,
+                                                 record_ids=record_ids, batch_size=batch_size,
+                                                 use_copy=use_copy)
+        finally:
+            await self.bump_version(collection_name=collection_name)
+
+    async def delete_by_record_ids(self, collection_name: str, record_ids: list):
+        try:
+            return await self.client.delete_by_record_ids(collection_name=collection_name,
+                                                          record_ids=record_ids)
+        finally:
+            await self.bump_version(collection_name=collection_name)
+
+    async def search_by_vector(self, collection_name: str, vector: list, limit: int = 10,
+                               ef_search: int = None, iterative_scan: str = None,
+                               metadata_filter: MetadataFilter = None) -> List[RetrievedDocument]:
+
+        async def search():
+            return await self.client.search_by_vector(collection_name=collection_name, vector=vector,
+                                                      limit=limit, ef_search=ef_search,
+                                                      iterative_scan=iterative_scan,
+                                                      metadata_filter=metadata_filter)
+
+        return await self.cached_search(
+            collection_name, self.hash_vector(vector), search,
+            limit=limit, ef_search=ef_search, iterative_scan=iterative_scan,
+            metadata_filter=metadata_filter
+        )
+
+    async def search_by_text(self, collection_name: str, text: str, limit: int = 10,
+                             metadata_filter: MetadataFilter = None) -> List[RetrievedDocument]:
+
+        async def search():
+            return await self.client.search_by_text(collection_name=collection_name, text=text,
+                                                    limit=limit, metadata_filter=metadata_filter)
+
+        return await self.cached_search(
+            collection_name, self.hash_text(text), search,
+            limit=limit, metadata_filter=metadata_filter
+        )
+
+    async def search_by_vectors(self, collection_name: str, vectors: list, limit: int = 10,
+                                ef_search: int = None, iterative_scan: str = None,
+                                metadata_filter: MetadataFilter = None) -> List[List[RetrievedDocument]]:
+        """
+        Batch search, only the vectors missing from the cache are sent to the wrapped client.
+        """
+        version = await self.get_version(collection_name=collection_name)
+        if version is None:
+            return await self.client.search_by_vectors(collection_name=collection_name, vectors=vectors,
+                                                       limit=limit, ef_search=ef_search,
+                                                       iterative_scan=iterative_scan,
+                                                       metadata_filter=metadata_filter)
+
+        keys = [
+            self.build_key(collection_name, version, self.hash_vector(vector),
+                           limit=limit, ef_search=ef_search, iterative_scan=iterative_scan,
+                           metadata_filter=metadata_filter)
+            for vector in vectors
+        ]
+        found = await self.lookup(keys=list(dict.fromkeys(keys)))
+
+        # one search per distinct missing query
+        missing = {}
+        for i, key in enumerate(keys):
+            if key not in found and key not in missing:
+                missing[key] = i
+
+        if len(missing):
+            results = await self.client.search_by_vectors(collection_name=collection_name,
+                                                          vectors=[vectors[i] for i in missing.values()],
+                                                          limit=limit, ef_search=ef_search,
+                                                          iterative_scan=iterative_scan,
+                                                          metadata_filter=metadata_filter)
+            if not isinstance(results, list):
+                return results
+
+            entries = {
+                key: self.to_results(documents if documents else [])
+                for key, documents in zip(missing, results)
+            }
+            await self.store(collection_name=collection_name, entries=entries)
+            found.update(entries)
+
+        return [self.to_documents(found[key]) for key in keys]
@@ -0,0 +1,52 @@
+import time
+
+
+class CollectionRegistry:
+    """
+    Process-local cache of collection catalog facts: dimension, vector index state, an
+    approximate row count and whether a bulk load is running. Providers consult it instead of querying the catalog on every
+    call, keep it current on their own writes and refresh entries from the catalog once
+    they are older than ttl_seconds, which bounds how long changes made by other
+    processes can go unnoticed. Missing collections are never cached.
+    """
+
+    def __init__(self, ttl_seconds: float = 60):
+        self.ttl_seconds = ttl_seconds
+        # collection name -> state dict
+        self.entries = {}
+
+    def get(self, collection_name: str):
+        """
+        Cached state of the collection, None when unknown or due for a refresh.
+        """
+        state = self.entries.get(collection_name)
+        if state is None or time.monotonic() - state["refreshed_at"] > self.ttl_seconds:
+            return None
+        return state
+
+    def put(self, collection_name: str, dimension: int = None,
+            has_vector_index: bool = False, approx_rows: int = 0, bulk_load: bool = False):
+        state = {
+            "dimension": dimension,
+            "has_vector_index": has_vector_index,
+            "approx_rows": max(int(approx_rows), 0),
+            "bulk_load": bulk_load,
+            "refreshed_at": time.monotonic(),
+        }
+        self.entries[collection_name] = state
+        return state
+
+    def update(self, collection_name: str, **fields):
+        state = self.entries.get(collection_name)
+        if state is not None:
+            state.update(fields)
+        return state
+
+    def add_rows(self, collection_name: str, count: int):
+        state = self.entries.get(collection_name)
+        if state is not None:
+            state["approx_rows"] = max(state["approx_rows"] + int(count), 0)
+        return state
+
+    def remove(self, collection_name: str):
+        return self.entries.pop(collection_name, None)
@@ -0,0 +1,98 @@
+from typing import Any, List
+import re
+
+
+class MetadataFilter:
+    """
+    Filter expression over chunk metadata, shared by the vector DB providers.
+    Written as a Mongo-like dict:
+        {"asset_id": 3}                               equality
+        {"page_start": {"$gte": 2, "$lt": 10}}        $eq $ne $gt $gte $lt $lte $in $nin $exists
+        {"$or": [{"asset_id": 3}, {"asset_id": 4}]}   $and / $or over sub-filters
+    Sibling keys are AND-ed. Field names may be dotted paths into nested metadata.
+    Equality also matches a list field holding the value, like the asset_id list of a
+    chunk shared by several assets.
+    The parsed tree is made of ("and" | "or", [nodes]) and ("cond", path, operator, value).
+    """
+
+    FIELD_PATTERN = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*(\.[A-Za-z0-9_]+)*$")
+    COMPARISON_OPERATORS = {"$eq", "$ne", "$gt", "$gte", "$lt", "$lte", "$in", "$nin", "$exists"}
+    RANGE_OPERATORS = {"$gt", "$gte", "$lt", "$lte"}
+    MAX_DEPTH = 8
+    MAX_CONDITIONS = 64
+
+    def __init__(self, root: tuple):
+        self.root = root
+
+    @classmethod
+    def from_dict(cls, expression: dict):
+        """
+        Parse and validate a filter dict, raises ValueError on a malformed expression.
+        Returns None for an empty filter.
+        """
+        if not expression:
+            return None
+
+        conditions_count = [0]
+        root = cls.parse_node(expression=expression, depth=0, conditions_count=conditions_count)
+        return cls(root=root)
+
+    @classmethod
+    def parse_node(cls, expression: Any, depth: int, conditions_count: list):
+        if depth > cls.MAX_DEPTH:
+            raise ValueError("Filter is nested too deeply.")
+        if not isinstance(expression, dict) or not expression:
+            raise ValueError("Filter must be a non-empty object.")
+
+        nodes = []
+        for key, value in expression.items():
+            if key in ("$and", "$or"):
+                if not isinstance(value, list) or not value:
+                    raise ValueError(f"{key} expects a non-empty list of filters.")
+                nodes.append((key[1:], [
+                    cls.parse_node(expression=sub_expression, depth=depth + 1, conditions_count=conditions_count)
+                    for sub_expression in value
+                ]))
+                continue
+
+            if not cls.FIELD_PATTERN.match(key):
+                raise ValueError(f"Invalid filter field: {key}")
+
+            path = key.split(".")
+            operators = value if isinstance(value, dict) else {"$eq": value}
+            if not operators:
+                raise ValueError(f"Empty condition for field: {key}")
+
+            for operator, operand in operators.items():
+                nodes.append(cls.parse_condition(path=path, operator=operator, operand=operand))
+                conditions_count[0] += 1
+                if conditions_count[0] > cls.MAX_CONDITIONS:
+                    raise ValueError("Filter has too many conditions.")
+
+        return nodes[0] if len(nodes) == 1 else ("and", nodes)
+
+    @classmethod
+    def parse_condition(cls, path: List[str], operator: str, operand: Any):
+        field = ".".join(path)
+        if operator not in cls.COMPARISON_OPERATORS:
+            raise ValueError(f"Unsupported filter operator {operator} for field: {field}")
+
+        if operator in ("$in", "$nin"):
+            if not isinstance(operand, list) or not operand:
+                raise ValueError(f"{operator} expects a non-empty list for field: {field}")
+            if not all(cls.is_scalar(v) for v in operand):
+                raise ValueError(f"{operator} expects scalar values for field: {field}")
+        elif operator in cls.RANGE_OPERATORS:
+            if isinstance(operand, bool) or not isinstance(operand, (int, float)):
+                raise ValueError(f"{operator} expects a number for field: {field}")
+        elif operator == "$exists":
+            if not isinstance(operand, bool):
+                raise ValueError(f"$exists expects true or false for field: {field}")
+        elif not cls.is_scalar(operand):
+            raise ValueError(f"{operator} expects a scalar value for field: {field}")
+
+        return ("cond", path, operator, operand)
+
+    @staticmethod
+    def is_scalar(value: Any):
+        return value is None or isinstance(value, (str, int, float, bool))
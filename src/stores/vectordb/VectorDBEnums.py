@@ -14,11 +14,28 @@ class PgVectorTableSchemeEnums(Enum):
     VECTOR = "vector"
     CHUNK_ID = "chunk_id"
     METADATA = "metadata"
+    TEXT_SEARCH = "text_search"
     _PREFIX = "pgvector"
+    _BULK_LOAD_COMMENT = "bulk_load"
+    _BULK_LOAD_LOCK_CLASS = 53907
     
 class PgVectorDistanceMethodEnums(Enum):
     COSINE = "vector_cosine_ops"
-    DOT = "vector_l2_ops"
+    DOT = "vector_ip_ops"
+
+class PgVectorDistanceOperatorEnums(Enum):
+    COSINE = "<=>"
+    DOT = "<#>"
+
+class PgVectorIterativeScanEnums(Enum):
+    OFF = "off"
+    STRICT_ORDER = "strict_order"
+    RELAXED_ORDER = "relaxed_order"
+
+class SearchModeEnums(Enum):
+    VECTOR = "vector"
+    LEXICAL = "lexical"
+    HYBRID = "hybrid"
 
 class PgVectorIndexTypeEnums(Enum):
     IVFFLAT = "ivfflat"
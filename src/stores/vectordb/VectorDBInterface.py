@@ -1,6 +1,8 @@
 from abc import ABC, abstractmethod
+import asyncio
 from typing import List
 from models.db_schemes import RetrievedDocument
+from .MetadataFilter import MetadataFilter
 
 class VectorDBInterface(ABC):
     """
@@ -73,16 +75,72 @@ class VectorDBInterface(ABC):
     @abstractmethod
     def insert_many(self, collection_name: str, texts: list,
                         vectors: list, metadata: list = None,
-                        record_ids: list = None, batch_size: int = 50):
+                        record_ids: list = None, batch_size: int = 50,
+                        use_copy: bool = False):
         """
         Insert many records into the VectorDB.
+        use_copy selects a bulk-copy write path where the VectorDB has one.
         """
         pass
     
     @abstractmethod
-    def search_by_vector(self, collection_name: str, vector: list, limit: int = 10) -> List[RetrievedDocument]:
+    def delete_by_record_ids(self, collection_name: str, record_ids: list):
+        """
+        Delete the records with the given ids from the VectorDB collection.
+        """
+        pass
+    
+    @abstractmethod
+    def search_by_vector(self, collection_name: str, vector: list, limit: int = 10,
+                         ef_search: int = None, iterative_scan: str = None,
+                         metadata_filter: MetadataFilter = None) -> List[RetrievedDocument]:
         """
         Search for records in the VectorDB by vector similarity.
+        ef_search and iterative_scan tune the HNSW traversal for this call only.
+        metadata_filter restricts the search to records whose metadata matches it.
+        """
+        pass
+
+    async def search_by_vectors(self, collection_name: str, vectors: list, limit: int = 10,
+                                ef_search: int = None, iterative_scan: str = None,
+                                metadata_filter: MetadataFilter = None) -> List[List[RetrievedDocument]]:
+        """
+        Search for many query vectors at once, returning one result list per vector.
+        VectorDBs with a batch query path override this, the default runs the searches concurrently.
+        """
+        results = await asyncio.gather(*[
+            self.search_by_vector(collection_name=collection_name, vector=vector, limit=limit,
+                                  ef_search=ef_search, iterative_scan=iterative_scan,
+                                  metadata_filter=metadata_filter)
+            for vector in vectors
+        ])
+        return [documents if documents else [] for documents in results]
+
+    @abstractmethod
+    def search_by_text(self, collection_name: str, text: str, limit: int = 10,
+                       metadata_filter: MetadataFilter = None) -> List[RetrievedDocument]:
+        """
+        Search for records in the VectorDB by lexical (full text) relevance to text.
+        metadata_filter restricts the search to records whose metadata matches it.
         """
         pass
-    
\ No newline at end of file
+
+    async def begin_bulk_load(self, collection_name: str, expected_rows: int = None):
+        """
+        Prepare a collection for a load of about expected_rows records, e.g. by deferring
+        index maintenance. Returns whether anything was deferred, end_bulk_load only
+        needs to be called when it was.
+        """
+        return False
+
+    async def end_bulk_load(self, collection_name: str):
+        """
+        Finish a bulk load started with begin_bulk_load and build any deferred index.
+        """
+        return False
+
+    async def get_index_build_progress(self, collection_name: str) -> dict:
+        """
+        Get the progress of a running index build, if the VectorDB exposes one.
+        """
+        return None
@@ -24,7 +24,11 @@ class VectorDBProviderFactory:
                 db_client=qdrant_db_client,
                 default_vector_size=self.config.EMBEDDING_MODEL_SIZE,
                 distance_method=self.config.VECTOR_DB_DISTANCE_METHOD,
-                index_treshold=self.config.VECTOR_DB_PGVEV_INDEX_THRESHOLD
+                index_treshold=self.config.VECTOR_DB_PGVEV_INDEX_THRESHOLD,
+                default_ef_search=self.config.VECTOR_DB_HNSW_EF_SEARCH,
+                metadata_index_fields=self.config.VECTOR_DB_METADATA_INDEX_FIELDS,
+                bulk_load_min_fraction=self.config.INDEXING_BULK_LOAD_MIN_FRACTION,
+                bm25_index_ttl_seconds=self.config.VECTOR_DB_BM25_INDEX_TTL_SECONDS
             )
             
         if provider == VectorDBEnums.PGVECTOR.value:
@@ -32,7 +36,15 @@ class VectorDBProviderFactory:
                 db_client=self.db_client,
                 default_vector_size=self.config.EMBEDDING_MODEL_SIZE,
                 distance_method=self.config.VECTOR_DB_DISTANCE_METHOD,
-                index_treshold=self.config.VECTOR_DB_PGVEV_INDEX_THRESHOLD
+                index_treshold=self.config.VECTOR_DB_PGVEV_INDEX_THRESHOLD,
+                default_ef_search=self.config.VECTOR_DB_HNSW_EF_SEARCH,
+                default_iterative_scan=self.config.VECTOR_DB_HNSW_ITERATIVE_SCAN,
+                filtered_iterative_scan=self.config.VECTOR_DB_HNSW_FILTERED_ITERATIVE_SCAN,
+                text_search_config=self.config.VECTOR_DB_PGVEC_TEXT_SEARCH_CONFIG,
+                maintenance_work_mem=self.config.VECTOR_DB_PGVEC_MAINTENANCE_WORK_MEM,
+                max_parallel_maintenance_workers=self.config.VECTOR_DB_PGVEC_MAX_PARALLEL_MAINTENANCE_WORKERS,
+                collection_registry_ttl_seconds=self.config.VECTOR_DB_PGVEC_COLLECTION_REGISTRY_TTL_SECONDS,
+                bulk_load_min_fraction=self.config.INDEXING_BULK_LOAD_MIN_FRACTION
             )
        
         return None  
\ No newline at end of file
@@ -1,31 +1,69 @@
 from ..VectorDBInterface import VectorDBInterface
 from ..VectorDBEnums import (DistanceMethodEnums, PgVectorTableSchemeEnums,
-                             PgVectorDistanceMethodEnums, PgVectorIndexTypeEnums)
+                             PgVectorDistanceMethodEnums, PgVectorIndexTypeEnums,
+                             PgVectorDistanceOperatorEnums, PgVectorIterativeScanEnums)
 import logging
 from typing import List
 from models.db_schemes import RetrievedDocument 
+from ..MetadataFilter import MetadataFilter
+from ..CollectionRegistry import CollectionRegistry
 from sqlalchemy.sql import text as sql_text
+from sqlalchemy import event
+from pgvector.asyncpg import register_vector
+import numpy as np
 import json
 
 class PGVectorProvider(VectorDBInterface):
     
     def __init__(self, db_client: str, default_vector_size: int = 786,
-                 distance_method: str = None, index_treshold: int = 100):
+                 distance_method: str = None, index_treshold: int = 100,
+                 default_ef_search: int = None, default_iterative_scan: str = None,
+                 filtered_iterative_scan: str = None, text_search_config: str = "simple",
+                 maintenance_work_mem: str = None, max_parallel_maintenance_workers: int = None,
+                 collection_registry_ttl_seconds: float = 60,
+                 bulk_load_min_fraction: float = 0.3):
 
         self.db_client = db_client
         self.default_vector_size = default_vector_size
         self.index_treshold = index_treshold
+        self.default_ef_search = default_ef_search
+        self.default_iterative_scan = default_iterative_scan
+        self.filtered_iterative_scan = filtered_iterative_scan
+        # regconfig of the generated tsvector column, fixed when the column is created
+        self.text_search_config = text_search_config if text_search_config else "simple"
+        self.maintenance_work_mem = maintenance_work_mem
+        self.max_parallel_maintenance_workers = max_parallel_maintenance_workers
         
-        if distance_method == DistanceMethodEnums.COSINE.value:
-            distance_method = PgVectorDistanceMethodEnums.COSINE.value
-        elif distance_method == DistanceMethodEnums.DOT.value:
+        # a load defers the vector index only when it brings at least this fraction of the rows
+        self.bulk_load_min_fraction = bulk_load_min_fraction
+        # collection name -> connection holding the advisory lock of a running bulk load
+        self.bulk_load_connections = {}
+        self.bulk_load_lock_sql = lambda function_name: (
+            f"SELECT {function_name}({PgVectorTableSchemeEnums._BULK_LOAD_LOCK_CLASS.value}, hashtext(:collection_name))"
+        )
+
+        # cached existence, dimension, index state and row estimate of the collection tables
+        self.collection_registry = CollectionRegistry(ttl_seconds=collection_registry_ttl_seconds)
+        
+        # the ORDER BY operator has to match the index operator class, or the index is skipped
+        vector_column = PgVectorTableSchemeEnums.VECTOR.value
+        if distance_method == DistanceMethodEnums.DOT.value:
             distance_method = PgVectorDistanceMethodEnums.DOT.value
+            self.distance_operator = PgVectorDistanceOperatorEnums.DOT.value
+            self.score_expression = lambda vector_sql: f"({vector_column} {self.distance_operator} {vector_sql}) * -1"
+        else:
+            distance_method = PgVectorDistanceMethodEnums.COSINE.value
+            self.distance_operator = PgVectorDistanceOperatorEnums.COSINE.value
+            self.score_expression = lambda vector_sql: f"1 - ({vector_column} {self.distance_operator} {vector_sql})"
 
         self.pgvector_table_prefix = PgVectorTableSchemeEnums._PREFIX.value
         self.distance_method = distance_method
 
         self.logger = logging.getLogger("uvicorn")
         self.default_index_name = lambda collection_name: f"{collection_name}_vector_idx"
+        self.metadata_index_name = lambda collection_name: f"{collection_name}_metadata_idx"
+        self.text_search_index_name = lambda collection_name: f"{collection_name}_text_search_idx"
+        self.chunk_id_index_name = lambda collection_name: f"{collection_name}_chunk_id_idx"
 
 
     async def connect(self):
@@ -48,6 +86,25 @@ class PGVectorProvider(VectorDBInterface):
                 # If extension already exists or any other error, just log and continue
                 self.logger.warning(f"Vector extension setup: {str(e)}")
                 await session.rollback()
+
+        await self.register_vector_codec()
+
+    async def register_vector_codec(self):
+        """
+        Register pgvector's binary asyncpg codec on every pooled connection,
+        so vectors travel as float32 arrays instead of formatted strings.
+        """
+        engine = self.db_client.kw.get("bind")
+        if engine is None:
+            self.logger.warning("Can not register the vector codec without a bound engine.")
+            return
+
+        @event.listens_for(engine.sync_engine, "connect")
+        def on_connect(dbapi_connection, connection_record):
+            dbapi_connection.run_async(register_vector)
+
+        # drop the connections opened before the extension existed
+        await engine.dispose()
             
     async def disconnect(self):
         """
@@ -57,16 +114,85 @@ class PGVectorProvider(VectorDBInterface):
     
     async def is_collection_exists(self, collection_name: str) -> bool:
         """
-        Check if a collection exists in the PGVector database.
+        Check if a collection exists in the PGVector database, served by the collection registry.
+        """
+        return await self.get_collection_state(collection_name=collection_name) is not None
+
+    async def get_collection_state(self, collection_name: str):
+        """
+        Registry state of the collection, loaded from the catalog when missing or stale.
+        None if the collection does not exist.
+        """
+        state = self.collection_registry.get(collection_name)
+        if state is None:
+            state = await self.load_collection_state(collection_name=collection_name)
+        return state
+
+    def is_undefined_table_error(self, error: Exception) -> bool:
+        """
+        Whether the error, as raised by asyncpg or wrapped by SQLAlchemy, is Postgres
+        undefined_table (42P01).
+        """
+        for candidate in (error, getattr(error, "orig", None), error.__cause__):
+            if candidate is not None and getattr(candidate, "sqlstate", None) == "42P01":
+                return True
+        return False
+
+    def forget_dropped_collection(self, collection_name: str, missing_return=False):
+        """
+        Drop the registry entry of a collection whose table was dropped by another
+        process while it was still registered here, and return missing_return.
+        """
+        self.logger.warning(f"Collection {collection_name} was dropped by another process.")
+        self.collection_registry.remove(collection_name)
+        return missing_return
+
+    async def load_collection_state(self, collection_name: str):
+        """
+        Read the collection table, vector column dimension, vector index, planner row
+        estimate and whether a bulk load holds its advisory lock in one query. The table
+        is only counted when it has no statistics yet (reltuples = -1).
         """
-        record = None
         async with self.db_client() as session:
             async with session.begin():
-                list_tbl = sql_text(f'SELECT * FROM pg_tables WHERE tablename = :collection_name')
-                results = await session.execute(list_tbl, {"collection_name": collection_name})
-                record = results.scalar_one_or_none()
-                
-            return record
+                state_sql = sql_text('''
+                    SELECT c.reltuples AS reltuples,
+                           (SELECT a.atttypmod FROM pg_attribute a
+                            WHERE a.attrelid = c.oid AND a.attname = :vector_column) AS dimension,
+                           EXISTS (SELECT 1 FROM pg_index i JOIN pg_class ic ON ic.oid = i.indexrelid
+                                   WHERE i.indrelid = c.oid AND ic.relname = :index_name) AS has_vector_index,
+                           EXISTS (SELECT 1 FROM pg_locks l
+                                   WHERE l.locktype = 'advisory' AND l.granted AND l.objsubid = 2
+                                     AND l.database = (SELECT oid FROM pg_database WHERE datname = current_database())
+                                     AND l.classid = CAST(:lock_class AS oid)
+                                     AND l.objid = CAST(hashtext(:collection_name) AS oid)) AS bulk_load
+                    FROM pg_class c
+                    WHERE c.relname = :collection_name AND c.relkind IN ('r', 'p')
+                ''')
+                result = await session.execute(state_sql, {
+                    "collection_name": collection_name,
+                    "vector_column": PgVectorTableSchemeEnums.VECTOR.value,
+                    "index_name": self.default_index_name(collection_name),
+                    "lock_class": PgVectorTableSchemeEnums._BULK_LOAD_LOCK_CLASS.value,
+                })
+                record = result.fetchone()
+
+                if record is None:
+                    self.collection_registry.remove(collection_name)
+                    return None
+
+                approx_rows = record.reltuples
+                if approx_rows < 0:
+                    count_sql = sql_text(f'SELECT COUNT(*) FROM {collection_name}')
+                    approx_rows = (await session.execute(count_sql)).scalar_one()
+
+        return self.collection_registry.put(
+            collection_name,
+            dimension=record.dimension if record.dimension and record.dimension > 0 else None,
+            has_vector_index=record.has_vector_index,
+            approx_rows=approx_rows,
+            bulk_load=record.bulk_load
+        )
 
     async def list_all_collections(self) -> List[str]:
         """
@@ -122,10 +248,68 @@ class PGVectorProvider(VectorDBInterface):
                 drop_table = sql_text(f"DROP TABLE IF EXISTS {collection_name} CASCADE")
                 await session.execute(drop_table)
                 await session.commit()
-            
+
+        self.collection_registry.remove(collection_name)
         return True
     
 
+    async def delete_by_record_ids(self, collection_name: str, record_ids: list):
+        """
+        Delete the vectors of the given chunk ids from the PGVector collection.
+        """
+        if not record_ids or not await self.is_collection_exists(collection_name):
+            return 0
+        
+        try:
+            async with self.db_client() as session:
+                async with session.begin():
+                    delete_sql = sql_text(
+                        f"DELETE FROM {collection_name} "
+                        f"WHERE {PgVectorTableSchemeEnums.CHUNK_ID.value} = ANY(:record_ids)"
+                    )
+                    result = await session.execute(delete_sql, {"record_ids": list(record_ids)})
+        except Exception as e:
+            if not self.is_undefined_table_error(e):
+                raise
+            return self.forget_dropped_collection(collection_name, missing_return=0)
+
+        self.collection_registry.add_rows(collection_name, -result.rowcount)
+        return result.rowcount
+    
+    async def delete_existing_records(self, session, collection_name: str, record_ids: list):
+        """
+        Delete, within the caller's transaction, the rows of chunks about to be written
+        again, so re-pushing a chunk replaces its vector instead of duplicating it.
+        """
+        record_ids = [record_id for record_id in record_ids if record_id is not None]
+        if not record_ids:
+            return 0
+
+        delete_sql = sql_text(
+            f"DELETE FROM {collection_name} "
+            f"WHERE {PgVectorTableSchemeEnums.CHUNK_ID.value} = ANY(:record_ids)"
+        )
+        result = await session.execute(delete_sql, {"record_ids": record_ids})
+        self.collection_registry.add_rows(collection_name, -result.rowcount)
+        return result.rowcount
+
+    async def lock_existing_chunks(self, session, record_ids: list):
+        """
+        Positions of the record ids whose chunk still exists, with the chunk rows locked
+        FOR KEY SHARE until the caller's transaction ends. A chunk deleted by a re-process
+        of its asset is skipped instead of failing the whole write on the foreign key,
+        and none can be deleted between this check and the insert.
+        """
+        result = await session.execute(sql_text(
+            "SELECT chunk_id FROM chunks WHERE chunk_id = ANY(:record_ids) FOR KEY SHARE"
+        ), {"record_ids": [record_id for record_id in record_ids if record_id is not None]})
+        existing_ids = {row[0] for row in result.fetchall()}
+
+        positions = [i for i, record_id in enumerate(record_ids) if record_id in existing_ids]
+        if len(positions) < len(record_ids):
+            self.logger.warning(f"Skipping {len(record_ids) - len(positions)} vectors of deleted chunks.")
+        return positions
+
     async def create_collection(self, collection_name: str, 
                                 embedding_size: int,
                                 do_reset: bool = False):
@@ -135,7 +319,8 @@ class PGVectorProvider(VectorDBInterface):
         if do_reset:
            _ = await self.delete_collection(collection_name)
         
-        is_collection_exists = await self.is_collection_exists(collection_name)
+        # read from the catalog, the table may have been dropped by another process
+        is_collection_exists = await self.load_collection_state(collection_name=collection_name)
         if not is_collection_exists:
             self.logger.info(f"Creating collection {collection_name}.")
             
@@ -148,16 +333,86 @@ class PGVectorProvider(VectorDBInterface):
                         {PgVectorTableSchemeEnums.VECTOR.value} vector({embedding_size}),
                         {PgVectorTableSchemeEnums.METADATA.value} JSONB DEFAULT '{{}}',
                         {PgVectorTableSchemeEnums.CHUNK_ID.value} integer,
+                        {PgVectorTableSchemeEnums.TEXT_SEARCH.value} tsvector GENERATED ALWAYS AS ({self.get_tsvector_expression()}) STORED,
                         FOREIGN KEY ({PgVectorTableSchemeEnums.CHUNK_ID.value}) REFERENCES chunks(chunk_id) 
                     )
                 ''')
                 await session.execute(create_table_sql)
                 await session.commit()
-        
+
+            self.collection_registry.put(collection_name, dimension=embedding_size)
+            await self.create_chunk_id_index(collection_name=collection_name)
+            await self.create_metadata_index(collection_name=collection_name)
+            await self.create_text_search_index(collection_name=collection_name)
             return True
         
+        # collections created before these indexes get them here
+        await self.create_chunk_id_index(collection_name=collection_name)
+        await self.create_metadata_index(collection_name=collection_name)
+        await self.create_text_search_index(collection_name=collection_name)
         return False
-    
+
+    async def create_chunk_id_index(self, collection_name: str):
+        """
+        Create the B-tree index serving the lookups and deletes of rows by chunk id.
+        """
+        async with self.db_client() as session:
+            async with session.begin():
+                create_index_sql = sql_text(f'''
+                    CREATE INDEX IF NOT EXISTS {self.chunk_id_index_name(collection_name)}
+                    ON {collection_name} ({PgVectorTableSchemeEnums.CHUNK_ID.value})
+                ''')
+                await session.execute(create_index_sql)
+
+        return True
+
+    async def create_metadata_index(self, collection_name: str):
+        """
+        Create the GIN index serving metadata containment (@>) filters.
+        """
+        async with self.db_client() as session:
+            async with session.begin():
+                create_index_sql = sql_text(f'''
+                    CREATE INDEX IF NOT EXISTS {self.metadata_index_name(collection_name)}
+                    ON {collection_name} USING gin ({PgVectorTableSchemeEnums.METADATA.value} jsonb_path_ops)
+                ''')
+                await session.execute(create_index_sql)
+
+        return True
+
+    def get_tsvector_expression(self):
+        return f"to_tsvector('{self.text_search_config}', coalesce({PgVectorTableSchemeEnums.TEXT.value}, ''))"
+
+    async def create_text_search_index(self, collection_name: str):
+        """
+        Add the generated tsvector column, if the collection predates it, and its GIN index.
+        """
+        text_search_column = PgVectorTableSchemeEnums.TEXT_SEARCH.value
+
+        async with self.db_client() as session:
+            async with session.begin():
+                column_sql = sql_text(
+                    "SELECT 1 FROM information_schema.columns "
+                    "WHERE table_name = :collection_name AND column_name = :column_name"
+                )
+                result = await session.execute(column_sql, {"collection_name": collection_name,
+                                                            "column_name": text_search_column})
+
+                # adding a stored generated column rewrites the table, so only do it once
+                if not result.scalar_one_or_none():
+                    self.logger.info(f"Adding the text search column to {collection_name}.")
+                    await session.execute(sql_text(f'''
+                        ALTER TABLE {collection_name} ADD COLUMN IF NOT EXISTS {text_search_column}
+                        tsvector GENERATED ALWAYS AS ({self.get_tsvector_expression()}) STORED
+                    '''))
+
+                await session.execute(sql_text(f'''
+                    CREATE INDEX IF NOT EXISTS {self.text_search_index_name(collection_name)}
+                    ON {collection_name} USING gin ({text_search_column})
+                '''))
+
+        return True
+
     async def is_index_exists(self, collection_name: str, index_name: str = None) -> bool:
         """
         Check if an index exists in the PGVector collection.
@@ -183,22 +438,33 @@ class PGVectorProvider(VectorDBInterface):
                            index_type: str = PgVectorIndexTypeEnums.HNSW.value,): 
         """
         Create an index for the PGVector collection.
+        The index state, bulk load flag and row estimate come from the collection
+        registry, so the catalog is only queried when the cached state says an index is
+        due. Nothing is built while the collection is being bulk loaded.
         """
         
-        is_index_exists = await self.is_index_exists(collection_name)
-        if is_index_exists:
+        state = await self.get_collection_state(collection_name=collection_name)
+        if state is None or state["has_vector_index"] or state["bulk_load"] \
+           or state["approx_rows"] < self.index_treshold:
+            return False
+
+        # another process may have built the index or started a bulk load since the
+        # registry entry was loaded
+        state = await self.load_collection_state(collection_name=collection_name)
+        if state is None or state["has_vector_index"] or state["bulk_load"]:
             return False
         
         async with self.db_client() as session:
             async with session.begin():
-                count_sql = sql_text(f'SELECT COUNT(*) FROM {collection_name}')
-                result = await session.execute(count_sql)
-                records_count = result.scalar_one()
+                self.logger.info(f"Start creating index for {collection_name} with type {index_type}.")
                 
-                if records_count < self.index_treshold:
-                    return False
+                if self.maintenance_work_mem:
+                    await session.execute(sql_text("SELECT set_config('maintenance_work_mem', :value, true)"),
+                                          {"value": str(self.maintenance_work_mem)})
                 
-                self.logger.info(f"Start creating index for {collection_name} with type {index_type}.")
+                if self.max_parallel_maintenance_workers is not None:
+                    await session.execute(sql_text("SELECT set_config('max_parallel_maintenance_workers', :value, true)"),
+                                          {"value": str(int(self.max_parallel_maintenance_workers))})
                 
                 index_name = self.default_index_name(collection_name)
                 create_index_sql = sql_text(f'''
@@ -210,11 +476,12 @@ class PGVectorProvider(VectorDBInterface):
 
                 self.logger.info(f"End creating index for {collection_name} with type {index_type}.")
         
+        self.collection_registry.update(collection_name, has_vector_index=True)
+        return True
         
-    async def reset_vector_index(self, collection_name: str,
-                                 index_type: str = PgVectorIndexTypeEnums.HNSW.value):
+    async def drop_vector_index(self, collection_name: str):
         """
-        Reset the vector index for the PGVector collection.
+        Drop the vector index of the PGVector collection.
         """
         index_name = self.default_index_name(collection_name)
 
@@ -223,6 +490,137 @@ class PGVectorProvider(VectorDBInterface):
                 drop_index_sql = sql_text(f'DROP INDEX IF EXISTS {index_name}')
                 await session.execute(drop_index_sql)
 
+        self.collection_registry.update(collection_name, has_vector_index=False)
+        return True
+    
+    async def acquire_bulk_load_lock(self, collection_name: str):
+        """
+        Take the bulk load advisory lock of the collection on a dedicated connection kept
+        out of the pool until release_bulk_load_lock. pg_try_advisory_lock checks and takes
+        the lock in one step, so only one load at a time can defer the index, and Postgres
+        releases it with the connection when the loading process dies.
+        Returns whether the lock was taken.
+        """
+        engine = self.db_client.kw.get("bind")
+        connection = await engine.connect()
+        try:
+            connection = await connection.execution_options(isolation_level="AUTOCOMMIT")
+            result = await connection.execute(sql_text(self.bulk_load_lock_sql("pg_try_advisory_lock")),
+                                              {"collection_name": collection_name})
+            if not result.scalar_one():
+                await connection.close()
+                return False
+
+            # table comment marker of the previous implementation, left behind by a dead load
+            result = await connection.execute(sql_text("SELECT obj_description(CAST(:collection_name AS regclass), 'pg_class')"),
+                                              {"collection_name": collection_name})
+            if result.scalar_one_or_none() == PgVectorTableSchemeEnums._BULK_LOAD_COMMENT.value:
+                await connection.execute(sql_text(f"COMMENT ON TABLE {collection_name} IS NULL"))
+        except BaseException:
+            await connection.invalidate()
+            raise
+
+        self.bulk_load_connections[collection_name] = connection
+        self.collection_registry.update(collection_name, bulk_load=True)
+        return True
+
+    async def release_bulk_load_lock(self, collection_name: str):
+        """
+        Release the bulk load advisory lock taken by this process, returns whether it held it.
+        """
+        connection = self.bulk_load_connections.pop(collection_name, None)
+        if connection is None:
+            return False
+
+        self.collection_registry.update(collection_name, bulk_load=False)
+        try:
+            await connection.execute(sql_text(self.bulk_load_lock_sql("pg_advisory_unlock")),
+                                     {"collection_name": collection_name})
+        except BaseException:
+            # a pooled connection must never keep the lock
+            await connection.invalidate()
+            raise
+
+        await connection.close()
+        return True
+
+    async def begin_bulk_load(self, collection_name: str, expected_rows: int = None):
+        """
+        Drop the vector index and stop maintaining it until end_bulk_load is called,
+        so bulk inserts do not pay the HNSW insertion cost row by row.
+        Only done when the collection is empty or the load brings at least
+        bulk_load_min_fraction of its rows, rebuilding a large index for a small
+        incremental push costs more than inserting into it. A collection left without
+        its index by a load that died is always deferred, so end_bulk_load rebuilds it.
+        Returns whether the index was deferred.
+        """
+        state = await self.load_collection_state(collection_name=collection_name)
+        if state is None or state["bulk_load"]:
+            return False
+
+        if not await self.acquire_bulk_load_lock(collection_name=collection_name):
+            return False
+
+        # the index may have changed while another load held the lock
+        state = await self.load_collection_state(collection_name=collection_name)
+        if state is None:
+            await self.release_bulk_load_lock(collection_name=collection_name)
+            return False
+
+        if state["has_vector_index"] and state["approx_rows"] > 0 and (
+            expected_rows is None or expected_rows < self.bulk_load_min_fraction * state["approx_rows"]
+        ):
+            await self.release_bulk_load_lock(collection_name=collection_name)
+            return False
+
+        _ = await self.drop_vector_index(collection_name=collection_name)
+        return True
+    
+    async def end_bulk_load(self, collection_name: str):
+        """
+        Release the bulk load lock and build the vector index once for everything
+        loaded since begin_bulk_load.
+        """
+        if not await self.release_bulk_load_lock(collection_name=collection_name):
+            return False
+
+        if not await self.is_collection_exists(collection_name=collection_name):
+            return False
+
+        return await self.create_vector_index(collection_name=collection_name)
+    
+    async def get_index_build_progress(self, collection_name: str):
+        """
+        Report the progress of a running vector index build from pg_stat_progress_create_index.
+        """
+        async with self.db_client() as session:
+            progress_sql = sql_text('''
+                SELECT p.phase, p.blocks_total, p.blocks_done, p.tuples_total, p.tuples_done
+                FROM pg_stat_progress_create_index p
+                JOIN pg_class c ON c.oid = p.relid
+                WHERE c.relname = :collection_name
+            ''')
+            result = await session.execute(progress_sql, {"collection_name": collection_name})
+            record = result.fetchone()
+
+        if not record:
+            return None
+
+        return {
+            "phase": record.phase,
+            "blocks_total": record.blocks_total,
+            "blocks_done": record.blocks_done,
+            "tuples_total": record.tuples_total,
+            "tuples_done": record.tuples_done,
+        }
+        
+    async def reset_vector_index(self, collection_name: str,
+                                 index_type: str = PgVectorIndexTypeEnums.HNSW.value):
+        """
+        Reset the vector index for the PGVector collection.
+        """
+        _ = await self.drop_vector_index(collection_name=collection_name)
+
         return await self.create_vector_index(
             collection_name=collection_name,
             index_type=index_type
@@ -243,37 +641,50 @@ class PGVectorProvider(VectorDBInterface):
             self.logger.info(f"Record ID is not provided for insertion into {collection_name}.")
             return False
         
-        async with self.db_client() as session:
-            async with session.begin():
-                insert_sql = sql_text(f'''
-                    INSERT INTO {collection_name} (
-                    {PgVectorTableSchemeEnums.TEXT.value}, 
-                    {PgVectorTableSchemeEnums.VECTOR.value},
-                    {PgVectorTableSchemeEnums.METADATA.value}, 
-                    {PgVectorTableSchemeEnums.CHUNK_ID.value})
-                    VALUES (:text, :vector, :metadata, :chunk_id)
-                ''')
+        try:
+            async with self.db_client() as session:
+                async with session.begin():
+                    _ = await self.delete_existing_records(session, collection_name, [record_id])
+                    if not await self.lock_existing_chunks(session, [record_id]):
+                        return False
+
+                    insert_sql = sql_text(f'''
+                        INSERT INTO {collection_name} (
+                        {PgVectorTableSchemeEnums.TEXT.value}, 
+                        {PgVectorTableSchemeEnums.VECTOR.value},
+                        {PgVectorTableSchemeEnums.METADATA.value}, 
+                        {PgVectorTableSchemeEnums.CHUNK_ID.value})
+                        VALUES (:text, :vector, :metadata, :chunk_id)
+                    ''')
                 
-                metadata_json = json.dumps(metadata, ensure_ascii=False) if metadata is not None else "{}"
+                    metadata_json = json.dumps(metadata, ensure_ascii=False) if metadata is not None else "{}"
 
-                await session.execute(insert_sql, {
-                    "text": text,
-                    "vector": "[" + ",".join([str(v) for v in vector]) + "]",
-                    "metadata": metadata_json,
-                    "chunk_id": record_id
-                })
-                await session.commit()
-        
+                    await session.execute(insert_sql, {
+                        "text": text,
+                        "vector": np.asarray(vector, dtype=np.float32),
+                        "metadata": metadata_json,
+                        "chunk_id": record_id
+                    })
+                    await session.commit()
+        except Exception as e:
+            if not self.is_undefined_table_error(e):
+                raise
+            return self.forget_dropped_collection(collection_name, missing_return=False)
+
+        self.collection_registry.add_rows(collection_name, 1)
         return True
     
     
     async def insert_many(self, collection_name: str, texts: list,
                         vectors: list, metadata: list = None,
-                        record_ids: list = None, batch_size: int = 50):
+                        record_ids: list = None, batch_size: int = 50,
+                        use_copy: bool = False):
         """ Insert many records into the PGVector collection.
+        With use_copy the rows are streamed through binary COPY instead of INSERT.
+        Rows already stored for the given record ids are replaced.
         """
-        is_collection_exists = await self.is_collection_exists(collection_name)
-        if not is_collection_exists:
+        state = await self.get_collection_state(collection_name=collection_name)
+        if state is None:
             self.logger.info(f"Can not insert record into {collection_name} because it does not exist.")
             return False
 
@@ -281,69 +692,405 @@ class PGVectorProvider(VectorDBInterface):
             self.logger.error("Vectors and record IDs must have the same length.")
             return False
         
+        if state["dimension"] and len(vectors) and len(vectors[0]) != state["dimension"]:
+            self.logger.error(f"Vectors of size {len(vectors[0])} do not fit {collection_name} "
+                              f"of dimension {state['dimension']}.")
+            return False
+        
         if not metadata or len(metadata) == 0:
             metadata = [None] * len(texts)
 
-        async with self.db_client() as session:
-            async with session.begin():
-                for i in range(0, len(texts), batch_size):
-                    batch_texts = texts[i:i + batch_size]
-                    batch_vectors = vectors[i:i + batch_size]
-                    batch_metadata = metadata[i:i + batch_size] if metadata else [None] * len(batch_texts)
-                    batch_record_ids = record_ids[i:i + batch_size]
-                    
-                    values = []
-
-                    for _text, _vector, _metadata, _record_id in zip(batch_texts, batch_vectors, batch_metadata, batch_record_ids):
-                        metadata_json = json.dumps(_metadata, ensure_ascii=False) if _metadata is not None else "{}"
-                        values.append({
-                            "text": _text,
-                            "vector": "[" + ",".join([str(v) for v in _vector]) + "]",
-                            "metadata": metadata_json,
-                            "chunk_id": _record_id
-                        })
+        try:
+            if use_copy:
+                ids = await self.copy_many(collection_name=collection_name, texts=texts, vectors=vectors,
+                                           metadata=metadata, record_ids=record_ids)
+                self.collection_registry.add_rows(collection_name, len(ids))
+                await self.create_vector_index(collection_name=collection_name)
+                return True
+
+            async with self.db_client() as session:
+                async with session.begin():
+                    _ = await self.delete_existing_records(session, collection_name, record_ids)
+                    positions = await self.lock_existing_chunks(session, record_ids)
+                    if len(positions) < len(record_ids):
+                        texts = [texts[p] for p in positions]
+                        vectors = [vectors[p] for p in positions]
+                        metadata = [metadata[p] for p in positions]
+                        record_ids = [record_ids[p] for p in positions]
+
+                    for i in range(0, len(texts), batch_size):
+                        batch_texts = texts[i:i + batch_size]
+                        batch_vectors = vectors[i:i + batch_size]
+                        batch_metadata = metadata[i:i + batch_size] if metadata else [None] * len(batch_texts)
+                        batch_record_ids = record_ids[i:i + batch_size]
                     
-                    batch_insert_sql = sql_text(f'''
-                        INSERT INTO {collection_name} (
-                        {PgVectorTableSchemeEnums.TEXT.value}, 
-                        {PgVectorTableSchemeEnums.VECTOR.value},
-                        {PgVectorTableSchemeEnums.METADATA.value}, 
-                        {PgVectorTableSchemeEnums.CHUNK_ID.value})
-                        VALUES (:text, :vector, :metadata, :chunk_id)
-                        ON CONFLICT ({PgVectorTableSchemeEnums.ID.value}) DO NOTHING
-                    ''')
-                    await session.execute(batch_insert_sql, values)
+                        values = []
+
+                        for _text, _vector, _metadata, _record_id in zip(batch_texts, batch_vectors, batch_metadata, batch_record_ids):
+                            metadata_json = json.dumps(_metadata, ensure_ascii=False) if _metadata is not None else "{}"
+                            values.append({
+                                "text": _text,
+                                "vector": np.asarray(_vector, dtype=np.float32),
+                                "metadata": metadata_json,
+                                "chunk_id": _record_id
+                            })
                     
+                        batch_insert_sql = sql_text(f'''
+                            INSERT INTO {collection_name} (
+                            {PgVectorTableSchemeEnums.TEXT.value}, 
+                            {PgVectorTableSchemeEnums.VECTOR.value},
+                            {PgVectorTableSchemeEnums.METADATA.value}, 
+                            {PgVectorTableSchemeEnums.CHUNK_ID.value})
+                            VALUES (:text, :vector, :metadata, :chunk_id)
+                            ON CONFLICT ({PgVectorTableSchemeEnums.ID.value}) DO NOTHING
+                        ''')
+                        await session.execute(batch_insert_sql, values)
+        except Exception as e:
+            if not self.is_undefined_table_error(e):
+                raise
+            return self.forget_dropped_collection(collection_name, missing_return=False)
+
+        self.collection_registry.add_rows(collection_name, len(texts))
         await self.create_vector_index(collection_name=collection_name)
         return True
  
-    async def search_by_vector(self, collection_name: str, vector: list, limit: int = 10) -> List[RetrievedDocument]:
+    async def copy_many(self, collection_name: str, texts: list,
+                        vectors: list, metadata: list, record_ids: list,
+                        batch_size: int = 10000):
+        """
+        Bulk insert records with binary COPY ... FROM STDIN.
+        Vectors go through the registered pgvector codec, and the generated ids are
+        reserved from the id sequence up front and returned in input order. Records of
+        deleted chunks are skipped and get no id.
+        """
+        ids = []
+        vectors = np.asarray(vectors, dtype=np.float32)
+        columns = [
+            PgVectorTableSchemeEnums.ID.value,
+            PgVectorTableSchemeEnums.TEXT.value,
+            PgVectorTableSchemeEnums.VECTOR.value,
+            PgVectorTableSchemeEnums.METADATA.value,
+            PgVectorTableSchemeEnums.CHUNK_ID.value,
+        ]
+
+        async with self.db_client() as session:
+            async with session.begin():
+                connection = await session.connection()
+                raw_connection = await connection.get_raw_connection()
+                driver_connection = raw_connection.driver_connection
+
+                _ = await self.delete_existing_records(session, collection_name, record_ids)
+                positions = await self.lock_existing_chunks(session, record_ids)
+                if len(positions) < len(record_ids):
+                    texts = [texts[p] for p in positions]
+                    vectors = vectors[positions]
+                    metadata = [metadata[p] for p in positions]
+                    record_ids = [record_ids[p] for p in positions]
+
+                for i in range(0, len(texts), batch_size):
+                    batch_texts = texts[i:i + batch_size]
+
+                    ids_sql = sql_text(
+                        f"SELECT nextval(pg_get_serial_sequence(:collection_name, '{PgVectorTableSchemeEnums.ID.value}')) "
+                        "FROM generate_series(1, :count)"
+                    )
+                    result = await session.execute(ids_sql, {"collection_name": collection_name,
+                                                             "count": len(batch_texts)})
+                    batch_ids = sorted(row[0] for row in result.fetchall())
+
+                    records = [
+                        (
+                            _id,
+                            _text,
+                            _vector,
+                            json.dumps(_metadata, ensure_ascii=False) if _metadata is not None else "{}",
+                            _record_id,
+                        )
+                        for _id, _text, _vector, _metadata, _record_id in zip(
+                            batch_ids, batch_texts, vectors[i:i + batch_size],
+                            metadata[i:i + batch_size], record_ids[i:i + batch_size]
+                        )
+                    ]
+
+                    await driver_connection.copy_records_to_table(
+                        collection_name, records=records, columns=columns
+                    )
+                    ids.extend(batch_ids)
+
+        return ids
+
+    async def set_search_params(self, session, ef_search: int = None, iterative_scan: str = None):
+        """
+        Apply per-transaction HNSW search settings.
+        """
+        ef_search = ef_search if ef_search else self.default_ef_search
+        iterative_scan = iterative_scan if iterative_scan else self.default_iterative_scan
+
+        if ef_search:
+            await session.execute(sql_text("SELECT set_config('hnsw.ef_search', :value, true)"),
+                                  {"value": str(int(ef_search))})
+
+        if iterative_scan:
+            iterative_scan = PgVectorIterativeScanEnums(iterative_scan).value
+            await session.execute(sql_text("SELECT set_config('hnsw.iterative_scan', :value, true)"),
+                                  {"value": iterative_scan})
+
+        return iterative_scan
+
+    def build_filter_sql(self, metadata_filter: MetadataFilter, params: dict):
+        """
+        Translate a metadata filter into a WHERE clause, adding its bind values to params.
+        Equality and $in become JSONB containment (@>) so the GIN index can serve them.
+        A value also matches a list field holding it, e.g. the asset ids of a chunk.
+        """
+        metadata_column = PgVectorTableSchemeEnums.METADATA.value
+        range_operators = {"$gt": ">", "$gte": ">=", "$lt": "<", "$lte": "<="}
+
+        def bind(value):
+            name = f"filter_{len(params)}"
+            params[name] = value
+            return f":{name}"
+
+        def contains(path, value):
+            for key in reversed(path):
+                value = {key: value}
+            return f"{metadata_column} @> CAST({bind(json.dumps(value, ensure_ascii=False))} AS jsonb)"
+
+        def equals(path, value):
+            return f"({contains(path, value)} OR {contains(path, [value])})"
+
+        def visit(node):
+            if node[0] in ("and", "or"):
+                return "(" + f" {node[0].upper()} ".join(visit(child) for child in node[1]) + ")"
+
+            _, path, operator, value = node
+            if operator == "$eq":
+                return equals(path, value)
+            if operator == "$ne":
+                return f"NOT {equals(path, value)}"
+            if operator == "$in":
+                return "(" + " OR ".join(equals(path, v) for v in value) + ")"
+            if operator == "$nin":
+                return "NOT (" + " OR ".join(equals(path, v) for v in value) + ")"
+
+            path_param = f"CAST({bind(path)} AS text[])"
+            if operator == "$exists":
+                return f"({metadata_column} #> {path_param}) IS {'NOT ' if value else ''}NULL"
+
+            # non numeric values never match a range
+            return (f"(CASE WHEN jsonb_typeof({metadata_column} #> {path_param}) = 'number' "
+                    f"THEN ({metadata_column} #>> {path_param})::float8 END) "
+                    f"{range_operators[operator]} CAST({bind(float(value))} AS float8)")
+
+        return visit(metadata_filter.root)
+
+    def get_search_sql(self, collection_name: str, where_sql: str = None):
+        """
+        Build the nearest-neighbour query. Ordering by the bare distance operator is what lets
+        Postgres walk the HNSW index instead of scoring every row.
+        """
+        return sql_text(f'SELECT {PgVectorTableSchemeEnums.CHUNK_ID.value} as record_id,'
+                        f' {PgVectorTableSchemeEnums.TEXT.value} as text, {self.score_expression(":vector")} as score'
+                        f' FROM {collection_name}'
+                        + (f' WHERE {where_sql}' if where_sql else '') +
+                        f' ORDER BY {PgVectorTableSchemeEnums.VECTOR.value} {self.distance_operator} :vector'
+                        ' LIMIT :limit'
+                        )
+
+    async def search_by_vector(self, collection_name: str, vector: list, limit: int = 10,
+                               ef_search: int = None, iterative_scan: str = None,
+                               metadata_filter: MetadataFilter = None) -> List[RetrievedDocument]:
         """
         Search for similar records in the PGVector collection.
+        Filtered searches use an iterative index scan unless one is given, so the HNSW
+        walk keeps going until limit matching rows are found.
         """
         is_collection_existed = await self.is_collection_exists(collection_name=collection_name)
         if not is_collection_existed:
             self.logger.error(f"Can not search for records in a non-existed collection: {collection_name}")
             return False
         
-        vector = "[" + ",".join([ str(v) for v in vector ]) + "]"
-        async with self.db_client() as session:
-            async with session.begin():
-                search_sql = sql_text(f'SELECT {PgVectorTableSchemeEnums.TEXT.value} as text, 1 - ({PgVectorTableSchemeEnums.VECTOR.value} <=> :vector) as score'
-                                      f' FROM {collection_name}'
-                                      ' ORDER BY score DESC '
-                                      f'LIMIT :limit'
-                                      )
+        vector = np.asarray(vector, dtype=np.float32)
+        params = {"vector": vector, "limit": limit}
+        where_sql = None
+        if metadata_filter is not None:
+            where_sql = self.build_filter_sql(metadata_filter=metadata_filter, params=params)
+            iterative_scan = iterative_scan if iterative_scan else self.filtered_iterative_scan
+
+        try:
+            async with self.db_client() as session:
+                async with session.begin():
+                    iterative_scan = await self.set_search_params(session, ef_search=ef_search,
+                                                                  iterative_scan=iterative_scan)
+
+                    result = await session.execute(self.get_search_sql(collection_name, where_sql=where_sql),
+                                                   params)
+
+                    records = result.fetchall()
+        except Exception as e:
+            if not self.is_undefined_table_error(e):
+                raise
+            return self.forget_dropped_collection(collection_name, missing_return=False)
+
+        documents = [
+            RetrievedDocument(
+                text=record.text,
+                score=record.score,
+                record_id=record.record_id
+            )
+            for record in records
+        ]
+
+        # relaxed iterative scans may return slightly out-of-order rows
+        if iterative_scan == PgVectorIterativeScanEnums.RELAXED_ORDER.value:
+            documents.sort(key=lambda doc: doc.score, reverse=True)
+
+        return documents
+
+    def get_batch_search_sql(self, collection_name: str, queries_count: int, where_sql: str = None):
+        """
+        Build one statement running a nearest-neighbour query per query vector. Every query row
+        drives its own index ordered LIMIT scan through CROSS JOIN LATERAL, rows come back
+        grouped by query index and best first within a group.
+        """
+        vector_column = PgVectorTableSchemeEnums.VECTOR.value
+        queries_sql = ", ".join(
+            f"({i}, CAST(:vector_{i} AS vector))" for i in range(queries_count)
+        )
+        return sql_text(f'SELECT queries.query_index, r.record_id, r.text, r.score'
+                        f' FROM (VALUES {queries_sql}) AS queries(query_index, query_vector)'
+                        f' CROSS JOIN LATERAL ('
+                        f'SELECT {PgVectorTableSchemeEnums.CHUNK_ID.value} as record_id,'
+                        f' {PgVectorTableSchemeEnums.TEXT.value} as text,'
+                        f' {self.score_expression("queries.query_vector")} as score'
+                        f' FROM {collection_name}'
+                        + (f' WHERE {where_sql}' if where_sql else '') +
+                        f' ORDER BY {vector_column} {self.distance_operator} queries.query_vector'
+                        ' LIMIT :limit'
+                        ') AS r'
+                        ' ORDER BY queries.query_index, r.score DESC'
+                        )
+
+    async def search_by_vectors(self, collection_name: str, vectors: list, limit: int = 10,
+                                ef_search: int = None, iterative_scan: str = None,
+                                metadata_filter: MetadataFilter = None) -> List[List[RetrievedDocument]]:
+        """
+        Search the PGVector collection for many query vectors in one round trip.
+        """
+        is_collection_existed = await self.is_collection_exists(collection_name=collection_name)
+        if not is_collection_existed:
+            self.logger.error(f"Can not search for records in a non-existed collection: {collection_name}")
+            return False
 
-                result = await session.execute(search_sql, {"vector": vector, "limit": limit})
+        vectors = np.asarray(vectors, dtype=np.float32)
+        params = {"limit": limit}
+        params.update({f"vector_{i}": vector for i, vector in enumerate(vectors)})
+        where_sql = None
+        if metadata_filter is not None:
+            where_sql = self.build_filter_sql(metadata_filter=metadata_filter, params=params)
+            iterative_scan = iterative_scan if iterative_scan else self.filtered_iterative_scan
 
-                records = result.fetchall()
+        try:
+            async with self.db_client() as session:
+                async with session.begin():
+                    await self.set_search_params(session, ef_search=ef_search, iterative_scan=iterative_scan)
 
-                return [
-                    RetrievedDocument(
-                        text=record.text,
-                        score=record.score
+                    result = await session.execute(
+                        self.get_batch_search_sql(collection_name, queries_count=len(vectors), where_sql=where_sql),
+                        params
                     )
-                    for record in records
-                ]
-    
\ No newline at end of file
+                    records = result.fetchall()
+        except Exception as e:
+            if not self.is_undefined_table_error(e):
+                raise
+            return self.forget_dropped_collection(collection_name, missing_return=False)
+
+        documents = [[] for _ in range(len(vectors))]
+        for record in records:
+            documents[record.query_index].append(RetrievedDocument(
+                text=record.text,
+                score=record.score,
+                record_id=record.record_id
+            ))
+
+        return documents
+
+    def get_text_search_sql(self, collection_name: str, where_sql: str = None):
+        """
+        Build the full text query. The query terms are OR-ed instead of plainto_tsquery's AND,
+        so a single rare identifier is enough to match, and ts_rank_cd ranks documents that match more terms higher.
+        """
+        text_search_column = PgVectorTableSchemeEnums.TEXT_SEARCH.value
+        return sql_text(f'SELECT {PgVectorTableSchemeEnums.CHUNK_ID.value} as record_id,'
+                        f' {PgVectorTableSchemeEnums.TEXT.value} as text,'
+                        f' ts_rank_cd({text_search_column}, q.ts_query) as score'
+                        f' FROM {collection_name},'
+                        f" (SELECT CAST(replace(CAST(plainto_tsquery('{self.text_search_config}', :query) AS text),"
+                        " ' & ', ' | ') AS tsquery) AS ts_query) AS q"
+                        f' WHERE {text_search_column} @@ q.ts_query'
+                        + (f' AND {where_sql}' if where_sql else '') +
+                        ' ORDER BY score DESC'
+                        ' LIMIT :limit'
+                        )
+
+    async def search_by_text(self, collection_name: str, text: str, limit: int = 10,
+                             metadata_filter: MetadataFilter = None) -> List[RetrievedDocument]:
+        """
+        Search the PGVector collection by full text relevance, served by the GIN tsvector index.
+        """
+        is_collection_existed = await self.is_collection_exists(collection_name=collection_name)
+        if not is_collection_existed:
+            self.logger.error(f"Can not search for records in a non-existed collection: {collection_name}")
+            return False
+
+        params = {"query": text, "limit": limit}
+        where_sql = None
+        if metadata_filter is not None:
+            where_sql = self.build_filter_sql(metadata_filter=metadata_filter, params=params)
+
+        try:
+            async with self.db_client() as session:
+                async with session.begin():
+                    result = await session.execute(self.get_text_search_sql(collection_name, where_sql=where_sql),
+                                                   params)
+                    records = result.fetchall()
+        except Exception as e:
+            if not self.is_undefined_table_error(e):
+                raise
+            return self.forget_dropped_collection(collection_name, missing_return=False)
+
+        return [
+            RetrievedDocument(
+                text=record.text,
+                score=record.score,
+                record_id=record.record_id
+            )
+            for record in records
+        ]
+
+    async def explain_search(self, collection_name: str, vector: list, limit: int = 10,
+                             ef_search: int = None, iterative_scan: str = None,
+                             metadata_filter: MetadataFilter = None) -> dict:
+        """
+        Return the query plan of search_by_vector and whether it walks the vector index.
+        """
+        index_name = self.default_index_name(collection_name)
+        vector = np.asarray(vector, dtype=np.float32)
+        params = {"vector": vector, "limit": limit}
+        where_sql = None
+        if metadata_filter is not None:
+            where_sql = self.build_filter_sql(metadata_filter=metadata_filter, params=params)
+            iterative_scan = iterative_scan if iterative_scan else self.filtered_iterative_scan
+
+        async with self.db_client() as session:
+            async with session.begin():
+                await self.set_search_params(session, ef_search=ef_search, iterative_scan=iterative_scan)
+
+                search_sql = self.get_search_sql(collection_name, where_sql=where_sql)
+                result = await session.execute(sql_text(f"EXPLAIN {search_sql.text}"), params)
+                plan = [row[0] for row in result.fetchall()]
+
+        return {
+            "plan": plan,
+            "uses_vector_index": any(index_name in line for line in plan),
+        }
@@ -1,19 +1,45 @@
 from qdrant_client import QdrantClient, models
 from ..VectorDBInterface import VectorDBInterface
 from ..VectorDBEnums import DistanceMethodEnums
+import numpy as np
+import asyncio
 import logging
+import time
 from typing import List
 from models.db_schemes import RetrievedDocument
+from ..MetadataFilter import MetadataFilter
+from ..BM25Index import BM25Index
 
 class QdrantDBProvider(VectorDBInterface): 
+
+    # Qdrant's default optimizer indexing threshold (KB)
+    DEFAULT_INDEXING_THRESHOLD = 20000
     
     def __init__(self, db_client: str, default_vector_size: int = 786,
-                 distance_method: str = None, index_treshold: int = 100):
+                 distance_method: str = None, index_treshold: int = 100,
+                 default_ef_search: int = None, metadata_index_fields: dict = None,
+                 bulk_load_min_fraction: float = 0.3,
+                 bm25_index_ttl_seconds: float = 60):
 
         self.client = None
         self.db_client = db_client
         self.distance_method = None
         self.default_vector_size = default_vector_size
+        self.default_ef_search = default_ef_search
+        # metadata field -> payload schema type, indexed so filtered searches stay fast
+        self.metadata_index_fields = metadata_index_fields if metadata_index_fields else {}
+        # a load pauses indexing only when it brings at least this fraction of the points
+        self.bulk_load_min_fraction = bulk_load_min_fraction
+        # collection name -> optimizer indexing threshold (KB) to restore when its bulk load ends
+        self.bulk_load_indexing_thresholds = {}
+        # collection name -> BM25 index over the point texts, built on the first lexical search
+        self.bm25_indexes = {}
+        # collection name -> monotonic time its BM25 index was built at
+        self.bm25_built_at = {}
+        # collection name -> running BM25 index build, shared by concurrent searches
+        self.bm25_builds = {}
+        # a BM25 index is rebuilt once older than this, to pick up writes of other processes
+        self.bm25_index_ttl_seconds = bm25_index_ttl_seconds
 
         if distance_method == DistanceMethodEnums.COSINE.value:
             self.distance_method = models.Distance.COSINE
@@ -56,10 +82,31 @@ class QdrantDBProvider(VectorDBInterface):
         """
         Delete a collection from the QdrantDB.
         """
-        if self.is_collection_exists(collection_name): 
+        self.bm25_indexes.pop(collection_name, None)
+        self.bm25_built_at.pop(collection_name, None)
+        if await self.is_collection_exists(collection_name): 
             self.logger.info(f"Deleting collection: {collection_name}")
             return self.client.delete_collection(collection_name=collection_name)
 
+    async def delete_by_record_ids(self, collection_name: str, record_ids: list):
+        """
+        Delete the points with the given ids from the QdrantDB collection.
+        """
+        if not record_ids or not self.client.collection_exists(collection_name=collection_name):
+            return 0
+        
+        self.client.delete(
+            collection_name=collection_name,
+            points_selector=models.PointIdsList(points=list(record_ids))
+        )
+
+        bm25_index = self.bm25_indexes.get(collection_name)
+        if bm25_index is not None:
+            for record_id in record_ids:
+                bm25_index.remove(record_id)
+
+        return len(record_ids)
+
     async def create_collection(self, collection_name: str, 
                                 embedding_size: int,
                                 do_reset: bool = False):
@@ -67,9 +114,9 @@ class QdrantDBProvider(VectorDBInterface):
         Create a new collection in the QdrantDB.
         """
         if do_reset:
-            _ = self.delete_collection(collection_name=collection_name)
+            _ = await self.delete_collection(collection_name=collection_name)
         
-        if not self.is_collection_exists(collection_name):
+        if not await self.is_collection_exists(collection_name):
             self.logger.info(f"Creating new Qdrant collection: {collection_name}")
 
             _ = self.client.create_collection(
@@ -79,18 +126,75 @@ class QdrantDBProvider(VectorDBInterface):
                     distance=self.distance_method
                 )
             )
+
+            for field_name, field_schema in self.metadata_index_fields.items():
+                _ = self.client.create_payload_index(
+                    collection_name=collection_name,
+                    field_name=f"metadata.{field_name}",
+                    field_schema=models.PayloadSchemaType(field_schema)
+                )
             
             return True
         
         return False
             
+    async def begin_bulk_load(self, collection_name: str, expected_rows: int = None):
+        """
+        Pause HNSW indexing of the collection while it is bulk loaded, when it is empty or
+        the load brings at least bulk_load_min_fraction of its points. The current
+        indexing threshold is kept to be restored by end_bulk_load.
+        The local storage can only be opened by one process, so a paused collection
+        without a load running in this one was left paused by a load that died, and its
+        indexing is resumed with the default threshold.
+        Returns whether indexing was paused.
+        """
+        if collection_name in self.bulk_load_indexing_thresholds or \
+           not self.client.collection_exists(collection_name=collection_name):
+            return False
+
+        collection_info = self.client.get_collection(collection_name=collection_name)
+        indexing_threshold = collection_info.config.optimizer_config.indexing_threshold
+        if indexing_threshold == 0:
+            self.logger.warning(f"Resuming the indexing of {collection_name} left paused by a dead bulk load.")
+            indexing_threshold = self.DEFAULT_INDEXING_THRESHOLD
+            self.client.update_collection(
+                collection_name=collection_name,
+                optimizers_config=models.OptimizersConfigDiff(indexing_threshold=indexing_threshold)
+            )
+
+        points_count = collection_info.points_count or 0
+        if points_count > 0 and (
+            expected_rows is None or expected_rows < self.bulk_load_min_fraction * points_count
+        ):
+            return False
+
+        self.bulk_load_indexing_thresholds[collection_name] = indexing_threshold
+        self.client.update_collection(
+            collection_name=collection_name,
+            optimizers_config=models.OptimizersConfigDiff(indexing_threshold=0)
+        )
+        return True
+    
+    async def end_bulk_load(self, collection_name: str):
+        """
+        Resume HNSW indexing so the loaded points are indexed in one pass.
+        """
+        indexing_threshold = self.bulk_load_indexing_thresholds.pop(collection_name, None)
+        if indexing_threshold is None or not self.client.collection_exists(collection_name=collection_name):
+            return False
+
+        return self.client.update_collection(
+            collection_name=collection_name,
+            optimizers_config=models.OptimizersConfigDiff(indexing_threshold=indexing_threshold)
+        )
+            
     async def insert_one(self, collection_name: str, text: str, vector: list, 
                         metadata: dict = None,
                         record_id: str = None):
         """
         Insert a single record into the QdrantDB collection.
         """
-        if not self.is_collection_exists(collection_name):
+        if not await self.is_collection_exists(collection_name):
             self.logger.error("Cannot insert record. Collection does not exist.")
             return False
         
@@ -99,7 +203,7 @@ class QdrantDBProvider(VectorDBInterface):
                 collection_name=collection_name,
                 records=[models.Record(
                     id =[record_id],
-                    vector=vector,
+                    vector=np.asarray(vector, dtype=np.float32).tolist(),
                     payload={
                         "text": text,
                         "metadata": metadata 
@@ -109,12 +213,17 @@ class QdrantDBProvider(VectorDBInterface):
         except Exception as e:
             self.logger.error(f"Error inserting record: {e}")
             return False
+
+        bm25_index = self.bm25_indexes.get(collection_name)
+        if bm25_index is not None:
+            bm25_index.add(record_id, text)
         
         return True
     
     async def insert_many(self, collection_name: str, texts: list,
                         vectors: list, metadata: list = None,
-                        record_ids: list = None, batch_size: int = 50):
+                        record_ids: list = None, batch_size: int = 50,
+                        use_copy: bool = False):
         """
         Insert many records into the QdrantDB collection.
         """
@@ -124,10 +233,12 @@ class QdrantDBProvider(VectorDBInterface):
         if record_ids is None:
             record_ids = list(range(0,len(texts)))
             
+        vectors = np.asarray(vectors, dtype=np.float32)
+            
         for i in range(0, len(texts), batch_size):
             batch_end = i + batch_size
             batch_texts = texts[i:batch_end]
-            batch_vectors = vectors[i:batch_end]
+            batch_vectors = vectors[i:batch_end].tolist()
             batch_metadata = metadata[i:batch_end]
             batch_record_ids = record_ids[i:batch_end]
             
@@ -151,17 +262,70 @@ class QdrantDBProvider(VectorDBInterface):
             except Exception as e:
                 self.logger.error(f"Error inserting batch: {e}")
                 return False
+
+            bm25_index = self.bm25_indexes.get(collection_name)
+            if bm25_index is not None:
+                bm25_index.add_many(zip(batch_record_ids, batch_texts))
                 
         return True 
         
-    async def search_by_vector(self, collection_name: str, vector: list, limit: int = 5):
+    def build_filter(self, metadata_filter: MetadataFilter):
+        """
+        Translate a metadata filter into a Qdrant payload filter on the metadata payload.
+        """
+
+        def match(key, value):
+            if value is None:
+                return models.IsNullCondition(is_null=models.PayloadField(key=key))
+            if isinstance(value, float):
+                return models.FieldCondition(key=key, range=models.Range(gte=value, lte=value))
+            return models.FieldCondition(key=key, match=models.MatchValue(value=value))
+
+        def match_any(key, values):
+            if all(isinstance(v, str) for v in values) or \
+               all(isinstance(v, int) and not isinstance(v, bool) for v in values):
+                return models.FieldCondition(key=key, match=models.MatchAny(any=values))
+            return models.Filter(should=[match(key, v) for v in values])
+
+        def visit(node):
+            if node[0] == "and":
+                return models.Filter(must=[visit(child) for child in node[1]])
+            if node[0] == "or":
+                return models.Filter(should=[visit(child) for child in node[1]])
+
+            _, path, operator, value = node
+            key = ".".join(["metadata", *path])
+            if operator == "$eq":
+                return match(key, value)
+            if operator == "$ne":
+                return models.Filter(must_not=[match(key, value)])
+            if operator == "$in":
+                return match_any(key, value)
+            if operator == "$nin":
+                return models.Filter(must_not=[match_any(key, value)])
+            if operator == "$exists":
+                is_empty = models.IsEmptyCondition(is_empty=models.PayloadField(key=key))
+                return models.Filter(must_not=[is_empty]) if value else is_empty
+
+            return models.FieldCondition(key=key, range=models.Range(**{operator[1:]: value}))
+
+        condition = visit(metadata_filter.root)
+        return condition if isinstance(condition, models.Filter) else models.Filter(must=[condition])
+
+    async def search_by_vector(self, collection_name: str, vector: list, limit: int = 5,
+                               ef_search: int = None, iterative_scan: str = None,
+                               metadata_filter: MetadataFilter = None):
         """
         Search for records in the VectorDB by vector similarity.
         """
+        ef_search = ef_search if ef_search else self.default_ef_search
+        
         results = self.client.search(
             collection_name=collection_name,
-            query_vector=vector,
-            limit=limit
+            query_vector=np.asarray(vector, dtype=np.float32).tolist(),
+            query_filter=self.build_filter(metadata_filter) if metadata_filter is not None else None,
+            limit=limit,
+            search_params=models.SearchParams(hnsw_ef=ef_search) if ef_search else None
         )
 
         if not results or len(results) == 0:
@@ -171,6 +335,159 @@ class QdrantDBProvider(VectorDBInterface):
             RetrievedDocument(**{
                 "score": result.score,
                 "text": result.payload["text"],
+                "record_id": result.id,
             })
             for result in results
-        ]
\ No newline at end of file
+        ]
+
+    async def search_by_vectors(self, collection_name: str, vectors: list, limit: int = 5,
+                                ef_search: int = None, iterative_scan: str = None,
+                                metadata_filter: MetadataFilter = None):
+        """
+        Search for many query vectors in one Qdrant batch search call.
+        """
+        ef_search = ef_search if ef_search else self.default_ef_search
+        query_filter = self.build_filter(metadata_filter) if metadata_filter is not None else None
+        search_params = models.SearchParams(hnsw_ef=ef_search) if ef_search else None
+
+        batch_results = self.client.search_batch(
+            collection_name=collection_name,
+            requests=[
+                models.SearchRequest(
+                    vector=vector,
+                    filter=query_filter,
+                    limit=limit,
+                    params=search_params,
+                    with_payload=True
+                )
+                for vector in np.asarray(vectors, dtype=np.float32).tolist()
+            ]
+        )
+
+        return [
+            [
+                RetrievedDocument(**{
+                    "score": result.score,
+                    "text": result.payload["text"],
+                    "record_id": result.id,
+                })
+                for result in results
+            ]
+            for results in batch_results
+        ]
+
+    def scroll_points(self, collection_name: str, scroll_filter: models.Filter = None,
+                         with_text: bool = False, page_size: int = 1000):
+        """
+        Page through the points of a collection, yielding (id, text) pairs.
+        """
+        offset = None
+        while True:
+            points, offset = self.client.scroll(
+                collection_name=collection_name,
+                scroll_filter=scroll_filter,
+                limit=page_size,
+                offset=offset,
+                with_payload=["text"] if with_text else False,
+                with_vectors=False
+            )
+            for point in points:
+                yield point.id, (point.payload or {}).get("text") if with_text else None
+
+            if offset is None:
+                break
+
+    def build_bm25_index(self, collection_name: str):
+        """
+        Build a BM25 index from the stored texts of the collection. Blocking, run in a worker thread.
+        """
+        self.logger.info(f"Building the BM25 index of {collection_name}.")
+        bm25_index = BM25Index()
+        bm25_index.add_many(self.scroll_points(collection_name=collection_name, with_text=True))
+        return bm25_index
+
+    def is_bm25_index_stale(self, collection_name: str, bm25_index: BM25Index):
+        """
+        Whether the index is older than the TTL or no longer matches the point count, which
+        happens when another process wrote to the collection.
+        """
+        built_at = self.bm25_built_at.get(collection_name, 0)
+        if time.monotonic() - built_at > self.bm25_index_ttl_seconds:
+            return True
+
+        points_count = self.client.get_collection(collection_name=collection_name).points_count
+        return points_count is not None and points_count != len(bm25_index)
+
+    async def get_bm25_index(self, collection_name: str):
+        """
+        BM25 index of the collection, built from its stored texts on first use and kept up
+        to date by the insert and delete methods afterwards. Stale indexes are rebuilt.
+        Builds run off the event loop and concurrent searches wait for the same build.
+        """
+        bm25_index = self.bm25_indexes.get(collection_name)
+        if bm25_index is not None and not self.is_bm25_index_stale(collection_name, bm25_index):
+            return bm25_index
+
+        build = self.bm25_builds.get(collection_name)
+        if build is None:
+            build = asyncio.ensure_future(self.run_bm25_build(collection_name))
+            build.add_done_callback(lambda _: self.bm25_builds.pop(collection_name, None))
+            self.bm25_builds[collection_name] = build
+
+        # a cancelled search must not cancel the build other searches wait for
+        return await asyncio.shield(build)
+
+    async def run_bm25_build(self, collection_name: str):
+        built_at = time.monotonic()
+        bm25_index = await asyncio.to_thread(self.build_bm25_index, collection_name)
+        self.bm25_indexes[collection_name] = bm25_index
+        self.bm25_built_at[collection_name] = built_at
+        return bm25_index
+
+    async def search_by_text(self, collection_name: str, text: str, limit: int = 10,
+                             metadata_filter: MetadataFilter = None, page_size: int = 256):
+        """
+        Search for records in the QdrantDB collection with the local BM25 index.
+        BM25 candidates are checked against Qdrant best first, a page at a time, which
+        drops deleted points and applies the metadata filter without listing every
+        point that matches it.
+        """
+        if not self.client.collection_exists(collection_name=collection_name):
+            self.logger.error(f"Can not search for records in a non-existed collection: {collection_name}")
+            return None
+
+        bm25_index = await self.get_bm25_index(collection_name=collection_name)
+
+        results = bm25_index.search(text=text, limit=None)
+        query_filter = self.build_filter(metadata_filter) if metadata_filter is not None else None
+        page_size = max(page_size, limit)
+
+        documents = []
+        for start in range(0, len(results), page_size):
+            page = results[start:start + page_size]
+            conditions = [models.HasIdCondition(has_id=[record_id for record_id, _ in page])]
+            if query_filter is not None:
+                conditions.append(query_filter)
+
+            points, _ = self.client.scroll(
+                collection_name=collection_name,
+                scroll_filter=models.Filter(must=conditions),
+                limit=len(page),
+                with_payload=["text"],
+                with_vectors=False
+            )
+            texts = {point.id: point.payload["text"] for point in points}
+
+            documents.extend(
+                RetrievedDocument(**{
+                    "score": score,
+                    "text": texts[record_id],
+                    "record_id": record_id,
+                })
+                for record_id, score in page
+                if record_id in texts
+            )
+            if len(documents) >= limit:
+                break
+
+        return documents[:limit] if documents else None
@@ -0,0 +1,127 @@
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+from stores.llm.providers.FakeProvider import FakeProvider, FakeProviderError
+import argparse
+import base64
+import logging
+import os
+import time
+import uuid
+import uvicorn
+
+app = FastAPI()
+
+
+def create_provider():
+    return FakeProvider(
+        latency_ms=float(os.getenv("FAKE_LATENCY_MS", 0)),
+        latency_jitter_ms=float(os.getenv("FAKE_LATENCY_JITTER_MS", 0)),
+        error_rate=float(os.getenv("FAKE_ERROR_RATE", 0)),
+        seed=int(os.getenv("FAKE_SEED", 0)),
+        generation_text=os.getenv("FAKE_GENERATION_TEXT") or None
+    )
+
+
+app.provider = create_provider()
+app.embedding_size = int(os.getenv("EMBEDDING_MODEL_SIZE", 1536))
+
+
+def error_response(e: FakeProviderError):
+    headers = {"retry-after": "1"} if e.status_code == 429 else None
+    return JSONResponse(
+        status_code=e.status_code,
+        headers=headers,
+        content={"error": {"message": str(e), "type": "fake_error", "code": e.status_code}}
+    )
+
+
+def count_tokens(text: str):
+    return len(text) // 4 + 1
+
+
+@app.post("/v1/embeddings")
+async def embeddings(request: Request):
+    """
+    OpenAI compatible embeddings, float lists or base64 float32 like the real API.
+    """
+    body = await request.json()
+    texts = body.get("input")
+    texts = [texts] if isinstance(texts, str) else texts
+
+    try:
+        await app.provider.simulate_call_async()
+    except FakeProviderError as e:
+        return error_response(e)
+
+    vectors = app.provider.embed_texts(
+        texts=texts,
+        embedding_size=body.get("dimensions") or app.embedding_size
+    )
+
+    base64_encoded = body.get("encoding_format") == "base64"
+    prompt_tokens = sum(count_tokens(t) for t in texts)
+    return {
+        "object": "list",
+        "model": body.get("model"),
+        "data": [
+            {
+                "object": "embedding",
+                "index": i,
+                "embedding": base64.b64encode(vector.tobytes()).decode("ascii") if base64_encoded else vector.tolist(),
+            }
+            for i, vector in enumerate(vectors)
+        ],
+        "usage": {"prompt_tokens": prompt_tokens, "total_tokens": prompt_tokens},
+    }
+
+
+@app.post("/v1/chat/completions")
+async def chat_completions(request: Request):
+    """
+    OpenAI compatible chat completion with a canned answer.
+    """
+    body = await request.json()
+    messages = body.get("messages") or []
+    prompt = messages[-1].get("content", "") if len(messages) else ""
+
+    try:
+        await app.provider.simulate_call_async()
+    except FakeProviderError as e:
+        return error_response(e)
+
+    answer = app.provider.build_generation(prompt=prompt)
+
+    prompt_tokens = sum(count_tokens(str(m.get("content", ""))) for m in messages)
+    completion_tokens = count_tokens(answer)
+    return {
+        "id": f"chatcmpl-{uuid.uuid4().hex}",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": body.get("model"),
+        "choices": [
+            {
+                "index": 0,
+                "message": {"role": "assistant", "content": answer},
+                "finish_reason": "stop",
+            }
+        ],
+        "usage": {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens,
+        },
+    }
+
+
+if __name__ == "__main__":
+    """
+    Local OpenAI compatible stub for load tests, point OPENAI_API_URL to http://<host>:<port>/v1
+    """
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8001)
+    parser.add_argument("--workers", type=int, default=1)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    uvicorn.run("stub_openai_server:app", host=args.host, port=args.port, workers=args.workers)
@@ -0,0 +1,392 @@
+from dataclasses import dataclass, field
+from typing import Callable, Iterable, List, Tuple
+from models.enums.ProcessingEnum import ChunkSizeUnitEnum
+import bisect
+import itertools
+import operator
+import re
+
+# separators between the units a chunk is built from, per size unit; every separator
+# match is a run of whitespace
+UNIT_SEPARATORS = {
+    ChunkSizeUnitEnum.CHARS.value: re.compile(r"\n"),
+    ChunkSizeUnitEnum.SENTENCES.value: re.compile(r"(?<=[.!?])\s+|\n\s*\n"),
+    ChunkSizeUnitEnum.TOKENS.value: re.compile(r"\s+"),
+}
+
+
+def piece_pattern(size_unit: str, max_chars: int):
+    """
+    Regex of the stripped units, or the pieces of the longer ones: the longest run of up
+    to max_chars characters from a non-space character to a non-space character, within
+    a line in chars mode and within a word in tokens mode.
+    """
+    if size_unit == ChunkSizeUnitEnum.TOKENS.value:
+        return re.compile(rf"\S{{1,{max_chars}}}")
+    if max_chars == 1:
+        return re.compile(r"\S")
+    if size_unit == ChunkSizeUnitEnum.CHARS.value:
+        return re.compile(rf"\S(?:[^\n]{{0,{max_chars - 2}}}\S)?")
+    return re.compile(rf"\S(?:.{{0,{max_chars - 2}}}\S)?", re.DOTALL)
+
+
+@dataclass
+class Chunk:
+    page_content: str
+    metadata: dict = field(default_factory=dict)
+
+
+class Chunker:
+    """
+    Offset-based chunker with overlap.
+
+    Text is fed page by page and cut into units (lines, sentences or whitespace tokens)
+    that are tracked as (start, end) offsets into the document, never as concatenated
+    copies. A chunk is a single slice of the source from its first to its last unit, so
+    building every chunk is linear in its length.
+
+    - chars: lines are packed up to chunk_size characters, longer lines are hard-split.
+    - sentences: chunk_size and overlap_size count sentences.
+    - tokens: chunk_size and overlap_size count tokens, measured with count_tokens
+      (one token per whitespace-separated word by default). Units heavier than
+      chunk_size are split.
+
+    No chunk is longer than max_chunk_chars characters (chunk_size in chars mode): longer
+    units are hard-split into the longest pieces that fit. A piece only depends on the
+    max_chunk_chars characters from its start, so the chunks do not depend on how the
+    text is split into pages or blocks. Text is only scanned once, and the buffer never
+    holds more than the current chunk and one unfinished unit.
+
+    Chunks carry start_offset / end_offset into the document text, where pages are
+    joined with page_joiner, and page_start / page_end when pages are given.
+    """
+
+    def __init__(self, chunk_size: int, overlap_size: int = 0, size_unit: str = ChunkSizeUnitEnum.CHARS.value,
+                 page_joiner: str = " ", count_tokens: Callable[[str], int] = None,
+                 max_chunk_chars: int = 4000):
+        if size_unit not in UNIT_SEPARATORS:
+            raise ValueError(f"Unsupported chunk size unit: {size_unit}")
+        if chunk_size <= 0:
+            raise ValueError("chunk_size must be positive")
+
+        self.chunk_size = chunk_size
+        self.overlap_size = max(0, min(overlap_size or 0, chunk_size - 1))
+        self.size_unit = size_unit
+        self.is_chars = size_unit == ChunkSizeUnitEnum.CHARS.value
+        self.separator = UNIT_SEPARATORS[size_unit]
+        self.page_joiner = page_joiner
+        self.count_tokens = count_tokens if size_unit == ChunkSizeUnitEnum.TOKENS.value else None
+        self.max_chunk_chars = chunk_size if self.is_chars else max(1, max_chunk_chars or chunk_size)
+        self.piece_pattern = piece_pattern(size_unit, self.max_chunk_chars)
+
+        # buffer holds the document text from buffer_offset on
+        self.buffer = ""
+        self.buffer_offset = 0
+        self.has_text = False
+
+        # text before scan_offset is cut into units, separator search resumes at search_offset
+        self.scan_offset = 0
+        self.search_offset = 0
+
+        # (start offset, page) of every page still in the buffer
+        self.page_starts = []
+        self.page_numbers = []
+
+        # units of the chunk being built as (start, end, weight), and how many of them
+        # are not in an emitted chunk yet
+        self.window = []
+        self.window_new_units = 0
+
+    def text(self, start: int, end: int):
+        return self.buffer[start - self.buffer_offset:end - self.buffer_offset]
+
+    def page_at(self, offset: int):
+        if not self.page_starts:
+            return None
+        i = bisect.bisect_right(self.page_starts, offset) - 1
+        return self.page_numbers[max(i, 0)]
+
+    def feed(self, text: str, page: int = None) -> List[Chunk]:
+        if self.has_text and self.page_joiner:
+            self.append_text(self.page_joiner, page=None)
+        self.has_text = True
+        self.append_text(text, page=page)
+
+        chunks = []
+        buffer = self.buffer
+        base = self.buffer_offset
+        position = self.scan_offset - base
+
+        # only units followed by a separator are complete, the rest waits for more text
+        region = self.find_complete_region(position, self.search_offset - base)
+        if region is not None:
+            region_end, next_position = region
+            self.add_units(self.iter_units(position, region_end), chunks)
+            position = next_position
+
+        # pieces of the unfinished unit that no more text can change
+        final_start = len(buffer) - self.max_chunk_chars
+        pieces = []
+        for match in self.piece_pattern.finditer(buffer, position):
+            if match.start() > final_start:
+                position = match.start()
+                break
+            pieces.append(match)
+        else:
+            position = len(buffer)
+        self.add_units(pieces, chunks)
+
+        # a separator match can only extend into new text from the trailing whitespace
+        search = len(buffer)
+        floor = max(position, self.search_offset - base)
+        while search > floor and buffer[search - 1].isspace():
+            search -= 1
+
+        self.scan_offset = position + base
+        self.search_offset = search + base
+        return chunks
+
+    def flush(self) -> List[Chunk]:
+        chunks = []
+        self.add_units(self.iter_units(self.scan_offset - self.buffer_offset, len(self.buffer)), chunks)
+        self.scan_offset = self.search_offset = self.buffer_offset + len(self.buffer)
+
+        if self.window and self.window_new_units > 0:
+            chunks.append(self.make_chunk(self.window[0][0], self.window[-1][1]))
+        self.window.clear()
+        self.window_new_units = 0
+        return chunks
+
+    def append_text(self, text: str, page: int = None):
+        # drop the text no pending unit or overlap can reach anymore
+        keep_from = self.window[0][0] if self.window else self.scan_offset
+        if keep_from > self.buffer_offset:
+            self.buffer = self.buffer[keep_from - self.buffer_offset:]
+            self.buffer_offset = keep_from
+
+            i = bisect.bisect_right(self.page_starts, keep_from) - 1
+            if i > 0:
+                del self.page_starts[:i]
+                del self.page_numbers[:i]
+
+        if page is not None:
+            self.page_starts.append(self.buffer_offset + len(self.buffer))
+            self.page_numbers.append(page)
+
+        self.buffer += text
+
+    def find_complete_region(self, position: int, search: int):
+        """
+        End of the complete units in the buffer and where the unfinished one starts,
+        None when no unit is complete yet. Positions are relative to the buffer.
+        """
+        buffer = self.buffer
+        if self.is_chars:
+            i = buffer.rfind("\n", search)
+            return None if i < 0 else (i, i + 1)
+
+        if self.size_unit == ChunkSizeUnitEnum.TOKENS.value:
+            i = len(buffer)
+            while i > search and not buffer[i - 1].isspace():
+                i -= 1
+            return None if i <= search else (i - 1, i)
+
+        # look for the last separator in a growing tail of the buffer, the units before it
+        # are scanned once, by iter_sentences; a separator only spans one whitespace run,
+        # so a match is the one a full scan finds when its run starts inside the tail
+        tail_size = 256
+        while True:
+            tail_start = max(search, len(buffer) - tail_size)
+            last_separator = None
+            for last_separator in self.separator.finditer(buffer, tail_start):
+                pass
+            if tail_start == search:
+                break
+            if last_separator is not None:
+                run_start = last_separator.start()
+                while run_start > tail_start and buffer[run_start - 1].isspace():
+                    run_start -= 1
+                if run_start > tail_start:
+                    break
+            tail_size *= 4
+
+        return None if last_separator is None else (last_separator.start(), last_separator.end())
+
+    def iter_units(self, start: int, end: int) -> Iterable[re.Match]:
+        """
+        Matches of the stripped complete units between start and end, with the long ones
+        split into pieces. Positions are relative to the buffer.
+        """
+        if self.size_unit != ChunkSizeUnitEnum.SENTENCES.value:
+            return self.piece_pattern.finditer(self.buffer, start, end)
+        return self.iter_sentences(start, end)
+
+    def iter_sentences(self, start: int, end: int):
+        buffer = self.buffer
+        finditer = self.piece_pattern.finditer
+        position = start
+        for match in self.separator.finditer(buffer, start, end):
+            yield from finditer(buffer, position, match.start())
+            position = match.end()
+        yield from finditer(buffer, position, end)
+
+    def split_heavy_span(self, start: int, end: int, weight: int):
+        """
+        Split a span weighing more than chunk_size tokens into equal-length pieces,
+        returned as (start, end, weight). Positions are relative to the buffer.
+        """
+        pieces_count = -(-weight // self.chunk_size)
+        step = max(1, -(-(end - start) // pieces_count))
+        pieces = []
+        for piece_start in range(start, end, step):
+            piece_end = min(piece_start + step, end)
+            piece_weight = self.count_tokens(self.buffer[piece_start:piece_end])
+            if piece_weight > self.chunk_size and piece_end - piece_start > 1:
+                pieces.extend(self.split_heavy_span(piece_start, piece_end, piece_weight))
+            else:
+                pieces.append((piece_start, piece_end, piece_weight))
+        return pieces
+
+    def collect_units(self, matches: Iterable[re.Match]):
+        """
+        starts, ends and weights, relative to the buffer, of the units given as matches of
+        their stripped text, with the units too heavy for a chunk split.
+        The common case of no such unit stays out of per-unit Python code.
+        """
+        # plain int lists, holding on to the match objects makes the garbage collector
+        # walk them over and over
+        starts = []
+        ends = []
+        add_start = starts.append
+        add_end = ends.append
+        for match in matches:
+            add_start(match.start())
+            add_end(match.end())
+        if not starts:
+            return [], [], []
+
+        if self.is_chars:
+            return starts, ends, list(map(operator.sub, ends, starts))
+        if self.count_tokens is None:
+            return starts, ends, [1] * len(starts)
+
+        buffer = self.buffer
+        weights = [self.count_tokens(buffer[start:end]) for start, end in zip(starts, ends)]
+        if max(weights) > self.chunk_size:
+            units = []
+            for start, end, weight in zip(starts, ends, weights):
+                if weight > self.chunk_size and end - start > 1:
+                    units.extend(self.split_heavy_span(start, end, weight))
+                else:
+                    units.append((start, end, weight))
+            starts, ends, weights = (list(values) for values in zip(*units))
+
+        return starts, ends, weights
+
+    def add_units(self, matches: Iterable[re.Match], chunks: List[Chunk]):
+        """
+        Pack units, given as matches of their stripped text, into chunks.
+
+        Equivalent to adding the units to the window one by one and emitting the window
+        whenever the next unit does not fit, but every chunk boundary and overlap start
+        is found by bisecting the unit ends (chars) or cumulative weights, so the Python
+        work is per chunk rather than per unit. The units after the last emitted chunk
+        stay in the window for the next call.
+        """
+        new_starts, new_ends, new_weights = self.collect_units(matches)
+        if not new_starts:
+            return
+
+        base = self.buffer_offset
+        window = self.window
+        starts = [unit[0] - base for unit in window] + new_starts
+        ends = [unit[1] - base for unit in window] + new_ends
+        weights = [unit[2] for unit in window] + new_weights
+        units_count = len(starts)
+
+        chunk_size = self.chunk_size
+        overlap_size = self.overlap_size
+        max_chunk_chars = self.max_chunk_chars
+        bisect_left = bisect.bisect_left
+        bisect_right = bisect.bisect_right
+        bounds = []
+        first = 0
+        last_emit = None
+
+        if self.is_chars:
+            while True:
+                # the first unit that does not fit into a window starting at first
+                overflow = bisect_right(ends, starts[first] + chunk_size, first + 1, units_count)
+                if overflow >= units_count:
+                    break
+                end = ends[overflow - 1]
+                bounds.append((starts[first], end))
+                last_emit = overflow
+
+                # keep the tail units within overlap_size, never the whole window
+                first = bisect_left(starts, end - overlap_size, first + 1, overflow)
+                if first < overflow and ends[overflow] - starts[first] > chunk_size:
+                    first = overflow
+        else:
+            cumulative = list(itertools.accumulate(weights, initial=0))
+            while True:
+                overflow = min(
+                    bisect_right(cumulative, cumulative[first] + chunk_size, first + 2, units_count + 1) - 1,
+                    bisect_right(ends, starts[first] + max_chunk_chars, first + 1, units_count)
+                )
+                if overflow >= units_count:
+                    break
+                bounds.append((starts[first], ends[overflow - 1]))
+                last_emit = overflow
+
+                first = bisect_left(cumulative, cumulative[overflow] - overlap_size, first + 1, overflow)
+                if first < overflow and (cumulative[overflow + 1] - cumulative[first] > chunk_size or
+                                         ends[overflow] - starts[first] > max_chunk_chars):
+                    first = overflow
+
+        if last_emit is None:
+            self.window_new_units += len(new_starts)
+        else:
+            self.window_new_units = units_count - last_emit
+            chunks.extend(self.make_chunks(bounds))
+
+        window[:] = [
+            (starts[i] + base, ends[i] + base, weights[i])
+            for i in range(first, units_count)
+        ]
+
+    def make_chunks(self, bounds: List[Tuple[int, int]]) -> List[Chunk]:
+        """
+        Chunks of the (start, end) bounds relative to the buffer.
+        """
+        base = self.buffer_offset
+        if self.page_starts:
+            return [self.make_chunk(start + base, end + base) for start, end in bounds]
+
+        buffer = self.buffer
+        return [
+            Chunk(page_content=buffer[start:end], metadata={"start_offset": start + base, "end_offset": end + base})
+            for start, end in bounds
+        ]
+
+    def make_chunk(self, start: int, end: int) -> Chunk:
+        metadata = {
+            "start_offset": start,
+            "end_offset": end,
+        }
+        if self.page_starts:
+            metadata["page_start"] = self.page_at(start)
+            metadata["page_end"] = self.page_at(end - 1)
+
+        return Chunk(page_content=self.buffer[start - self.buffer_offset:end - self.buffer_offset],
+                     metadata=metadata)
+
+
+def chunk_text(text: str, chunk_size: int, overlap_size: int = 0, size_unit: str = ChunkSizeUnitEnum.CHARS.value,
+               count_tokens: Callable[[str], int] = None, max_chunk_chars: int = 4000) -> List[Chunk]:
+    """
+    Chunk a whole text in one call.
+    """
+    chunker = Chunker(chunk_size=chunk_size, overlap_size=overlap_size, size_unit=size_unit,
+                      count_tokens=count_tokens, max_chunk_chars=max_chunk_chars)
+    return chunker.feed(text) + chunker.flush()
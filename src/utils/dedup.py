@@ -0,0 +1,136 @@
+from typing import List
+import hashlib
+import re
+import numpy as np
+
+WHITESPACE_PATTERN = re.compile(r"\s+")
+
+# 64-bit constants for the rolling shingle hash and the splitmix64 finalizer
+ROLLING_BASE = np.uint64(0x100000001B3)
+MIX_MULTIPLIER_1 = np.uint64(0xBF58476D1CE4E5B9)
+MIX_MULTIPLIER_2 = np.uint64(0x94D049BB133111EB)
+
+
+def normalize_text(text: str):
+    return WHITESPACE_PATTERN.sub(" ", text).strip().lower()
+
+
+def exact_hashes(texts: List[str]) -> List[str]:
+    """
+    sha256 of every text after whitespace and case normalization.
+    """
+    return [
+        hashlib.sha256(normalize_text(text).encode("utf-8")).hexdigest()
+        for text in texts
+    ]
+
+
+def mix64(values: np.ndarray):
+    values = values ^ (values >> np.uint64(30))
+    values = values * MIX_MULTIPLIER_1
+    values = values ^ (values >> np.uint64(27))
+    values = values * MIX_MULTIPLIER_2
+    return values ^ (values >> np.uint64(31))
+
+
+class MinHasher:
+    """
+    Vectorized MinHash over character shingles, with LSH banding.
+    A whole batch of texts is shingled and hashed with array operations: texts are
+    concatenated into one byte buffer, a rolling hash is computed for every window, and
+    each permutation takes its per-text minimum with np.minimum.reduceat.
+    """
+
+    def __init__(self, num_perm: int = 128, bands: int = 16, shingle_size: int = 9, seed: int = 1):
+        if num_perm % bands != 0:
+            raise ValueError("num_perm must be a multiple of bands")
+
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.shingle_size = shingle_size
+
+        rng = np.random.default_rng(seed)
+        self.perm_a = rng.integers(1, 2 ** 63, size=num_perm, dtype=np.uint64) | np.uint64(1)
+        self.perm_b = rng.integers(0, 2 ** 63, size=num_perm, dtype=np.uint64)
+
+    def shingle_hashes(self, texts: List[str]):
+        """
+        Hash every shingle of every text. Returns the hashes and the start index of
+        each text's hashes.
+        """
+        k = self.shingle_size
+        encoded = [normalize_text(text).encode("utf-8") for text in texts]
+        # texts shorter than a shingle become a single padded shingle
+        encoded = [e if len(e) >= k else e.ljust(k, b"\0") for e in encoded]
+
+        lengths = np.fromiter((len(e) for e in encoded), dtype=np.int64, count=len(encoded))
+        buffer = np.frombuffer(b"".join(encoded), dtype=np.uint8).astype(np.uint64)
+
+        windows_count = len(buffer) - k + 1
+        hashes = np.zeros(windows_count, dtype=np.uint64)
+        for j in range(k):
+            hashes = hashes * ROLLING_BASE + buffer[j:j + windows_count]
+        hashes = mix64(hashes)
+
+        # keep only the windows that do not cross into the next text
+        text_starts = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+        windows_per_text = lengths - k + 1
+        window_index = np.repeat(text_starts, windows_per_text) + (
+            np.arange(windows_per_text.sum()) - np.repeat(np.cumsum(windows_per_text) - windows_per_text, windows_per_text)
+        )
+
+        offsets = np.concatenate(([0], np.cumsum(windows_per_text)[:-1]))
+        return hashes[window_index], offsets
+
+    def signatures(self, texts: List[str]) -> np.ndarray:
+        """
+        MinHash signatures of the texts as a (len(texts), num_perm) uint32 array.
+        """
+        if len(texts) == 0:
+            return np.zeros((0, self.num_perm), dtype=np.uint32)
+
+        hashes, offsets = self.shingle_hashes(texts)
+
+        signatures = np.empty((len(texts), self.num_perm), dtype=np.uint32)
+        for p in range(self.num_perm):
+            permuted = ((hashes * self.perm_a[p] + self.perm_b[p]) >> np.uint64(32)).astype(np.uint32)
+            signatures[:, p] = np.minimum.reduceat(permuted, offsets)
+
+        return signatures
+
+    def band_keys(self, signatures: np.ndarray) -> np.ndarray:
+        """
+        One LSH key per band as a (len(signatures), bands) int64 array.
+        Keys differ across bands, so they can share one index.
+        """
+        banded = signatures.reshape(len(signatures), self.bands, self.rows).astype(np.uint64)
+
+        keys = np.broadcast_to(
+            np.arange(1, self.bands + 1, dtype=np.uint64) * MIX_MULTIPLIER_1,
+            (len(signatures), self.bands)
+        ).copy()
+        for r in range(self.rows):
+            keys = mix64(keys ^ banded[:, :, r])
+
+        return keys.view(np.int64)
+
+    def similarities(self, signatures: np.ndarray, signature: np.ndarray) -> np.ndarray:
+        """
+        Estimated Jaccard similarity of every row of signatures with one signature.
+        """
+        return np.mean(signatures == signature, axis=1)
+
+    def to_bytes(self, signature: np.ndarray) -> bytes:
+        """
+        A signature as stored in chunk_minhash.
+        """
+        return signature.astype("<u4").tobytes()
+
+    def from_bytes(self, data: List[bytes]) -> np.ndarray:
+        """
+        Signatures stored with to_bytes as a (len(data), num_perm) uint32 array.
+        """
+        if len(data) == 0:
+            return np.zeros((0, self.num_perm), dtype=np.uint32)
+        return np.frombuffer(b"".join(data), dtype="<u4").reshape(len(data), self.num_perm).astype(np.uint32)
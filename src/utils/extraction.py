@@ -0,0 +1,42 @@
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Tuple
+import multiprocessing
+
+# These functions run inside the extraction process pool, so they stay at module level
+# (picklable) and only import what the child processes need.
+
+
+def create_extraction_pool(pool_size: int = None):
+    """
+    Create the process pool used for document text extraction.
+    spawn keeps the children free of the parent's event loop and DB connections.
+    """
+    return ProcessPoolExecutor(
+        max_workers=pool_size,
+        mp_context=multiprocessing.get_context("spawn")
+    )
+
+
+def count_pdf_pages(file_path: str) -> int:
+    import fitz
+
+    with fitz.open(file_path) as pdf:
+        return pdf.page_count
+
+
+def extract_pdf_pages(file_path: str, start_page: int, end_page: int) -> List[Tuple[str, dict]]:
+    """
+    Extract the text of pages [start_page, end_page) as (page_content, metadata) pairs.
+    """
+    import fitz
+
+    pages = []
+    with fitz.open(file_path) as pdf:
+        for page_no in range(start_page, min(end_page, pdf.page_count)):
+            pages.append((
+                pdf.load_page(page_no).get_text(),
+                {"source": file_path, "page": page_no}
+            ))
+
+    return pages
+
@@ -1,4 +1,4 @@
-from prometheus_client import Counter, Histogram, generate_latest, CONTENT_TYPE_LATEST
+from prometheus_client import Counter, Gauge, Histogram, generate_latest, CONTENT_TYPE_LATEST
 from fastapi import FastAPI, Request, Response
 from starlette.middleware.base import BaseHTTPMiddleware
 import time
@@ -6,6 +6,16 @@ import time
 # Define metrics
 REQUEST_COUNT = Counter('http_requests_total', 'Total HTTP Requests', ['method', 'endpoint', 'status'])
 REQUEST_LATENCY = Histogram('http_request_duration_seconds', 'HTTP Request Latency', ['method', 'endpoint'])
+EMBEDDING_CACHE_HITS = Counter('embedding_cache_hits_total', 'Embedding Cache Hits', ['tier'])
+EMBEDDING_CACHE_MISSES = Counter('embedding_cache_misses_total', 'Embedding Cache Misses')
+SEARCH_CACHE_HITS = Counter('search_cache_hits_total', 'Search Result Cache Hits', ['tier'])
+SEARCH_CACHE_MISSES = Counter('search_cache_misses_total', 'Search Result Cache Misses')
+EMBEDDING_BATCHER_QUEUE_DEPTH = Gauge('embedding_batcher_queue_depth', 'Texts Waiting In The Embedding Batcher')
+EMBEDDING_BATCHER_IN_FLIGHT = Gauge('embedding_batcher_in_flight_batches', 'Embedding Batches Being Sent')
+EMBEDDING_REQUEST_RETRIES = Counter('embedding_request_retries_total', 'Retried Embedding Requests', ['error'])
+EMBEDDING_THROTTLED_SECONDS = Counter('embedding_throttled_seconds_total', 'Seconds Embedding Requests Waited For Rate Limits')
+EMBEDDING_BATCHER_BATCH_SIZE = Histogram('embedding_batcher_batch_size', 'Texts Per Batched Embedding Call',
+                                         buckets=(1, 2, 4, 8, 16, 32, 64, 128, 256))
 
 class PrometheusMiddleware(BaseHTTPMiddleware):
     async def dispatch(self, request: Request, call_next):
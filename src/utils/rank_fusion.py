@@ -0,0 +1,17 @@
+from typing import Hashable, List, Tuple
+
+
+def reciprocal_rank_fusion(rankings: List[List[Hashable]], k: int = 60,
+                           limit: int = None) -> List[Tuple[Hashable, float]]:
+    """
+    Fuse ranked lists into one with reciprocal rank fusion, score(d) = sum(1 / (k + rank)).
+    Only ranks are used, so lists with incomparable scores (cosine, BM25) mix fairly.
+    Returns (item, fused score) pairs, best first.
+    """
+    scores = {}
+    for ranking in rankings:
+        for rank, item in enumerate(ranking, start=1):
+            scores[item] = scores.get(item, 0.0) + 1.0 / (k + rank)
+
+    fused = sorted(scores.items(), key=lambda pair: pair[1], reverse=True)
+    return fused[:limit] if limit else fused
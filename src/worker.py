@@ -0,0 +1,39 @@
+from helpers.config import get_settings
+from helpers.resources import setup_resources, teardown_resources
+from controllers import JobController
+from types import SimpleNamespace
+import asyncio
+import logging
+import os
+import signal
+import socket
+
+
+async def main():
+    """
+    Standalone job worker, runs JOB_WORKERS_PER_PROCESS workers until SIGINT / SIGTERM.
+    """
+    settings = get_settings()
+    resources = await setup_resources(SimpleNamespace(), settings)
+
+    stop_event = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop_event.set)
+
+    job_controller = JobController(resources=resources)
+    workers = [
+        asyncio.create_task(job_controller.run_worker(
+            worker_id=f"{socket.gethostname()}:{os.getpid()}:{i}",
+            stop_event=stop_event
+        ))
+        for i in range(settings.JOB_WORKERS_PER_PROCESS)
+    ]
+
+    await asyncio.gather(*workers, return_exceptions=True)
+    await teardown_resources(resources)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(main())